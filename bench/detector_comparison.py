@@ -0,0 +1,92 @@
+"""
+Benchmarks HogDescriptorStrategy presets against EfficientdetStrategy on the same frames.
+It reports the latency of each detector, the number of frames with humans,
+and how many of the EfficientDet regions are also found by HOG.
+
+Usage (from the repository root):
+    $ python -m bench.detector_comparison --images ~/.home-security-system/images/picamera
+"""
+import argparse
+import glob
+import os
+from time import perf_counter
+
+import cv2
+import numpy
+
+from bench.efficientdet_latency import report, synthetic_frames
+from core.strategies.detectors.base_detector_strategy import BaseDetectorStrategy, DetectorResult
+from core.strategies.detectors.efficientdet_strategy import EfficientdetStrategy
+from core.strategies.detectors.hog_descriptor_strategy import HogDescriptorStrategy
+from core.utils.regions import intersection_over_union
+
+MATCH_IOU: float = 0.3
+
+
+def load_frames(directory: str) -> list[numpy.ndarray]:
+    """This function reads the JPEG and PNG images of the directory."""
+    paths = sorted(glob.glob(os.path.join(os.path.expanduser(directory), "*.jpg"))
+                   + glob.glob(os.path.join(os.path.expanduser(directory), "*.png")))
+    return [frame for frame in (cv2.imread(path) for path in paths) if frame is not None]
+
+
+def run(detector: BaseDetectorStrategy,
+        frames: list[numpy.ndarray]) -> tuple[list[float], list[DetectorResult]]:
+    """This function returns the latency in milliseconds and the result of each frame."""
+    latencies: list[float] = []
+    results: list[DetectorResult] = []
+    for frame in frames:
+        start = perf_counter()
+        results.append(detector.detect_humans(frame))
+        latencies.append((perf_counter() - start) * 1000)
+    return latencies, results
+
+
+def recall(results: list[DetectorResult], references: list[DetectorResult]) -> float | None:
+    """This function returns the ratio of the reference regions matched by the results."""
+    found = 0
+    total = 0
+    for result, reference in zip(results, references):
+        total += len(reference.regions)
+        for region in reference.regions:
+            if len(result.regions) > 0 \
+                    and intersection_over_union(region, result.regions).max() >= MATCH_IOU:
+                found += 1
+    return found / total if total else None
+
+
+def main() -> None:
+    """This function runs the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--images", type=str, default=None,
+                        help="a directory of images, synthetic frames are used otherwise")
+    parser.add_argument("--frames", type=int, default=20)
+    parser.add_argument("--width", type=int, default=1014)
+    parser.add_argument("--height", type=int, default=760)
+    arguments = parser.parse_args()
+
+    if not (frames := load_frames(arguments.images) if arguments.images else []):
+        frames = synthetic_frames(arguments.frames, arguments.width, arguments.height)
+    print(f"{len(frames)} frames")
+
+    references: list[DetectorResult] | None = None
+    try:
+        latencies, references = run(EfficientdetStrategy(), frames)
+    except (OSError, ValueError, RuntimeError) as error:
+        print(f"EfficientDet is skipped: {error}")
+    else:
+        report("efficientdet", latencies)
+        print(f"{'':<12} frames with humans={sum(r.human_found for r in references)}")
+
+    for preset in HogDescriptorStrategy.PRESETS:
+        latencies, results = run(HogDescriptorStrategy(preset), frames)
+        report(f"hog-{preset}", latencies)
+        summary = f"frames with humans={sum(result.human_found for result in results)}"
+        if references is not None:
+            if (matched := recall(results, references)) is not None:
+                summary += f"  efficientdet regions found={matched:.0%}"
+        print(f"{'':<12} {summary}")
+
+
+if __name__ == "__main__":
+    main()
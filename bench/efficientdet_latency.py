@@ -0,0 +1,93 @@
+"""
+Benchmarks the per-frame latency of EfficientdetStrategy on synthetic frames.
+It compares the legacy flow, which creates the interpreter and reads the
+label-map for every frame, with the persistent detector instance.
+
+Usage (from the repository root):
+    $ python -m bench.efficientdet_latency --frames 50
+"""
+import argparse
+import statistics
+from collections.abc import Callable
+from time import perf_counter
+from typing import Any
+
+import cv2
+import numpy
+from tflite_runtime.interpreter import Interpreter
+
+from core.strategies.detectors.efficientdet_strategy import EfficientdetStrategy
+
+
+def legacy_detect_humans(frame: numpy.ndarray) -> bool:
+    """This function replicates the detection flow before the interpreter was cached."""
+    interpreter: Interpreter = Interpreter(model_path=EfficientdetStrategy.MODEL_PATH)
+    interpreter.allocate_tensors()
+    input_details: list[dict[str, Any]] = interpreter.get_input_details()
+    output_details: list[dict[str, Any]] = interpreter.get_output_details()
+    _, input_height, input_width, _ = input_details[0]['shape']
+
+    image = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+    image = cv2.resize(image, (input_width, input_height), interpolation=cv2.INTER_AREA)
+    interpreter.set_tensor(input_details[0]['index'], numpy.expand_dims(image, axis=0))
+    interpreter.invoke()
+
+    classes = interpreter.get_tensor(output_details[1]['index'])[0]
+    scores = interpreter.get_tensor(output_details[2]['index'])[0]
+    with open(EfficientdetStrategy.LABEL_PATH, 'r', encoding="utf-8") as labelmap:
+        labels = [line.strip() for line in labelmap.readlines()]
+    return any(
+        score >= EfficientdetStrategy.DETECTION_THRES and labels[int(pred_class)] == 'person'
+        for score, pred_class in zip(scores, classes)
+    )
+
+
+def synthetic_frames(count: int, width: int, height: int) -> list[numpy.ndarray]:
+    """This function generates random BGR frames."""
+    generator = numpy.random.default_rng(seed=0)
+    return [
+        generator.integers(0, 256, size=(height, width, 3), dtype=numpy.uint8)
+        for _ in range(count)
+    ]
+
+
+def measure(detect: Callable[[numpy.ndarray], Any],
+            frames: list[numpy.ndarray]) -> list[float]:
+    """This function returns the latency of each call in milliseconds."""
+    latencies: list[float] = []
+    for frame in frames:
+        start = perf_counter()
+        detect(frame)
+        latencies.append((perf_counter() - start) * 1000)
+    return latencies
+
+
+def report(name: str, latencies: list[float]) -> None:
+    """This function prints the latency summary."""
+    ordered = sorted(latencies)
+    print(f"{name:<12} mean={statistics.mean(ordered):8.2f} ms  "
+          f"p50={ordered[len(ordered) // 2]:8.2f} ms  "
+          f"max={ordered[-1]:8.2f} ms")
+
+
+def main() -> None:
+    """This function runs the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--frames", type=int, default=30)
+    parser.add_argument("--width", type=int, default=640)
+    parser.add_argument("--height", type=int, default=480)
+    arguments = parser.parse_args()
+
+    frames = synthetic_frames(arguments.frames, arguments.width, arguments.height)
+
+    report("legacy", measure(legacy_detect_humans, frames))
+
+    # Model loading is a one-time cost for the persistent detector.
+    start = perf_counter()
+    detector = EfficientdetStrategy()
+    print(f"{'setup':<12} {(perf_counter() - start) * 1000:8.2f} ms (once)")
+    report("persistent", measure(detector.detect_humans, frames))
+
+
+if __name__ == "__main__":
+    main()
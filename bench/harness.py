@@ -0,0 +1,239 @@
+"""
+Replays recorded frames through an eye and detector combination, and compares the results.
+The run command reports the frames per second, the p50/p95/p99 latency of
+each stage, the CPU time, the peak memory and, given a label file, the
+precision and the recall. The results are written as JSON, so the compare
+command can catch regressions between commits.
+
+The label file has one "<frame name>,<0|1>" line per labelled frame, where
+the frame name is the image file name, or the zero-padded index of a video frame.
+
+Usage (from the repository root):
+    $ python -m bench.harness run recordings/garden --detector motion-gate \\
+        --labels recordings/garden.csv --output results/new.json
+    $ python -m bench.harness compare results/base.json results/new.json
+"""
+import argparse
+import json
+import resource
+import subprocess
+import sys
+from collections.abc import Callable
+from dataclasses import asdict, is_dataclass
+from datetime import datetime
+from time import perf_counter, process_time
+from typing import Any
+
+import numpy
+
+from core.strategies.detectors.base_detector_strategy import BaseDetectorStrategy
+from core.strategies.detectors.cascade_strategy import CascadeDetectorStrategy
+from core.strategies.detectors.efficientdet_strategy import EfficientdetStrategy
+from core.strategies.detectors.hog_descriptor_strategy import HogDescriptorStrategy
+from core.strategies.detectors.motion_gate_strategy import MotionGateStrategy
+from core.strategies.detectors.motion_strategy import MotionStrategy
+from core.strategies.detectors.tiling_strategy import TilingStrategy
+from core.strategies.eye.replaycamera_strategy import ReplayCameraStrategy
+from core.utils.preprocessing import ROTATIONS, get_rotation
+
+# The detector combinations, created from the options of the heavy detector.
+DETECTORS: dict[str, Callable[[dict[str, Any]], BaseDetectorStrategy]] = {
+    "efficientdet": lambda options: EfficientdetStrategy(**options),
+    "hog": lambda options: HogDescriptorStrategy(**options),
+    "motion": lambda options: MotionStrategy(**options),
+    "motion-gate": lambda options: MotionGateStrategy(EfficientdetStrategy(**options)),
+    "tiling": lambda options: MotionGateStrategy(TilingStrategy(EfficientdetStrategy(**options))),
+    "cascade": lambda options: CascadeDetectorStrategy(
+        HogDescriptorStrategy("fast"),
+        EfficientdetStrategy(**options),
+        TilingStrategy(EfficientdetStrategy(**options)),
+    ),
+}
+# The metrics where higher is better, every other metric is a cost.
+HIGHER_IS_BETTER: tuple[str, ...] = ("fps", "precision", "recall")
+
+
+def read_labels(path: str) -> dict[str, bool]:
+    """This function reads the label file."""
+    labels: dict[str, bool] = {}
+    with open(path, "r", encoding="utf-8") as file:
+        for line in file:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            name, label = (value.strip() for value in line.rsplit(",", 1))
+            if label in {"0", "1"}:
+                labels[name] = label == "1"
+    return labels
+
+
+def summarise(latencies: list[float]) -> dict[str, float]:
+    """This function returns the mean and the percentiles of the latencies in milliseconds."""
+    if not latencies:
+        return {}
+    values = numpy.array(latencies) * 1000
+    return {
+        "mean": float(values.mean()),
+        "p50": float(numpy.percentile(values, 50)),
+        "p95": float(numpy.percentile(values, 95)),
+        "p99": float(numpy.percentile(values, 99)),
+    }
+
+
+def get_commit() -> str | None:
+    """This function returns the current git commit, if any."""
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(arguments: argparse.Namespace) -> dict[str, Any]:
+    """This function replays the frames through the detector, and returns the results."""
+    options = json.loads(arguments.options) if arguments.options else {}
+    detector = DETECTORS[arguments.detector](options)
+    camera = ReplayCameraStrategy(arguments.source, loop=False,
+                                  frame_shape=arguments.frame_shape,
+                                  rotation=get_rotation(arguments.rotation))
+    camera.set_detector(detector)
+    labels = read_labels(arguments.labels) if arguments.labels else {}
+
+    stages: dict[str, list[float]] = {"capture": [], "detect": [], "total": []}
+    counts = {"true_positives": 0, "false_positives": 0, "false_negatives": 0, "labelled": 0}
+    frames = 0
+    started_at = perf_counter()
+    cpu_started_at = process_time()
+    while arguments.frames is None or frames < arguments.frames:
+        frame_started_at = perf_counter()
+        try:
+            frame = camera.get_raw_frame()
+        except EOFError:
+            break
+        captured_at = perf_counter()
+        result = camera.detect(frame)
+        finished_at = perf_counter()
+        frames += 1
+
+        stages["capture"].append(captured_at - frame_started_at)
+        stages["detect"].append(finished_at - captured_at)
+        stages["total"].append(finished_at - frame_started_at)
+
+        if camera.frame_name in labels:
+            expected = labels[camera.frame_name]
+            counts["labelled"] += 1
+            counts["true_positives"] += int(result.result and expected)
+            counts["false_positives"] += int(result.result and not expected)
+            counts["false_negatives"] += int(not result.result and expected)
+    elapsed = perf_counter() - started_at
+    cpu_time = process_time() - cpu_started_at
+
+    results: dict[str, Any] = {
+        "commit": get_commit(),
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "source": arguments.source,
+        "detector": arguments.detector,
+        "options": options,
+        "frames": frames,
+        "metrics": {
+            "fps": frames / elapsed if elapsed else 0.0,
+            "cpu_time": cpu_time,
+            "cpu_per_frame": cpu_time / frames if frames else 0.0,
+            # ru_maxrss is reported in kilobytes on Linux.
+            "peak_rss_mib": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        },
+        "stages": {name: summarise(latencies) for name, latencies in stages.items()},
+    }
+    if counts["labelled"]:
+        predicted = counts["true_positives"] + counts["false_positives"]
+        actual = counts["true_positives"] + counts["false_negatives"]
+        results["metrics"]["precision"] = counts["true_positives"] / predicted if predicted else 1.0
+        results["metrics"]["recall"] = counts["true_positives"] / actual if actual else 1.0
+        results["accuracy"] = counts
+
+    # Keep the counters of the detectors which have them.
+    if (get_stats := getattr(detector, "get_stats", None)) is not None:
+        stats = get_stats()
+        results["detector_stats"] = [
+            {**asdict(stage), **{name: getattr(stage, name) for name in dir(type(stage))
+                                 if isinstance(getattr(type(stage), name), property)}}
+            for stage in (stats if isinstance(stats, list) else [stats]) if is_dataclass(stage)
+        ]
+    return results
+
+
+def flatten(results: dict[str, Any]) -> dict[str, float]:
+    """This function returns the comparable metrics of the results by name."""
+    metrics = dict(results["metrics"])
+    for stage, summary in results["stages"].items():
+        for name, value in summary.items():
+            metrics[f"{stage}.{name}"] = value
+    return metrics
+
+
+def compare(base: dict[str, Any], new: dict[str, Any], tolerance: float) -> list[str]:
+    """This function prints the metrics side by side, and returns the regressed ones."""
+    base_metrics = flatten(base)
+    new_metrics = flatten(new)
+    regressions: list[str] = []
+    print(f"{'metric':<20} {base.get('commit') or 'base':>12} {new.get('commit') or 'new':>12}"
+          f" {'change':>9}")
+    for name, base_value in base_metrics.items():
+        if name not in new_metrics:
+            continue
+        new_value = new_metrics[name]
+        change = (new_value - base_value) / base_value if base_value else 0.0
+        if name.split(".")[-1] in HIGHER_IS_BETTER:
+            regressed = change < -tolerance
+        else:
+            regressed = change > tolerance
+        if regressed:
+            regressions.append(name)
+        print(f"{name:<20} {base_value:12.3f} {new_value:12.3f} {change:+9.1%}"
+              f"{'  <- regression' if regressed else ''}")
+    return regressions
+
+
+def main() -> None:
+    """This function runs the harness."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="replay the frames, and report the results")
+    run_parser.add_argument("source", help="a directory of images, a video file or a frame dump")
+    run_parser.add_argument("--frame-shape", type=int, nargs="+", default=None,
+                            help="the (height, width, channels) of a raw frame dump")
+    run_parser.add_argument("--detector", choices=sorted(DETECTORS), default="efficientdet")
+    run_parser.add_argument("--options", type=str, default=None,
+                            help="the detector options as JSON, e.g. '{\"num_threads\": 4}'")
+    run_parser.add_argument("--rotation", choices=sorted(ROTATIONS), default="none")
+    run_parser.add_argument("--labels", type=str, default=None)
+    run_parser.add_argument("--frames", type=int, default=None)
+    run_parser.add_argument("--output", type=str, default=None)
+
+    compare_parser = commands.add_parser("compare", help="compare two results")
+    compare_parser.add_argument("base")
+    compare_parser.add_argument("new")
+    compare_parser.add_argument("--tolerance", type=float, default=0.1,
+                                help="the allowed relative change before a regression")
+    arguments = parser.parse_args()
+
+    if arguments.command == "run":
+        results = run(arguments)
+        print(json.dumps(results, indent=2))
+        if arguments.output:
+            with open(arguments.output, "w", encoding="utf-8") as file:
+                json.dump(results, file, indent=2)
+        return
+
+    with open(arguments.base, "r", encoding="utf-8") as file:
+        base = json.load(file)
+    with open(arguments.new, "r", encoding="utf-8") as file:
+        new = json.load(file)
+    if regressions := compare(base, new, arguments.tolerance):
+        print(f"{len(regressions)} regression(s): {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Benchmarks EfficientdetStrategy model variants and interpreter options on a fixed image set.
+Each variant runs in its own process, so the peak RSS belongs to that
+variant alone. The detections are compared with the first variant.
+
+Usage (from the repository root):
+    $ python -m bench.model_variants --images ~/.home-security-system/images/picamera \\
+        --model models/efficientdet_1.tflite --model models/efficientdet_1_int8.tflite \\
+        --threads 1 --threads 4 --xnnpack on --xnnpack off
+"""
+import argparse
+import itertools
+import resource
+import statistics
+from multiprocessing import get_context
+from time import perf_counter
+from typing import Any
+
+import numpy
+
+from bench.detector_comparison import load_frames, recall
+from bench.efficientdet_latency import synthetic_frames
+from core.strategies.detectors.base_detector_strategy import DetectorResult
+from core.strategies.detectors.efficientdet_strategy import EfficientdetStrategy
+
+
+def run_variant(options: dict[str, Any], frames: list[numpy.ndarray]) -> dict[str, Any]:
+    """This function runs a variant, and returns its latencies, peak RSS and results."""
+    detector = EfficientdetStrategy(**options)
+    # Warm-up, the first invocation prepares the delegates.
+    detector.detect_humans(frames[0])
+
+    latencies: list[float] = []
+    results: list[DetectorResult] = []
+    for frame in frames:
+        start = perf_counter()
+        result = detector.detect_humans(frame)
+        latencies.append((perf_counter() - start) * 1000)
+        result.image = None
+        results.append(result)
+    return {
+        "latencies": latencies,
+        # ru_maxrss is reported in kilobytes on Linux.
+        "peak_rss": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        "results": results,
+    }
+
+
+def main() -> None:
+    """This function runs the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--images", type=str, default=None,
+                        help="a directory of images, synthetic frames are used otherwise")
+    parser.add_argument("--frames", type=int, default=20)
+    parser.add_argument("--model", action="append", default=None)
+    parser.add_argument("--labels", type=str, default=EfficientdetStrategy.LABEL_PATH)
+    parser.add_argument("--threads", action="append", type=int, default=None)
+    parser.add_argument("--xnnpack", action="append", choices=("on", "off"), default=None)
+    arguments = parser.parse_args()
+
+    if not (frames := load_frames(arguments.images) if arguments.images else []):
+        frames = synthetic_frames(arguments.frames, 1014, 760)
+    print(f"{len(frames)} frames")
+
+    variants = [
+        {"model_path": model, "label_path": arguments.labels,
+         "num_threads": threads, "use_xnnpack": xnnpack == "on"}
+        for model, threads, xnnpack in itertools.product(
+            arguments.model or [EfficientdetStrategy.MODEL_PATH],
+            arguments.threads or [1],
+            arguments.xnnpack or ["on"],
+        )
+    ]
+
+    references = None
+    context = get_context("spawn")
+    for options in variants:
+        name = (f"{options['model_path']} threads={options['num_threads']} "
+                f"xnnpack={'on' if options['use_xnnpack'] else 'off'}")
+        with context.Pool(1) as pool:
+            try:
+                measured = pool.apply(run_variant, (options, frames))
+            except (OSError, ValueError, RuntimeError) as error:
+                print(f"{name}: skipped, {error}")
+                continue
+
+        ordered = sorted(measured["latencies"])
+        summary = (f"mean={statistics.mean(ordered):8.2f} ms  "
+                   f"p50={ordered[len(ordered) // 2]:8.2f} ms  "
+                   f"p95={ordered[int(len(ordered) * 0.95)]:8.2f} ms  "
+                   f"peak rss={measured['peak_rss']:7.1f} MiB  "
+                   f"frames with humans={sum(r.human_found for r in measured['results'])}")
+        if references is None:
+            references = measured["results"]
+        elif (agreement := recall(measured["results"], references)) is not None:
+            summary += f"  reference regions found={agreement:.0%}"
+        print(f"{name}\n    {summary}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+"""
+Serves a local stub of the router admin panel, and benchmarks AdminPanelStrategy against it.
+The stub mimics the login page, the login form and the device list of
+the router. Sessions expire after the given number of seconds, so the
+re-login path is exercised too. The benchmark reports the latency of
+the checks and the number of logins, and compares the regex extractor
+with BeautifulSoup on the same page.
+
+Usage (from the repository root):
+    $ python -m bench.router_stub --devices 30 --polls 50 --session-ttl 2
+    $ python -m bench.router_stub --serve --port 8080
+"""
+import argparse
+import secrets
+import statistics
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Thread
+from time import monotonic, perf_counter, sleep
+
+from core.strategies.wifi.admin_panel_strategy import AdminPanelStrategy
+from core.utils.datatypes import Protector
+
+LOGIN_PAGE = """<html><body>
+<form method="post" action="/Forms/login_security_1">
+<input name="Login_Name"><input name="Login_Pwd" type="password"><input type="submit">
+</form></body></html>"""
+DEVICE_ROW = """<tr><td class="tabdata">{index}</td><td class="tabdata">device-{index}</td>
+<td class="tabdata">192.168.1.{host}</td><td class="tabdata">{address}</td></tr>"""
+
+
+def fake_addresses(count: int) -> list[str]:
+    """This function returns the given number of MAC addresses."""
+    return [f"02:00:00:00:{index // 256:02x}:{index % 256:02x}" for index in range(count)]
+
+
+class RouterStub:
+    """
+    A stub of the router admin panel, which counts the logins and the page requests.
+    """
+    def __init__(self, addresses: list[str], session_ttl: float | None = None,
+                 port: int = 0) -> None:
+        self.addresses: list[str] = addresses
+        self.session_ttl: float | None = session_ttl
+        self.logins: int = 0
+        self.requests: int = 0
+        self._sessions: dict[str, float] = {}
+        self._server: ThreadingHTTPServer = ThreadingHTTPServer(
+            ("127.0.0.1", port), self._create_handler())
+        self._thread: Thread | None = None
+
+    @property
+    def base_url(self) -> str:
+        """This property returns the address of the stub."""
+        return f"http://127.0.0.1:{self._server.server_address[1]}"
+
+    def start(self) -> None:
+        """This method serves the stub in the background."""
+        self._thread = Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """This method stops the stub."""
+        self._server.shutdown()
+        self._server.server_close()
+
+    def get_device_page(self) -> str:
+        """This method returns the page with the device list."""
+        rows = "\n".join(DEVICE_ROW.format(index=index, host=index + 2, address=address)
+                         for index, address in enumerate(self.addresses))
+        return f"<html><body><table>\n{rows}\n</table></body></html>"
+
+    def is_valid(self, session: str | None) -> bool:
+        """This method checks if the session exists, and has not expired."""
+        if (created_at := self._sessions.get(session)) is None:
+            return False
+        return self.session_ttl is None or monotonic() - created_at < self.session_ttl
+
+    def create_session(self) -> str:
+        """This method logs in, and returns the new session."""
+        self.logins += 1
+        session = secrets.token_hex(8)
+        self._sessions[session] = monotonic()
+        return session
+
+    def _create_handler(self) -> type[BaseHTTPRequestHandler]:
+        """This method creates the request handler of the stub."""
+        return type("Handler", (RouterStubHandler,), {"stub": self})
+
+
+class RouterStubHandler(BaseHTTPRequestHandler):
+    """The request handler of the stub, the stub is set by the subclass of each stub."""
+    stub: RouterStub
+
+    def do_GET(self) -> None:  # pylint: disable=invalid-name
+        """This method serves the pages."""
+        self.stub.requests += 1
+        if self.path == AdminPanelStrategy.LOGIN_PAGE:
+            self._reply(200, LOGIN_PAGE)
+        elif self.path != AdminPanelStrategy.DEVICE_PAGE:
+            self._reply(404, "")
+        elif self.stub.is_valid(self._get_session()):
+            self._reply(200, self.stub.get_device_page())
+        else:
+            self._reply(302, "", {"Location": AdminPanelStrategy.LOGIN_PAGE})
+
+    def do_POST(self) -> None:  # pylint: disable=invalid-name
+        """This method accepts any login."""
+        self.stub.requests += 1
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        if self.path != AdminPanelStrategy.LOGIN_FORM:
+            self._reply(404, "")
+            return
+        session = self.stub.create_session()
+        self._reply(200, "<html>OK</html>", {"Set-Cookie": f"SESSIONID={session}; Path=/"})
+
+    def log_message(self, *_) -> None:  # pylint: disable=arguments-differ
+        """This method keeps the requests out of the output."""
+
+    def _get_session(self) -> str | None:
+        """This method returns the session of the request."""
+        for cookie in self.headers.get("Cookie", "").split(";"):
+            name, _, value = cookie.strip().partition("=")
+            if name == "SESSIONID":
+                return value
+        return None
+
+    def _reply(self, status: int, body: str, headers: dict[str, str] | None = None) -> None:
+        """This method sends the response."""
+        content = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "text/html")
+        self.send_header("Content-Length", str(len(content)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(content)
+
+
+def compare_parsers(page: str, repeats: int) -> None:
+    """This function compares the regex extractor with BeautifulSoup on the page."""
+    start = perf_counter()
+    for _ in range(repeats):
+        found = [cell for cell in AdminPanelStrategy.TABDATA_PATTERN.findall(page)
+                 if AdminPanelStrategy.MAC_ADDRESS_PATTERN.fullmatch(cell)]
+    regex_time = (perf_counter() - start) / repeats * 1000
+    print(f"regex:         {regex_time:8.3f} ms per page, {len(found)} addresses")
+
+    try:
+        from bs4 import BeautifulSoup  # pylint: disable=import-outside-toplevel
+    except ImportError:
+        print("BeautifulSoup: skipped, bs4 is not installed")
+        return
+    start = perf_counter()
+    for _ in range(repeats):
+        soup = BeautifulSoup(page, "html.parser")
+        found = [element.text for element in soup.find_all("td", class_="tabdata")
+                 if len(element.text) == 17]
+    soup_time = (perf_counter() - start) / repeats * 1000
+    print(f"BeautifulSoup: {soup_time:8.3f} ms per page, {len(found)} addresses")
+
+
+def main() -> None:
+    """This function runs the stub, or the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--devices", type=int, default=20)
+    parser.add_argument("--protectors", type=int, default=3)
+    parser.add_argument("--polls", type=int, default=50)
+    parser.add_argument("--session-ttl", type=float, default=None)
+    parser.add_argument("--port", type=int, default=0)
+    parser.add_argument("--serve", action="store_true", help="only serve the stub")
+    arguments = parser.parse_args()
+
+    addresses = fake_addresses(arguments.devices)
+    stub = RouterStub(addresses, arguments.session_ttl, arguments.port)
+    stub.start()
+    print(f"Serving the router stub at {stub.base_url}")
+    try:
+        if arguments.serve:
+            while True:
+                sleep(3600)
+
+        strategy = AdminPanelStrategy({"Login_Name": "admin", "Login_Pwd": "admin"},
+                                      base_url=stub.base_url)
+        # Only the last protector is connected, so every protector is compared.
+        strategy.add_protector([Protector(f"away-{index}", f"02:FF:FF:FF:FF:{index:02X}")
+                                for index in range(arguments.protectors - 1)]
+                               + [Protector("home", addresses[-1].upper())])
+        latencies: list[float] = []
+        for _ in range(arguments.polls):
+            start = perf_counter()
+            strategy.check_protectors()
+            latencies.append((perf_counter() - start) * 1000)
+            if arguments.session_ttl:
+                sleep(arguments.session_ttl / 10)
+        print(f"checks:   {arguments.polls}, mean={statistics.mean(latencies):.2f} ms, "
+              f"max={max(latencies):.2f} ms")
+        print(f"logins:   {stub.logins}")
+        print(f"requests: {stub.requests} ({stub.requests / arguments.polls:.2f} per check)")
+        compare_parsers(stub.get_device_page(), 100)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stub.stop()
+
+
+if __name__ == "__main__":
+    main()
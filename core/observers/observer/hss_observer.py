@@ -6,11 +6,10 @@ from core.observers.subject.base_subject import BaseSubject
 from core.observers.subject.eye_subject import EyeSubject
 from core.observers.subject.wifi_subject import WiFiSubject
 from core.strategies.notifier.base_notifier_strategy import BaseNotifierStrategy
-from core.strategies.notifier.telegram_strategy import TelegramStrategy
-from core.strategies.notifier.whatsapp_strategy import WhatsappStrategy
+from core.utils.alert_policy import AlertPolicy
 from core.utils.datatypes import EyeStates, WiFiStates
-from core.utils.fileio_adaptor import read_latest_file, upload_to_fileio
 from core.utils.logger import get_logger
+from core.utils.notification_dispatcher import NotificationDispatcher
 
 # Add logging support.
 logger = get_logger(__name__)
@@ -20,38 +19,44 @@ class HomeSecuritySystemObserver(BaseObserver):
     """
     The observer for Home Security System.
     """
-    def __init__(self):
+    def __init__(self, alert_policy: AlertPolicy | None = None):
         self.wifi_state: WiFiStates = WiFiSubject.get_default_state()
         self.eye_state: EyeStates = EyeSubject.get_default_state()
-        self._notifier: BaseNotifierStrategy = None
+        self._dispatcher: NotificationDispatcher | None = None
+        self._alert_policy: AlertPolicy = alert_policy or AlertPolicy()
 
     def update(self, subject: BaseSubject) -> None:
         """This method is called when the observer is updated."""
         if isinstance(subject, WiFiSubject):
             self.wifi_state = subject.get_state()
             logger.debug("WiFi state: %s", str(self.wifi_state.name))
+            if self.wifi_state != WiFiStates.DISCONNECTED:
+                # A protector is around, forget the ongoing incident.
+                self._alert_policy.reset()
 
+        # Only the eye updates can raise alerts.
         if isinstance(subject, EyeSubject):
             self.eye_state = subject.get_state()
             logger.debug("Eye state: %s", str(self.eye_state.name))
-
-        if self.wifi_state == WiFiStates.DISCONNECTED and self.eye_state == EyeStates.DETECTED:
-            logger.info("There is an intruder!")
-            if isinstance(self._notifier, WhatsappStrategy):
-                fileio_link = upload_to_fileio(
-                    read_latest_file("~/.home-security-system/images")
-                )
-                self._notifier.notify_all(
-                    f"There is an intruder! Here is the image: {fileio_link}."
-                )
-            elif isinstance(self._notifier, TelegramStrategy):
-                latest_file = read_latest_file("~/.home-security-system/images")
-                with open(latest_file, 'rb') as intruder_image:
-                    self._notifier.notify_all("There is an intruder! Here is the image:")
-                    self._notifier.send_image_all(intruder_image)
-            else:
-                logger.error("Notifier is not set!")
+            if self.wifi_state == WiFiStates.DISCONNECTED:
+                self._alert(self.eye_state == EyeStates.DETECTED, subject.get_event().image)
 
     def set_notifier(self, notifier: BaseNotifierStrategy) -> None:
-        """This method is called when the observer is updated."""
-        self._notifier = notifier
+        """This method sets the notifier, with a dispatcher of the default settings."""
+        self.set_dispatcher(NotificationDispatcher(notifier))
+
+    def set_dispatcher(self, dispatcher: NotificationDispatcher) -> None:
+        """This method sets the dispatcher of the notifications."""
+        self._dispatcher = dispatcher
+
+    def _alert(self, detected: bool, image: bytes | None) -> None:
+        """This method passes the eye update to the alert policy, and enqueues its alerts."""
+        if detected:
+            logger.info("There is an intruder!")
+        alerts = self._alert_policy.update(detected, image if detected else None)
+        if alerts and self._dispatcher is None:
+            logger.error("Notifier is not set!")
+            return
+        # Only enqueue, the dispatcher sends the notifications from its own threads.
+        for alert in alerts:
+            self._dispatcher.notify(alert.message, alert.images, alert.urgent)
@@ -1,47 +1,90 @@
 """
 This class inherits from IBaseSubject.
 Concretes a subject for Eye/Camera features.
+
+The work is split into a pipeline with bounded, drop-oldest queues:
+capture thread -> inference worker(s) -> encode worker -> notification dispatch.
+The capture thread runs on its own schedule, the scheduler adapts the
+interval with the results the inference has recorded so far, and the
+frames the inference cannot keep up with are dropped from its queue.
+The DETECTED events are not dropped unless the dispatch queue is full of
+them, and the results are dropped if a protector has arrived in the meantime.
+The stream frames are only used for the inference. The evidence image of a
+DETECTED event is a full-resolution still, taken by the inference right after
+the detection is confirmed, which is encoded with the regions drawn, travels
+with the event, and is written to the disk by an independent worker.
 """
 import os
 from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import replace
 from datetime import datetime
 from threading import Lock
-from time import sleep
+from time import monotonic, perf_counter, sleep
 from typing import Optional
 
 import cv2
 
 from core.observers.subject.base_subject import BaseSubject
 from core.strategies.eye.base_eye_strategy import BaseEyeStrategy
-from core.utils.datatypes import EyeStates, EyeStrategyResult
+from core.strategies.scheduler.adaptive_scheduler_strategy import AdaptiveSchedulerStrategy
+from core.strategies.scheduler.base_scheduler_strategy import BaseSchedulerStrategy
+from core.utils.datatypes import EyeEvent, EyeStates, EyeStrategyResult
 from core.utils.logger import get_logger
+from core.utils.pipeline import PipelineStage, StageMonitor, StageStats
+from core.utils.regions import annotate_regions, empty_regions
+from core.utils.tracker import DetectionTracker
 
 # Add logging support.
 logger = get_logger(__name__)
 
 
-class EyeSubject(BaseSubject):
+class EyeSubject(BaseSubject):  # pylint: disable=too-many-instance-attributes
     """
     This class inherits from IBaseSubject.
     Concretes a subject for Eye/Camera features.
     """
     DEFAULT_IMAGE_LOCATIONS: str = "~/.home-security-system/images"
     DEFAULT_SLEEP_INTERVAL = 10
-    SLEEP_INTERVAL_DETECTED = 2
+    STATS_LOG_INTERVAL = 60
+    QUEUE_SIZE = 2
+    DISPATCH_QUEUE_SIZE = 8
+    DISK_QUEUE_SIZE = 8
+    JPEG_QUALITY = 90
 
-    def __init__(self, image_path: str = DEFAULT_IMAGE_LOCATIONS):
+    def __init__(self,
+                 image_path: str = DEFAULT_IMAGE_LOCATIONS,
+                 scheduler: BaseSchedulerStrategy | None = None,
+                 inference_workers: int = 1,
+                 tracker: DetectionTracker | None = None,
+                 save_images: bool = True):
         super().__init__()
         self._image_path = (
             image_path
             if '~' not in image_path
             else os.path.expanduser(image_path)
         )
+        self._scheduler: BaseSchedulerStrategy = scheduler or AdaptiveSchedulerStrategy()
+        self._tracker: DetectionTracker = tracker or DetectionTracker()
+        self._save_images: bool = save_images
+        self._event: EyeEvent = EyeEvent(self.get_default_state())
 
         # To run the eye after thread dies.
-        self.thread: Optional[Future] = None
-        self._eye_strategy: Optional[BaseEyeStrategy] = None
+        self.thread: Future | None = None
+        self._eye_strategy: BaseEyeStrategy | None = None
         self._wifi_lock: Optional[Lock] = None
 
+        # Create the pipeline stages after the capture thread.
+        self._capture_monitor: StageMonitor = StageMonitor("capture")
+        self._inference_stage: PipelineStage = PipelineStage(
+            "inference", self._infer, self.QUEUE_SIZE, inference_workers)
+        self._encode_stage: PipelineStage = PipelineStage(
+            "encode", self._encode, self.QUEUE_SIZE)
+        self._dispatch_stage: PipelineStage = PipelineStage(
+            "dispatch", self._dispatch, self.DISPATCH_QUEUE_SIZE,
+            droppable=self._is_droppable, coalesce=True)
+        self._disk_stage: PipelineStage = PipelineStage(
+            "disk", self._write_image, self.DISK_QUEUE_SIZE)
+
         # Create the default image directory if not exists.
         os.makedirs(self._image_path, exist_ok=True)
 
@@ -59,6 +102,11 @@ class EyeSubject(BaseSubject):
         self._eye_strategy = eye_strategy
         self._wifi_lock = wifi_lock
 
+        # Start the pipeline stages, they are kept alive between restarts.
+        for stage in (self._inference_stage, self._encode_stage,
+                      self._dispatch_stage, self._disk_stage):
+            stage.start()
+
         # Run the thread.
         self.thread = ThreadPoolExecutor(
             max_workers=1,
@@ -73,16 +121,66 @@ class EyeSubject(BaseSubject):
                      ) -> None:
         """This method is called when the observer is updated."""
         logger.debug("[EyeSubject] Thread is started.")
-        sleep_interval = EyeSubject.DEFAULT_SLEEP_INTERVAL
 
         # Create a dummy lock instance if not given.
         if wifi_lock is None:
             logger.debug("[EyeSubject] A lock instance is generated.")
             wifi_lock = Lock()
 
-        # Save an initial image.
         try:
-            initial_frame = eye_strategy.get_frame()
+            # Save an initial image.
+            self._save_initial_frame(eye_strategy)
+
+            last_stats_log = monotonic()
+            while True:
+                # If WiFi subject would give rights to use camera,
+                # Check if any intruders detected.
+                logger.debug("[EyeSubject] WiFi Lock Status: %s",
+                             wifi_lock.locked())
+                if not wifi_lock.locked():
+                    sleep_interval = self._capture(eye_strategy)
+
+                #  If the WiFi subject does not give rights,
+                # aka: "There is protectors around the house."
+                else:
+                    logger.debug("[EyeSubject] Changing state to UNREACHABLE...")
+                    self._dispatch_stage.put(EyeEvent(EyeStates.UNREACHABLE))
+                    self._scheduler.reset()
+                    self._tracker.reset()
+                    sleep_interval = EyeSubject.DEFAULT_SLEEP_INTERVAL
+
+                if monotonic() - last_stats_log >= EyeSubject.STATS_LOG_INTERVAL:
+                    last_stats_log = monotonic()
+                    for stats in self.get_pipeline_stats():
+                        logger.debug("[EyeSubject] %s", str(stats))
+
+                sleep(sleep_interval)
+        except EOFError:
+            # A replay has ended, there is nothing to restart.
+            logger.info("[EyeSubject] The camera has no more frames, the thread is stopped.")
+
+    def get_pipeline_stats(self) -> list[StageStats]:
+        """This method returns the queue depth and latency of each stage."""
+        return [
+            self._capture_monitor.get_stats(),
+            self._inference_stage.get_stats(),
+            self._encode_stage.get_stats(),
+            self._dispatch_stage.get_stats(),
+            self._disk_stage.get_stats(),
+        ]
+
+    def get_image_path(self) -> str:
+        """This method returns the directory where the images of the camera are saved."""
+        return self._image_path
+
+    def get_event(self) -> EyeEvent:
+        """This method returns the last state change, with the image of a detection."""
+        return self._event
+
+    def _save_initial_frame(self, eye_strategy: BaseEyeStrategy) -> None:
+        """This method saves a still frame when the thread is started."""
+        try:
+            initial_frame = eye_strategy.get_still_frame()
         except RuntimeError as error:
             logger.error(
                 "[EyeSubject] An error occurred while capturing the frame.")
@@ -91,52 +189,104 @@ class EyeSubject(BaseSubject):
         cv2.imwrite(file_location, initial_frame)
         logger.debug("[EyeSubject] Initial frame has been saved.")
 
-        while True:
-            # If WiFi subject would give rights to use camera,
-            # Check if any intruders detected.
-            logger.debug("[EyeSubject] WiFi Lock Status: %s",
-                         wifi_lock.locked())
-            if not wifi_lock.locked():
-                try:
-                    result = eye_strategy.check_if_detected()
-                except RuntimeError as error:
-                    logger.error(
-                        "[EyeSubject] An error occurred while checking if detected.")
-                    raise RuntimeError from error
-                logger.debug("[EyeSubject] EyeStrategyResult: %s",
-                             str(result.result))
-
-                if result.result:
-                    logger.debug("[EyeSubject] Changing state to DETECTED...")
-                    self._save_image(result)
-                    self.set_state(EyeStates.DETECTED)
-                    sleep_interval = EyeSubject.SLEEP_INTERVAL_DETECTED
-                else:
-                    logger.debug(
-                        "[EyeSubject] Changing state to NOT_DETECTED...")
-                    self.set_state(EyeStates.NOT_DETECTED)
-                    sleep_interval = EyeSubject.DEFAULT_SLEEP_INTERVAL
+    def _capture(self, eye_strategy: BaseEyeStrategy) -> float:
+        """This method passes a frame to the inference, and returns the interval to the next one."""
+        started_at = perf_counter()
+        try:
+            frame = eye_strategy.get_raw_frame()
+        except RuntimeError as error:
+            logger.error(
+                "[EyeSubject] An error occurred while capturing the frame.")
+            raise RuntimeError from error
+        self._capture_monitor.record(perf_counter() - started_at)
+        self._inference_stage.put(frame)
+        # The interval adapts to the results recorded so far, without waiting for this one.
+        return self._scheduler.next_interval()
 
-            #  If the WiFi subject does not give rights,
-            # aka: "There is protectors around the house."
-            else:
-                logger.debug("[EyeSubject] Changing state to UNREACHABLE...")
-                self.set_state(EyeStates.UNREACHABLE)
-                sleep_interval = EyeSubject.DEFAULT_SLEEP_INTERVAL
+    def _infer(self, frame) -> None:
+        """This method detects humans in the frame, and passes the result on."""
+        result = self._eye_strategy.detect(frame)
+        logger.debug("[EyeSubject] EyeStrategyResult: %s",
+                     str(result.result))
+        self._scheduler.record(result)
 
-            sleep(sleep_interval)
+        # Only report a person once, after it is confirmed over several frames.
+        regions = result.regions if result.result and result.regions is not None \
+            else empty_regions()
+        if confirmed_tracks := self._tracker.update(regions):
+            logger.debug("[EyeSubject] Confirmed tracks: %s",
+                         str([track.track_id for track in confirmed_tracks]))
+            self._encode_stage.put(self._get_evidence(result))
+        elif self._tracker.is_tracking():
+            # Only a confirmed track seen in this frame is reported already, not a tentative one.
+            logger.debug("[EyeSubject] The person is already reported, still tracking...")
+        else:
+            logger.debug(
+                "[EyeSubject] Changing state to NOT_DETECTED...")
+            self._dispatch_stage.put(EyeEvent(EyeStates.NOT_DETECTED))
 
-    def _save_image(self, result: EyeStrategyResult) -> None:
-        """This method is called when the observer is updated."""
-        logger.debug("[EyeSubject] Saving image to the disk...")
+    def _get_evidence(self, result: EyeStrategyResult) -> EyeStrategyResult:
+        """
+        This method returns the result with a full-resolution still, and the regions mapped onto it.
+        The frame of the detection is kept if the still cannot be captured.
+        """
+        try:
+            still = self._eye_strategy.get_still_frame()
+        except RuntimeError:
+            logger.warning("[EyeSubject] The still frame could not be captured, "
+                           "the frame of the detection is used.")
+            return result
+        if (regions := result.regions) is not None:
+            regions = self._eye_strategy.get_still_regions(regions, result.image.shape,
+                                                           still.shape)
+        return replace(result, image=still, regions=regions)
+
+    def _encode(self, result: EyeStrategyResult) -> None:
+        """This method encodes the evidence image, and passes it on with the DETECTED state."""
+        image = result.image
+        if result.regions is not None and len(result.regions) > 0:
+            image = annotate_regions(image, result.regions)
+        encoded, buffer = cv2.imencode(".jpg", image,
+                                       [cv2.IMWRITE_JPEG_QUALITY, self.JPEG_QUALITY])
+        if not encoded:
+            raise RuntimeError("The image of the detection could not be encoded.")
+        jpeg = buffer.tobytes()
+
+        if self._save_images:
+            self._disk_stage.put(jpeg)
+        logger.debug("[EyeSubject] Changing state to DETECTED...")
+        self._dispatch_stage.put(EyeEvent(EyeStates.DETECTED, jpeg))
+
+    def _dispatch(self, event: EyeEvent) -> None:
+        """This method keeps the event, and notifies the observers of its state."""
+        if event.state != EyeStates.UNREACHABLE \
+                and self._wifi_lock is not None and self._wifi_lock.locked():
+            # A protector has arrived since the frame was captured.
+            logger.debug("[EyeSubject] A protector is around, %s is dropped.",
+                         event.state.name)
+            return
+        self._event = event
+        self.set_state(event.state)
+
+    @staticmethod
+    def _is_droppable(event: EyeEvent) -> bool:
+        """This method checks if the event may be dropped, the detections are kept."""
+        return event.state != EyeStates.DETECTED
+
+    def _write_image(self, jpeg: bytes) -> None:
+        """This method writes the encoded image of a detection to the disk."""
         time_now = datetime.now().strftime("%d-%m-%Y_%H-%M-%S")
         file_location = f"{self._image_path}/intruder_{time_now}.jpg"
-        cv2.imwrite(file_location, result.image)
+        with open(file_location, "wb") as image_file:
+            image_file.write(jpeg)
         logger.debug("[EyeSubject] Image saved to the disk with name: intruder_%s.jpg",
                      time_now)
 
     def _cb_done(self, future) -> None:
         """This method is called when the observer is updated."""
+        if future.exception() is None:
+            logger.info("[EyeSubject] The thread has finished.")
+            return
         logger.warning("[EyeSubject] The thread died.")
 
         # Start the thread again.
@@ -4,13 +4,13 @@ Concretes a subject WiFi features.
 """
 from concurrent.futures import Future, ThreadPoolExecutor
 from threading import Lock
-from time import sleep
 from typing import Optional
 
 from core.observers.subject.base_subject import BaseSubject
 from core.strategies.wifi.base_wifi_strategy import BaseWiFiStrategy
 from core.utils.datatypes import WiFiStates
 from core.utils.logger import get_logger
+from core.utils.presence import PresenceTracker
 
 # Add logging support.
 logger = get_logger(__name__)
@@ -21,14 +21,18 @@ class WiFiSubject(BaseSubject):
     This class inherits from IBaseSubject.
     Concretes a subject for WiFiS features.
     """
+    # threading.Lock is a factory function, so it cannot be used in a "| None" union.
     SINGLETON_LOCK: Optional[Lock] = None
     CHECK_INTERVAL: int = 5
 
-    def __init__(self):
+    def __init__(self, presence: PresenceTracker | None = None):
         super().__init__()
+        # Debounce the scans, so a single missed scan does not release the lock.
+        self._presence: PresenceTracker = presence or PresenceTracker(
+            min_interval=self.CHECK_INTERVAL)
         # To run the WiFi after thread dies.
-        self.thread: Optional[Future] = None
-        self._wifi_strategy: Optional[BaseWiFiStrategy] = None
+        self.thread: Future | None = None
+        self._wifi_strategy: BaseWiFiStrategy | None = None
 
     @staticmethod
     def get_default_state() -> WiFiStates:
@@ -65,22 +69,36 @@ class WiFiSubject(BaseSubject):
         protector_lock: Lock = self.get_protector_lock()
 
         while True:
-            protectors = wifi_strategy.check_protectors()
-            logger.debug("[WiFiSubject] Protectors: %s %s",
+            try:
+                protectors = wifi_strategy.check_protectors()
+            except (OSError, RuntimeError) as error:
+                # An unknown result is not an absence, but age the protectors out
+                # if the scans keep failing.
+                logger.warning("[WiFiSubject] The scan has failed: %s", error)
+                self._set_presence(self._presence.expire(), protector_lock)
+                wifi_strategy.wait_for_change(self.CHECK_INTERVAL)
+                continue
+            present = self._presence.update(protectors.protectors)
+            logger.debug("[WiFiSubject] Protectors: %s %s, around: %s",
                          str(protectors.result),
-                         str(protectors.protector))
+                         str([protector.name for protector in protectors.protectors]),
+                         str(self._presence.get_present()))
+            self._set_presence(present, protector_lock)
+            # Wait for a presence change, or scan again after the interval.
+            wifi_strategy.wait_for_change(self._presence.get_interval())
 
-            if protectors.result:
-                self.set_state(WiFiStates.CONNECTED)
-                if not protector_lock.locked():
-                    protector_lock.acquire()
-                    logger.debug("[WiFiSubject] Protector lock is acquired.")
-            else:
-                self.set_state(WiFiStates.DISCONNECTED)
-                if protector_lock.locked():
-                    protector_lock.release()
-                    logger.debug("[WiFiSubject] Protector lock is released.")
-            sleep(self.CHECK_INTERVAL)
+    def _set_presence(self, present: bool, protector_lock: Lock) -> None:
+        """This method updates the state, and holds the lock while a protector is around."""
+        if present:
+            self.set_state(WiFiStates.CONNECTED)
+            if not protector_lock.locked():
+                protector_lock.acquire()
+                logger.debug("[WiFiSubject] Protector lock is acquired.")
+        else:
+            self.set_state(WiFiStates.DISCONNECTED)
+            if protector_lock.locked():
+                protector_lock.release()
+                logger.debug("[WiFiSubject] Protector lock is released.")
 
     def _cb_done(self, future) -> None:
         """This method is called when the observer is updated."""
@@ -2,7 +2,6 @@
 The base strategy for detector strategies.
 This strategy is used to define the interface for all detector strategies.
 """
-
 from abc import ABCMeta, abstractmethod
 from dataclasses import dataclass
 
@@ -11,18 +10,45 @@ import numpy
 
 @dataclass
 class DetectorResult:
-    """This class represents the result of a detector strategy."""
+    """
+    This class represents the result of a detector strategy.
+    Regions are an (N, 4) array of (min_x, max_x, min_y, max_y) pixels
+    of the frame after the requested rotation.
+    """
     image: numpy.ndarray
     human_found: bool
-    regions: list[tuple[int, int, int, int]] = None
+    regions: numpy.ndarray = None
     num_detections: float = None
+    motion: bool = None
+    scores: numpy.ndarray = None
 
 
 class BaseDetectorStrategy(metaclass=ABCMeta):
     """
     The base strategy for detector strategies.
     """
-    @staticmethod
     @abstractmethod
-    def detect_humans(frame: numpy.ndarray) -> DetectorResult:
-        """This method detects if there are any humans in the frame."""
+    def detect_humans(self,
+                      frame: numpy.ndarray,
+                      rotation: int | None = None) -> DetectorResult:
+        """This method detects if there are any humans in the (rotated) frame."""
+
+    def detect_humans_batch(self,
+                            frames: list[numpy.ndarray],
+                            rotations: list[int | None] | None = None
+                            ) -> list[DetectorResult]:
+        """This method detects humans in each of the frames."""
+        rotations = rotations or [None] * len(frames)
+        return [self.detect_humans(frame, rotation)
+                for frame, rotation in zip(frames, rotations)]
+
+    def detect_humans_in_regions(self,
+                                 frame: numpy.ndarray,
+                                 regions: numpy.ndarray,  # pylint: disable=unused-argument
+                                 rotation: int | None = None) -> DetectorResult:
+        """
+        This method detects humans, given regions of the frame which are worth a closer look.
+        Detectors which cannot make use of the regions ignore them, and detect on the whole
+        frame, so a detection outside the regions is still found.
+        """
+        return self.detect_humans(frame, rotation)
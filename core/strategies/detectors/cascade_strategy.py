@@ -0,0 +1,148 @@
+"""
+A detector which runs a cheap detector first, and a heavy detector only to confirm.
+"""
+from dataclasses import dataclass
+from threading import Lock
+from time import monotonic, perf_counter
+
+import numpy
+
+from core.strategies.detectors.base_detector_strategy import (
+    BaseDetectorStrategy,
+    DetectorResult,
+)
+from core.utils.logger import get_logger
+from core.utils.regions import create_result, empty_regions
+
+# Add logging support.
+logger = get_logger(__name__)
+
+
+@dataclass
+class CascadeStageStats:
+    """This class represents the counters of a cascade stage."""
+    name: str
+    frames: int = 0
+    hits: int = 0
+    total_time: float = 0.0
+
+    @property
+    def hit_rate(self) -> float:
+        """This property returns the ratio of frames the stage flagged."""
+        return self.hits / self.frames if self.frames else 0.0
+
+    @property
+    def mean_time(self) -> float:
+        """This property returns the mean time of the stage in seconds."""
+        return self.total_time / self.frames if self.frames else 0.0
+
+
+class CascadeDetectorStrategy(BaseDetectorStrategy):  # pylint: disable=too-many-instance-attributes
+    """
+    The cascade strategy runs the first stage, e.g. motion or a low resolution
+    HOG, on every frame. The detector only runs on the frames, or the regions,
+    the first stage flags. Detections scored between the borderline and the
+    accept thresholds are checked again by the refine detector, e.g. a tiling
+    detector which looks at them in a higher resolution. The counters of
+    the stages are logged every stats interval, for tuning the thresholds.
+    """
+    ACCEPT_THRES: float = 0.65
+    BORDERLINE_THRES: float = 0.4
+    NMS_THRES: float = 0.5
+    STATS_INTERVAL: float = 600.0
+
+    def __init__(self,  # pylint: disable=too-many-arguments,too-many-positional-arguments
+                 first_stage: BaseDetectorStrategy,
+                 detector: BaseDetectorStrategy,
+                 refine_detector: BaseDetectorStrategy | None = None,
+                 accept_threshold: float = ACCEPT_THRES,
+                 borderline_threshold: float = BORDERLINE_THRES,
+                 stats_interval: float = STATS_INTERVAL) -> None:
+        self._first_stage: BaseDetectorStrategy = first_stage
+        self._detector: BaseDetectorStrategy = detector
+        self._refine_detector: BaseDetectorStrategy | None = refine_detector
+        self._accept_threshold: float = accept_threshold
+        self._borderline_threshold: float = borderline_threshold
+
+        self._stats: dict[str, CascadeStageStats] = {
+            name: CascadeStageStats(name) for name in ("first_stage", "detector", "refine")
+        }
+        self._stats_interval: float = stats_interval
+        self._stats_logged_at: float = monotonic()
+        self._lock: Lock = Lock()
+
+    def detect_humans(self,
+                      frame: numpy.ndarray,
+                      rotation: int | None = None) -> DetectorResult:
+        """This method detects if there are any humans in the frame, stage by stage."""
+        self._log_stats()
+        started_at = perf_counter()
+        first_result = self._first_stage.detect_humans(frame, rotation)
+        self._record("first_stage", started_at, first_result.human_found)
+        if not first_result.human_found:
+            return DetectorResult(image=frame, human_found=False, regions=empty_regions(),
+                                  num_detections=0, motion=first_result.motion)
+
+        # Look closer at the regions the first stage flagged.
+        started_at = perf_counter()
+        result = self._detector.detect_humans_in_regions(frame, self._regions_of(first_result),
+                                                         rotation)
+        regions, scores = self._regions_of(result), self._scores_of(result)
+        accepted = scores >= self._accept_threshold
+        borderline = ~accepted & (scores >= self._borderline_threshold)
+        self._record("detector", started_at, bool(accepted.any()))
+
+        # Check the borderline detections again in a higher resolution.
+        found_regions = [regions[accepted]]
+        found_scores = [scores[accepted]]
+        if self._refine_detector is not None and borderline.any():
+            started_at = perf_counter()
+            refined = self._refine_detector.detect_humans_in_regions(frame, regions[borderline],
+                                                                     rotation)
+            refined_scores = self._scores_of(refined)
+            refined_accepted = refined_scores >= self._accept_threshold
+            self._record("refine", started_at, bool(refined_accepted.any()))
+            found_regions.append(self._regions_of(refined)[refined_accepted])
+            found_scores.append(refined_scores[refined_accepted])
+
+        return create_result(frame, numpy.concatenate(found_regions),
+                             numpy.concatenate(found_scores), self.NMS_THRES,
+                             motion=first_result.motion)
+
+    def get_stats(self) -> list[CascadeStageStats]:
+        """This method returns a copy of the counters of each stage."""
+        with self._lock:
+            return [CascadeStageStats(**vars(stats)) for stats in self._stats.values()]
+
+    # Internal methods
+    def _record(self, name: str, started_at: float, hit: bool) -> None:
+        """This method records the time and the outcome of a stage."""
+        elapsed = perf_counter() - started_at
+        with self._lock:
+            stats = self._stats[name]
+            stats.frames += 1
+            stats.hits += int(hit)
+            stats.total_time += elapsed
+
+    def _log_stats(self) -> None:
+        """This method logs the counters of each stage, once every stats interval."""
+        with self._lock:
+            if monotonic() - self._stats_logged_at < self._stats_interval:
+                return
+            self._stats_logged_at = monotonic()
+        for stats in self.get_stats():
+            logger.info("Cascade stage %s: %d frames, hit rate %.2f, mean time %.1f ms",
+                        stats.name, stats.frames, stats.hit_rate, stats.mean_time * 1000)
+
+    @staticmethod
+    def _regions_of(result: DetectorResult) -> numpy.ndarray:
+        """This method returns the regions of a result."""
+        return result.regions if result.regions is not None else empty_regions()
+
+    @staticmethod
+    def _scores_of(result: DetectorResult) -> numpy.ndarray:
+        """This method returns the scores of a result, detectors without scores are trusted."""
+        if result.scores is not None:
+            return numpy.asarray(result.scores, dtype=numpy.float32)
+        count = len(result.regions) if result.regions is not None else 0
+        return numpy.ones(count, dtype=numpy.float32)
@@ -1,78 +1,231 @@
 """
 An TinyML detection technique using Efficientdet model.
 """
+from threading import Lock
 from typing import Any
 
-import cv2
 import numpy
-from tflite_runtime.interpreter import Interpreter
+from tflite_runtime.interpreter import Interpreter, OpResolverType, load_delegate
 
-from .base_detector_strategy import BaseDetectorStrategy, DetectorResult
+from core.strategies.detectors.base_detector_strategy import (
+    BaseDetectorStrategy,
+    DetectorResult,
+)
+from core.utils.logger import get_logger
+from core.utils.preprocessing import TensorPreprocessor, rotated_shape
+from core.utils.regions import create_result
 
+# Add logging support.
+logger = get_logger(__name__)
 
-class EfficientdetStrategy(BaseDetectorStrategy):
+
+class EfficientdetStrategy(BaseDetectorStrategy):  # pylint: disable=too-many-instance-attributes
     """
     The Efficientdet strategy for detection of objects.
+    The model and the label-map are loaded once, and the interpreter
+    is re-used for every frame. Float, uint8 and int8 model variants are
+    supported; the pixels are scaled with the mean, the standard deviation
+    and the quantisation parameters of the input tensor.
     """
     MODEL_PATH: str = "models/efficientdet_1.tflite"
     LABEL_PATH: str = "models/efficientdet_1_labelmap.txt"
     DETECTION_THRES: float = 0.65
+    INPUT_MEAN: float = 127.5
+    INPUT_STD: float = 127.5
+
+    def __init__(self,  # pylint: disable=too-many-arguments,too-many-positional-arguments
+                 model_path: str = MODEL_PATH,
+                 label_path: str = LABEL_PATH,
+                 detection_threshold: float = DETECTION_THRES,
+                 nms_threshold: float | None = None,
+                 num_threads: int | None = None,
+                 use_xnnpack: bool = True,
+                 delegate_path: str | None = None,
+                 input_mean: float = INPUT_MEAN,
+                 input_std: float = INPUT_STD) -> None:
+        self._detection_threshold: float = detection_threshold
+        self._nms_threshold: float | None = nms_threshold
+
+        # Create the model interpreter once.
+        self._interpreter: Interpreter = Interpreter(
+            model_path=model_path,
+            num_threads=num_threads,
+            experimental_delegates=[load_delegate(delegate_path)] if delegate_path else None,
+            # XNNPACK is one of the default delegates of the built-in op resolver.
+            experimental_op_resolver_type=(
+                OpResolverType.AUTO if use_xnnpack
+                else OpResolverType.BUILTIN_WITHOUT_DEFAULT_DELEGATES
+            ),
+        )
+        self._interpreter.allocate_tensors()
+
+        # Resolve the input and output tensor indices once.
+        input_details: list[dict[str, Any]] = self._interpreter.get_input_details()
+        output_details: list[dict[str, Any]] = self._interpreter.get_output_details()
+        batch_size, self._input_height, self._input_width, _ = input_details[0]['shape']
+        self._input_index: int = input_details[0]['index']
+        self._boxes_index: int = output_details[0]['index']
+        self._classes_index: int = output_details[1]['index']
+        self._scores_index: int = output_details[2]['index']
+        self._output_quantization: dict[int, tuple[float, int]] = {
+            details['index']: details['quantization'] for details in output_details[:3]
+        }
+        self._input_lut: numpy.ndarray | None = self._create_input_lut(
+            input_details[0], input_mean, input_std)
 
-    @classmethod
-    def detect_humans(cls, frame: numpy.ndarray) -> DetectorResult:
+        # Read label-map.
+        with open(label_path, 'r', encoding="utf-8") as labelmap:
+            self._labels: list[str] = [line.strip() for line in labelmap.readlines()]
+        self._person_id: int = self._labels.index('person')
+
+        # The interpreter is not thread-safe, guard its tensors.
+        self._lock: Lock = Lock()
+        # The batch size of the allocated input-tensor, None while it is being resized.
+        self._batch_size: int | None = int(batch_size)
+        self._supports_batching: bool = True
+        self._preprocessor: TensorPreprocessor = TensorPreprocessor(self._input_width,
+                                                                    self._input_height)
+        self._rgb_frame: numpy.ndarray = numpy.empty((self._input_height, self._input_width, 3),
+                                                     dtype=numpy.uint8)
+
+    def detect_humans(self,
+                      frame: numpy.ndarray,
+                      rotation: int | None = None) -> DetectorResult:
         """This method detects if there are any humans in the frame."""
-        # Create an model interpreter.
-        interpreter: Interpreter = Interpreter(model_path=cls.MODEL_PATH)
-        interpreter.allocate_tensors()
+        with self._lock:
+            self._resize_batch(1)
+            self._write_input([frame], [rotation])
+            boxes, classes, scores = self._invoke()
+        return self._create_result(frame, rotation, boxes[0], classes[0], scores[0])
+
+    def detect_humans_batch(self,
+                            frames: list[numpy.ndarray],
+                            rotations: list[int | None] | None = None
+                            ) -> list[DetectorResult]:
+        """
+        This method detects humans in the frames with one interpreter invocation.
+        The input-tensor only grows, a smaller batch is padded up to its size,
+        so batches of changing sizes do not reallocate the tensors every time.
+        """
+        rotations = rotations or [None] * len(frames)
+        if not self._supports_batching or (len(frames) == 1 and self._batch_size == 1):
+            return [self.detect_humans(frame, rotation)
+                    for frame, rotation in zip(frames, rotations)]
 
-        # Get model input and output details.
-        input_details: list[dict[str, Any]] = interpreter.get_input_details()
-        output_details: list[dict[str, Any]] = interpreter.get_output_details()
-        _, input_height, input_width, _ = input_details[0]['shape']
+        with self._lock:
+            try:
+                self._resize_batch(max(len(frames), self._batch_size or 1))
+                # The padding rows keep earlier frames, their outputs are ignored.
+                self._write_input(frames, rotations)
+                boxes, classes, scores = self._invoke()
+                if len(scores) != self._batch_size:
+                    raise ValueError("The outputs are not batched.")
+            except (RuntimeError, ValueError) as error:
+                logger.warning("The model does not support batching: %s", error)
+                self._supports_batching = False
+                self._resize_batch(1)
+        if not self._supports_batching:
+            return [self.detect_humans(frame, rotation)
+                    for frame, rotation in zip(frames, rotations)]
 
-        # Prepare image for input-tensor.
-        image = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        image = cv2.resize(image, (input_width, input_height), interpolation=cv2.INTER_AREA)
-        image_height, image_width = image.shape[:2]
+        return [
+            self._create_result(frame, rotations[index],
+                                boxes[index], classes[index], scores[index])
+            for index, frame in enumerate(frames)
+        ]
 
-        # Apply the frame into first tensor of the model.
-        input_data = numpy.expand_dims(image, axis=0)
-        interpreter.set_tensor(input_details[0]['index'], input_data)
+    # Internal methods
+    def _write_input(self,
+                     frames: list[numpy.ndarray],
+                     rotations: list[int | None]) -> None:
+        """This method preprocesses the frames straight into the input-tensor memory."""
+        input_tensor = self._interpreter.tensor(self._input_index)()
+        for index, (frame, rotation) in enumerate(zip(frames, rotations)):
+            if self._input_lut is None:
+                self._preprocessor.process(frame, input_tensor[index], rotation)
+            else:
+                # Scale and quantise the pixels with one table lookup.
+                self._preprocessor.process(frame, self._rgb_frame, rotation)
+                numpy.take(self._input_lut, self._rgb_frame, out=input_tensor[index])
+        # The interpreter refuses to run while its memory is referenced.
+        del input_tensor
 
+    def _resize_batch(self, batch_size: int) -> None:
+        """This method resizes the input-tensor, only if the batch size is not the allocated one."""
+        if batch_size == self._batch_size:
+            return
+        # Forget the size first, so a failed allocation is resized again on rollback.
+        self._batch_size = None
+        self._interpreter.resize_tensor_input(
+            self._input_index,
+            [batch_size, self._input_height, self._input_width, 3]
+        )
+        self._interpreter.allocate_tensors()
+        self._batch_size = batch_size
+
+    def _invoke(self) -> tuple[numpy.ndarray, ...]:
+        """This method runs the model, and returns the boxes, classes and scores."""
         # Calculate the output tensor.
-        interpreter.invoke()
+        self._interpreter.invoke()
 
         # Recieve the output.
-        boxes = interpreter.get_tensor(output_details[0]['index'])[0]
-        classes = interpreter.get_tensor(output_details[1]['index'])[0]
-        scores = interpreter.get_tensor(output_details[2]['index'])[0]
+        return (self._get_output(self._boxes_index),
+                self._get_output(self._classes_index),
+                self._get_output(self._scores_index))
 
-        # Read label-map.
-        with open(cls.LABEL_PATH, 'r', encoding="utf-8") as labelmap:
-            labels = [line.strip() for line in labelmap.readlines()]
-
-        # Convert RGB to BGR again.
-        image = cv2.cvtColor(image, cv2.COLOR_RGB2BGR)
-
-        # Travers through detections.
-        detection_regions: list[tuple[int, int, int, int]] = []
-        for score, box, pred_class in zip(scores, boxes, classes):
-            if score < cls.DETECTION_THRES:
-                continue
-
-            if (labels[int(pred_class)]) == 'person':
-                frame_height, frame_width = frame.shape[:2]
-                min_y = round(box[0] * frame_height)
-                min_x = round(box[1] * frame_width)
-                max_y = round(box[2] * frame_height)
-                max_x = round(box[3] * frame_width)
-                detection_regions.append((min_x, max_x, min_y, max_y))
-                cv2.rectangle(frame, (min_x, min_y), (max_x, max_y), (0, 255, 0), 5)
-
-        result = DetectorResult(
-            image=frame,
-            human_found=len(detection_regions) > 0,
-            regions=detection_regions,
-            num_detections=len(detection_regions),
-        )
-        return result
+    def _get_output(self, index: int) -> numpy.ndarray:
+        """This method returns an output tensor, de-quantised if needed."""
+        output = self._interpreter.get_tensor(index)
+        scale, zero_point = self._output_quantization[index]
+        if scale == 0:
+            return output
+        return (output.astype(numpy.float32) - zero_point) * scale
+
+    @staticmethod
+    def _create_input_lut(input_details: dict[str, Any],
+                          input_mean: float,
+                          input_std: float) -> numpy.ndarray | None:
+        """
+        This method creates a lookup table from pixel values into input-tensor values.
+        None is returned if the pixels can be written into the tensor as they are.
+        """
+        dtype = numpy.dtype(input_details['dtype'])
+        scale, zero_point = input_details['quantization']
+        pixels = numpy.arange(256, dtype=numpy.float64)
+        if dtype.kind == 'f':
+            return ((pixels - input_mean) / input_std).astype(dtype)
+        if scale == 0:
+            # The model takes raw pixels, shifted into the range of signed tensors.
+            if dtype == numpy.uint8:
+                return None
+            return (pixels - 128).astype(dtype) if dtype == numpy.int8 else pixels.astype(dtype)
+
+        # Quantise the normalised pixels with the parameters of the input tensor.
+        limits = numpy.iinfo(dtype)
+        lut = numpy.clip(numpy.rint((pixels - input_mean) / input_std / scale + zero_point),
+                         limits.min, limits.max).astype(dtype)
+        if dtype == numpy.uint8 and numpy.abs(lut.astype(numpy.int16) - pixels).max() <= 1:
+            # Off-by-one rounding does not justify an extra pass over the input.
+            return None
+        return lut
+
+    def _create_result(self,
+                       frame: numpy.ndarray,
+                       rotation: int | None,
+                       boxes: numpy.ndarray,
+                       classes: numpy.ndarray,
+                       scores: numpy.ndarray) -> DetectorResult:
+        """This method converts the output of the model for a frame into a result."""
+        # Keep the confident person detections.
+        mask = (scores >= self._detection_threshold) \
+            & (classes.astype(numpy.int32) == self._person_id)
+        boxes = boxes[mask]
+        scores = scores[mask]
+
+        # Scale (min_y, min_x, max_y, max_x) ratios into (min_x, max_x, min_y, max_y) pixels.
+        frame_height, frame_width = rotated_shape(frame.shape, rotation)
+        regions = numpy.rint(
+            boxes[:, [1, 3, 0, 2]] * (frame_width, frame_width, frame_height, frame_height)
+        ).astype(numpy.int32)
+
+        return create_result(frame, regions, scores, self._nms_threshold)
@@ -3,31 +3,79 @@ The HOG descriptor strategy for detector strategies.
 """
 import cv2
 import numpy
-from base_detector_strategy import BaseDetectorStrategy, DetectorResult
+
+from core.strategies.detectors.base_detector_strategy import BaseDetectorStrategy, DetectorResult
+from core.utils.preprocessing import rotate_frame, rotated_shape
+from core.utils.regions import create_result, rectangles_to_regions
 
 
 class HogDescriptorStrategy(BaseDetectorStrategy):
     """
     The HOG descriptor strategy for detector strategies.
+    It is a CPU-cheap fallback detector; the frame is downscaled before the
+    image pyramid is built, and the presets trade recall for speed.
     """
-    @staticmethod
-    def detect_humans(frame: numpy.ndarray) -> DetectorResult:
+    # Presets of (detection width, window stride, pyramid scale).
+    PRESETS: dict[str, tuple[int, tuple[int, int], float]] = {
+        "fast": (320, (8, 8), 1.2),
+        "balanced": (480, (8, 8), 1.1),
+        "accurate": (640, (4, 4), 1.05),
+    }
+    PRESET: str = "balanced"
+    PADDING: tuple[int, int] = (8, 8)
+    HIT_THRES: float = 0.0
+    NMS_THRES: float = 0.5
+
+    def __init__(self,  # pylint: disable=too-many-arguments,too-many-positional-arguments
+                 preset: str = PRESET,
+                 detection_width: int | None = None,
+                 win_stride: tuple[int, int] | None = None,
+                 scale: float | None = None,
+                 hit_threshold: float = HIT_THRES,
+                 nms_threshold: float = NMS_THRES) -> None:
+        preset_width, preset_stride, preset_scale = self.PRESETS[preset]
+        self._detection_width: int = detection_width or preset_width
+        self._win_stride: tuple[int, int] = tuple(win_stride or preset_stride)
+        self._scale: float = scale or preset_scale
+        self._hit_threshold: float = hit_threshold
+        self._nms_threshold: float = nms_threshold
+
+        # Create the descriptor once.
+        self._hog_detector: cv2.HOGDescriptor = cv2.HOGDescriptor()
+        self._hog_detector.setSVMDetector(cv2.HOGDescriptor_getDefaultPeopleDetector())
+
+    def detect_humans(self,
+                      frame: numpy.ndarray,
+                      rotation: int | None = None) -> DetectorResult:
         """This method detects if there are any humans in the frame."""
-        # Detect humans in the frame.
-        hog_detector = cv2.HOGDescriptor()
-        hog_detector.setSVMDetector(cv2.HOGDescriptor_getDefaultPeopleDetector())
-        grey = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-        regions, num_detections = hog_detector.detectMultiScale(
-            grey,
-            winStride=(2, 2),
-            padding=(4, 4),
-            scale=1.03,
-        )
+        small = self._prepare(frame, rotation)
 
-        result = DetectorResult(
-            image=frame,
-            human_found=len(num_detections) > 0,
-            regions=regions,
-            num_detections=num_detections,
+        # Detect humans in the downscaled frame.
+        rectangles, weights = self._hog_detector.detectMultiScale(
+            small,
+            hitThreshold=self._hit_threshold,
+            winStride=self._win_stride,
+            padding=self.PADDING,
+            scale=self._scale,
         )
-        return result
+        scores = numpy.asarray(weights, dtype=numpy.float32).reshape(-1)
+
+        # Scale (x, y, w, h) rectangles into (min_x, max_x, min_y, max_y) frame pixels.
+        scale = rotated_shape(frame.shape, rotation)[1] / small.shape[1]
+        regions = rectangles_to_regions(rectangles, scale)
+
+        return create_result(frame, regions, scores, self._nms_threshold)
+
+    # Internal methods
+    def _prepare(self, frame: numpy.ndarray, rotation: int | None) -> numpy.ndarray:
+        """This method returns a downscaled and rotated grayscale copy of the frame."""
+        frame_height, frame_width = rotated_shape(frame.shape, rotation)
+        width = min(self._detection_width, frame_width)
+        height = max(1, round(frame_height * width / frame_width))
+        # The frame is resized before the rotation, so only the small image is rotated.
+        size = rotated_shape((height, width), rotation)[::-1]
+        small = cv2.resize(frame, size, interpolation=cv2.INTER_AREA)
+        if small.ndim == 3:
+            small = cv2.cvtColor(small,
+                                 cv2.COLOR_BGRA2GRAY if small.shape[2] == 4 else cv2.COLOR_BGR2GRAY)
+        return rotate_frame(small, rotation)
@@ -0,0 +1,73 @@
+"""
+A detector which runs a heavier detector only when motion is seen.
+"""
+from dataclasses import dataclass
+from threading import Lock
+
+import numpy
+
+from core.strategies.detectors.base_detector_strategy import BaseDetectorStrategy, DetectorResult
+from core.strategies.detectors.motion_strategy import MotionStrategy
+from core.utils.regions import empty_regions
+
+
+@dataclass
+class MotionGateStats:
+    """This class represents the counters of a motion gate."""
+    frames_run: int = 0
+    frames_skipped: int = 0
+
+    @property
+    def skip_ratio(self) -> float:
+        """This property returns the ratio of frames which skipped the detector."""
+        total = self.frames_run + self.frames_skipped
+        return self.frames_skipped / total if total else 0.0
+
+
+class MotionGateStrategy(BaseDetectorStrategy):
+    """
+    The motion gate strategy calls the wrapped detector only if the
+    motion strategy reports motion. After a human is found, the detector
+    keeps running for a few frames to follow people who stand still.
+    """
+    HOLD_FRAMES: int = 3
+
+    def __init__(self,
+                 detector: BaseDetectorStrategy,
+                 motion_strategy: MotionStrategy | None = None,
+                 hold_frames: int = HOLD_FRAMES) -> None:
+        self._detector: BaseDetectorStrategy = detector
+        self._motion_strategy: MotionStrategy = motion_strategy or MotionStrategy()
+        self._hold_frames: int = hold_frames
+        self._frames_to_hold: int = 0
+        self._stats: MotionGateStats = MotionGateStats()
+        self._lock: Lock = Lock()
+
+    def detect_humans(self,
+                      frame: numpy.ndarray,
+                      rotation: int | None = None) -> DetectorResult:
+        """This method detects if there are any humans in the frame when there is motion."""
+        motion_result = self._motion_strategy.detect_humans(frame, rotation)
+
+        with self._lock:
+            if run_detector := motion_result.motion or self._frames_to_hold > 0:
+                self._stats.frames_run += 1
+                self._frames_to_hold = max(0, self._frames_to_hold - 1)
+            else:
+                self._stats.frames_skipped += 1
+
+        if not run_detector:
+            return DetectorResult(image=frame, human_found=False, regions=empty_regions(),
+                                  num_detections=0, motion=False)
+
+        result = self._detector.detect_humans_in_regions(frame, motion_result.regions, rotation)
+        result.motion = motion_result.motion
+        if result.human_found:
+            with self._lock:
+                self._frames_to_hold = self._hold_frames
+        return result
+
+    def get_stats(self) -> MotionGateStats:
+        """This method returns a copy of the counters."""
+        with self._lock:
+            return MotionGateStats(self._stats.frames_run, self._stats.frames_skipped)
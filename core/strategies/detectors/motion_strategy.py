@@ -0,0 +1,111 @@
+"""
+A cheap motion detection technique using background subtraction.
+"""
+from threading import Lock
+
+import cv2
+import numpy
+
+from core.strategies.detectors.base_detector_strategy import BaseDetectorStrategy, DetectorResult
+from core.utils.preprocessing import rotate_frame, rotated_shape
+from core.utils.regions import empty_regions, rectangles_to_regions
+
+
+class MotionStrategy(BaseDetectorStrategy):  # pylint: disable=too-many-instance-attributes
+    """
+    The motion strategy compares a downscaled grayscale copy of the frame
+    with a running-average background. It reports motion in the regions
+    instead of humans, and is meant to be used in front of heavier detectors.
+    Regions are given as (min_x, max_x, min_y, max_y) ratios of the frame.
+    """
+    DOWNSCALE_WIDTH: int = 160
+    PIXEL_THRES: int = 25
+    MOTION_THRES: float = 0.01
+    LEARNING_RATE: float = 0.05
+
+    def __init__(self,
+                 regions: list[tuple[float, float, float, float]] | None = None,
+                 motion_threshold: float = MOTION_THRES,
+                 pixel_threshold: int = PIXEL_THRES,
+                 learning_rate: float = LEARNING_RATE,
+                 downscale_width: int = DOWNSCALE_WIDTH) -> None:
+        self._regions = regions
+        self._motion_threshold: float = motion_threshold
+        self._pixel_threshold: int = pixel_threshold
+        self._learning_rate: float = learning_rate
+        self._downscale_width: int = downscale_width
+
+        self._background: numpy.ndarray | None = None
+        self._region_mask: numpy.ndarray | None = None
+        self._lock: Lock = Lock()
+
+    def detect_humans(self,
+                      frame: numpy.ndarray,
+                      rotation: int | None = None) -> DetectorResult:
+        """This method detects if there is any motion in the regions of the frame."""
+        small = self._prepare(frame, rotation)
+
+        with self._lock:
+            # The first frame only initialises the background.
+            if self._background is None or self._background.shape != small.shape:
+                self._background = small.astype(numpy.float32)
+                self._region_mask = self._create_region_mask(small.shape)
+                return DetectorResult(image=frame, human_found=False, regions=empty_regions(),
+                                      num_detections=0, motion=False)
+            difference = cv2.absdiff(small, cv2.convertScaleAbs(self._background))
+            cv2.accumulateWeighted(small, self._background, self._learning_rate)
+            region_mask = self._region_mask
+
+        # Find the changed pixels within the regions.
+        _, mask = cv2.threshold(difference, self._pixel_threshold, 255, cv2.THRESH_BINARY)
+        if region_mask is not None:
+            mask = cv2.bitwise_and(mask, region_mask)
+            area = cv2.countNonZero(region_mask)
+        else:
+            area = mask.size
+        motion = area > 0 and cv2.countNonZero(mask) / area >= self._motion_threshold
+
+        # Scale the moving regions back to frame coordinates.
+        motion_regions = empty_regions()
+        if motion:
+            scale = rotated_shape(frame.shape, rotation)[1] / small.shape[1]
+            contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+            rectangles = [cv2.boundingRect(contour) for contour in contours]
+            motion_regions = rectangles_to_regions(rectangles, scale)
+
+        return DetectorResult(
+            image=frame,
+            human_found=motion,
+            regions=motion_regions,
+            num_detections=len(motion_regions),
+            motion=motion,
+        )
+
+    def reset(self) -> None:
+        """This method forgets the learned background."""
+        with self._lock:
+            self._background = None
+
+    # Internal methods
+    def _prepare(self, frame: numpy.ndarray, rotation: int | None) -> numpy.ndarray:
+        """This method returns a downscaled, blurred and rotated grayscale copy of the frame."""
+        frame_height, frame_width = rotated_shape(frame.shape, rotation)
+        height = max(1, round(frame_height * self._downscale_width / frame_width))
+        # The frame is resized before the rotation, so only the small image is rotated.
+        size = rotated_shape((height, self._downscale_width), rotation)[::-1]
+        small = cv2.resize(frame, size, interpolation=cv2.INTER_AREA)
+        if small.ndim == 3:
+            small = cv2.cvtColor(small,
+                                 cv2.COLOR_BGRA2GRAY if small.shape[2] == 4 else cv2.COLOR_BGR2GRAY)
+        return cv2.GaussianBlur(rotate_frame(small, rotation), (5, 5), 0)
+
+    def _create_region_mask(self, shape: tuple[int, ...]) -> numpy.ndarray | None:
+        """This method creates a mask which is set within the configured regions."""
+        if not self._regions:
+            return None
+        height, width = shape[:2]
+        mask = numpy.zeros((height, width), dtype=numpy.uint8)
+        for min_x, max_x, min_y, max_y in self._regions:
+            mask[round(min_y * height):round(max_y * height),
+                 round(min_x * width):round(max_x * width)] = 255
+        return mask
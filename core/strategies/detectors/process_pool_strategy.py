@@ -0,0 +1,248 @@
+"""
+A detector which runs another detector in dedicated worker processes.
+"""
+import atexit
+import os
+import sys
+from collections.abc import Callable
+from dataclasses import dataclass
+from multiprocessing import get_context
+from multiprocessing.connection import Connection
+from multiprocessing.process import BaseProcess
+from multiprocessing.shared_memory import SharedMemory
+from queue import Queue
+
+import numpy
+
+from core.strategies.detectors.base_detector_strategy import (
+    BaseDetectorStrategy,
+    DetectorResult,
+)
+from core.utils.logger import get_logger
+
+# Add logging support.
+logger = get_logger(__name__)
+
+
+@dataclass
+class FrameRequest:
+    """This class represents a batch of frames, one after another in the shared memory."""
+    memory_name: str
+    # The shape, the dtype and the offset of each frame.
+    frames: list[tuple[tuple[int, ...], str, int]]
+    rotations: list[int | None]
+
+
+def attach_shared_memory(name: str) -> SharedMemory:
+    """
+    This function attaches to the shared memory of the parent, without tracking it.
+    The parent owns the memory, and unlinks it. Before Python 3.13, the workers
+    share the resource tracker of the parent, where the memory is already
+    registered; unregistering it from a worker would unregister the parent's.
+    """
+    if sys.version_info >= (3, 13):
+        return SharedMemory(name=name, track=False)  # pylint: disable=unexpected-keyword-arg
+    return SharedMemory(name=name)
+
+
+def detect_in_worker(detector: BaseDetectorStrategy,
+                     frames: list[numpy.ndarray],
+                     rotations: list[int | None]) -> tuple[bool, object]:
+    """This function runs the batch, and returns if it succeeded with the results or the error."""
+    try:
+        results = detector.detect_humans_batch(frames, rotations)
+    except Exception as error:  # pylint: disable=broad-exception-caught
+        return False, repr(error)
+    # The frames stay in the parent, only the small arrays are sent back.
+    for result in results:
+        result.image = None
+    return True, results
+
+
+def run_worker(connection: Connection,
+               detector_factory: Callable[[], BaseDetectorStrategy],
+               cpu_cores: list[int] | None) -> None:
+    """This function serves the frame requests within a worker process."""
+    if cpu_cores:
+        os.sched_setaffinity(0, cpu_cores)
+    detector = detector_factory()
+    memory: SharedMemory | None = None
+
+    while True:
+        try:
+            request: FrameRequest | None = connection.recv()
+        except EOFError:
+            break
+        if request is None:
+            break
+
+        # Attach to the shared memory again, only when the parent has replaced it.
+        if memory is None or memory.name != request.memory_name:
+            if memory is not None:
+                memory.close()
+            memory = attach_shared_memory(request.memory_name)
+        frames = [numpy.ndarray(shape, dtype=dtype, buffer=memory.buf, offset=offset)
+                  for shape, dtype, offset in request.frames]
+        connection.send(detect_in_worker(detector, frames, request.rotations))
+        del frames
+
+    if memory is not None:
+        memory.close()
+
+
+class DetectorWorker:
+    """
+    This class represents a worker process, and the shared memory it reads the frames from.
+    """
+    def __init__(self,
+                 name: str,
+                 detector_factory: Callable[[], BaseDetectorStrategy],
+                 cpu_cores: list[int] | None,
+                 start_method: str) -> None:
+        self.name: str = name
+        self._detector_factory: Callable[[], BaseDetectorStrategy] = detector_factory
+        self._cpu_cores: list[int] | None = cpu_cores
+        self._context = get_context(start_method)
+        self._process: BaseProcess | None = None
+        self._connection: Connection | None = None
+        self._memory: SharedMemory | None = None
+
+    def start(self) -> None:
+        """This method starts the worker process."""
+        self._connection, child_connection = self._context.Pipe()
+        self._process = self._context.Process(
+            target=run_worker,
+            args=(child_connection, self._detector_factory, self._cpu_cores),
+            name=self.name,
+            daemon=True,
+        )
+        self._process.start()
+        child_connection.close()
+
+    def restart(self) -> None:
+        """This method replaces the worker process."""
+        logger.warning("[%s] Restarting the detector process...", self.name)
+        self.stop()
+        self.start()
+
+    def stop(self) -> None:
+        """This method stops the worker process, and releases the shared memory."""
+        if self._process is not None:
+            try:
+                self._connection.send(None)
+            except OSError:
+                pass
+            self._process.join(timeout=1)
+            if self._process.is_alive():
+                self._process.kill()
+                self._process.join()
+            self._connection.close()
+            self._process = None
+        if self._memory is not None:
+            self._memory.close()
+            self._memory.unlink()
+            self._memory = None
+
+    def detect(self,
+               frames: list[numpy.ndarray],
+               rotations: list[int | None],
+               timeout: float) -> tuple[bool, object]:
+        """This method copies the frames into the shared memory, and waits for the results."""
+        size = sum(frame.nbytes for frame in frames)
+        if self._memory is None or self._memory.size < size:
+            if self._memory is not None:
+                self._memory.close()
+                self._memory.unlink()
+            self._memory = SharedMemory(create=True, size=max(size, 1))
+        layout: list[tuple[tuple[int, ...], str, int]] = []
+        offset = 0
+        for frame in frames:
+            shared_frame = numpy.ndarray(frame.shape, dtype=frame.dtype,
+                                         buffer=self._memory.buf, offset=offset)
+            shared_frame[...] = frame
+            del shared_frame
+            layout.append((frame.shape, frame.dtype.str, offset))
+            offset += frame.nbytes
+
+        self._connection.send(FrameRequest(self._memory.name, layout, rotations))
+        if not self._connection.poll(timeout):
+            raise TimeoutError(f"The detector process did not answer in {timeout} seconds.")
+        return self._connection.recv()
+
+
+class ProcessPoolDetectorStrategy(BaseDetectorStrategy):
+    """
+    The process pool strategy runs the detector in worker processes, so the
+    heavy work does not contend for the GIL with the rest of the system.
+    Frames are handed over through shared memory instead of being pickled,
+    a batch of frames is run by one worker as a batch, the workers can be
+    pinned to CPU cores, and crashed or stuck workers are replaced. A stuck
+    worker raises TimeoutError, which is an OSError too.
+    """
+    WORKERS: int = 1
+    TIMEOUT: float = 30.0
+    START_METHOD: str = "spawn"
+
+    def __init__(self,
+                 detector_factory: Callable[[], BaseDetectorStrategy],
+                 workers: int = WORKERS,
+                 cpu_cores: list[int] | None = None,
+                 timeout: float = TIMEOUT,
+                 start_method: str = START_METHOD) -> None:
+        self._timeout: float = timeout
+        self._workers: list[DetectorWorker] = []
+        self._idle_workers: Queue = Queue()
+        for index in range(workers):
+            # Pin each worker to one of the given cores, in turns.
+            worker_cores = [cpu_cores[index % len(cpu_cores)]] if cpu_cores else None
+            worker = DetectorWorker(f"detector-{index}", detector_factory,
+                                    worker_cores, start_method)
+            worker.start()
+            self._workers.append(worker)
+            self._idle_workers.put(worker)
+        atexit.register(self.close)
+
+    def detect_humans(self,
+                      frame: numpy.ndarray,
+                      rotation: int | None = None) -> DetectorResult:
+        """This method detects if there are any humans in the frame within a worker process."""
+        return self.detect_humans_batch([frame], [rotation])[0]
+
+    def detect_humans_batch(self,
+                            frames: list[numpy.ndarray],
+                            rotations: list[int | None] | None = None
+                            ) -> list[DetectorResult]:
+        """This method detects humans in the frames as one batch within a worker process."""
+        rotations = rotations or [None] * len(frames)
+        worker: DetectorWorker = self._idle_workers.get()
+        try:
+            try:
+                succeeded, payload = worker.detect(frames, rotations, self._timeout)
+            except (EOFError, OSError) as error:
+                # The process has crashed or hangs, replace it and try once more.
+                logger.error("[%s] The detector process has failed: %r", worker.name, error)
+                worker.restart()
+                succeeded, payload = worker.detect(frames, rotations, self._timeout)
+        except (EOFError, OSError) as error:
+            worker.restart()
+            raise RuntimeError(f"The detector process has failed: {error!r}") from error
+        finally:
+            self._idle_workers.put(worker)
+
+        if not succeeded:
+            raise RuntimeError(f"The detector has failed: {payload}")
+        for result, frame in zip(payload, frames):
+            result.image = frame
+        return payload
+
+    def get_detector(self) -> BaseDetectorStrategy:
+        """
+        This method returns the pool itself, to be shared as a detector factory.
+        The batches of the inference service are passed on to a worker as they are.
+        """
+        return self
+
+    def close(self) -> None:
+        """This method stops the worker processes."""
+        for worker in self._workers:
+            worker.stop()
@@ -0,0 +1,59 @@
+"""
+A detector which forwards the frames to a shared inference service.
+"""
+from concurrent.futures import Future
+from time import monotonic
+
+import numpy
+
+from core.strategies.detectors.base_detector_strategy import (
+    BaseDetectorStrategy,
+    DetectorResult,
+)
+from core.utils.inference_service import CameraSettings, InferenceService
+
+
+class SharedDetectorStrategy(BaseDetectorStrategy):
+    """
+    The shared detector strategy lets several cameras use the same
+    inference service, instead of owning a detector each.
+    The results are waited for a multiple of the latency target of the camera,
+    after which the requests are cancelled and RuntimeError is raised.
+    """
+    TIMEOUT_FACTOR: float = 5.0
+
+    def __init__(self,
+                 service: InferenceService,
+                 camera: CameraSettings,
+                 timeout_factor: float = TIMEOUT_FACTOR) -> None:
+        self._service: InferenceService = service
+        self._camera: CameraSettings = camera
+        self._timeout: float = camera.latency_target * timeout_factor
+
+    def detect_humans(self,
+                      frame: numpy.ndarray,
+                      rotation: int | None = None) -> DetectorResult:
+        """This method detects if there are any humans in the frame."""
+        return self._get_results([self._service.submit(self._camera, frame, rotation)])[0]
+
+    def detect_humans_batch(self,
+                            frames: list[numpy.ndarray],
+                            rotations: list[int | None] | None = None
+                            ) -> list[DetectorResult]:
+        """This method submits all the frames at once, so the service can batch them."""
+        rotations = rotations or [None] * len(frames)
+        return self._get_results([self._service.submit(self._camera, frame, rotation)
+                                  for frame, rotation in zip(frames, rotations)])
+
+    # Internal methods
+    def _get_results(self, futures: list[Future]) -> list[DetectorResult]:
+        """This method waits for the results until the timeout, and cancels the rest after it."""
+        deadline = monotonic() + self._timeout
+        try:
+            return [future.result(timeout=max(0.0, deadline - monotonic()))
+                    for future in futures]
+        except TimeoutError as error:
+            for future in futures:
+                future.cancel()
+            raise RuntimeError(f"The inference of camera {self._camera.name} "
+                               f"has taken longer than {self._timeout:.1f} seconds.") from error
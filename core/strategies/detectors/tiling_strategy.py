@@ -0,0 +1,154 @@
+"""
+A detector which runs another detector on regions of interest and tiles.
+"""
+from math import ceil
+
+import numpy
+
+from core.strategies.detectors.base_detector_strategy import BaseDetectorStrategy, DetectorResult
+from core.utils.logger import get_logger
+from core.utils.preprocessing import rotated_shape, unrotated_region
+from core.utils.regions import create_result, empty_regions
+
+# Add logging support.
+logger = get_logger(__name__)
+
+
+class TilingStrategy(BaseDetectorStrategy):
+    """
+    The tiling strategy restricts the wrapped detector to the regions of
+    interest, so areas like the sky or a TV are never processed.
+    In tiling mode, the detector runs on overlapping crops around the
+    moving regions instead of the whole frame, so distant people keep
+    enough pixels after the resize to the model input.
+    Regions of interest are given as (min_x, max_x, min_y, max_y) ratios
+    of the rotated frame.
+    """
+    TILE_SCALE: float = 0.5
+    TILE_OVERLAP: float = 0.25
+    MAX_TILES: int = 8
+    NMS_THRES: float = 0.5
+
+    def __init__(self,  # pylint: disable=too-many-arguments,too-many-positional-arguments
+                 detector: BaseDetectorStrategy,
+                 regions: list[tuple[float, float, float, float]] | None = None,
+                 tiling: bool = True,
+                 tile_scale: float = TILE_SCALE,
+                 tile_overlap: float = TILE_OVERLAP,
+                 max_tiles: int = MAX_TILES,
+                 nms_threshold: float = NMS_THRES) -> None:
+        self._detector: BaseDetectorStrategy = detector
+        self._regions: numpy.ndarray = numpy.array(regions or [(0.0, 1.0, 0.0, 1.0)],
+                                                   dtype=numpy.float64).reshape(-1, 4)
+        self._tiling: bool = tiling
+        self._tile_scale: float = tile_scale
+        self._tile_overlap: float = tile_overlap
+        self._max_tiles: int = max_tiles
+        self._nms_threshold: float = nms_threshold
+
+    def detect_humans(self,
+                      frame: numpy.ndarray,
+                      rotation: int | None = None) -> DetectorResult:
+        """This method detects if there are any humans in the regions of interest."""
+        return self.detect_humans_in_regions(frame, empty_regions(), rotation)
+
+    def detect_humans_in_regions(self,
+                                 frame: numpy.ndarray,
+                                 regions: numpy.ndarray,
+                                 rotation: int | None = None) -> DetectorResult:
+        """This method detects humans in tiles around the given regions of interest."""
+        height, width = rotated_shape(frame.shape, rotation)
+        roi = self._get_roi(height, width)
+        crops = self._create_tiles(roi, regions, height, width) \
+            if self._tiling and len(regions) > 0 else roi
+
+        # Run the detector on all the crops at once, so they can share a batch.
+        results = self._detector.detect_humans_batch(
+            [self._crop(frame, crop, rotation) for crop in crops],
+            [rotation] * len(crops)
+        )
+
+        # Move the detections of each crop back into frame coordinates.
+        found_regions = [empty_regions()]
+        found_scores = [numpy.empty(0, dtype=numpy.float32)]
+        for crop, result in zip(crops, results):
+            if result.regions is None or len(result.regions) == 0:
+                continue
+            found_regions.append(result.regions + crop[[0, 0, 2, 2]])
+            found_scores.append(result.scores if result.scores is not None
+                                else numpy.ones(len(result.regions), dtype=numpy.float32))
+        merged_regions = numpy.concatenate(found_regions)
+        merged_scores = numpy.concatenate(found_scores)
+
+        # Drop the detections centred outside the regions of interest, and merge the overlaps.
+        inside = self._is_inside(merged_regions, roi)
+        return create_result(frame, merged_regions[inside], merged_scores[inside],
+                             self._nms_threshold)
+
+    # Internal methods
+    def _get_roi(self, height: int, width: int) -> numpy.ndarray:
+        """This method scales the regions of interest into pixels."""
+        return numpy.rint(
+            self._regions * (width, width, height, height)
+        ).astype(numpy.int32)
+
+    def _create_tiles(self,
+                      roi: numpy.ndarray,
+                      regions: numpy.ndarray,
+                      height: int,
+                      width: int) -> numpy.ndarray:
+        """This method creates overlapping tiles, which cover the regions within the ROI."""
+        size = max(1, int(min(height, width) * self._tile_scale))
+        step = max(1, int(size * (1 - self._tile_overlap)))
+
+        tiles: list[tuple[int, int, int, int]] = []
+        for roi_min_x, roi_max_x, roi_min_y, roi_max_y in roi:
+            # Clip the regions to the region of interest.
+            clipped = numpy.stack([
+                numpy.maximum(regions[:, 0], roi_min_x),
+                numpy.minimum(regions[:, 1], roi_max_x),
+                numpy.maximum(regions[:, 2], roi_min_y),
+                numpy.minimum(regions[:, 3], roi_max_y),
+            ], axis=1)
+            clipped = clipped[(clipped[:, 0] < clipped[:, 1]) & (clipped[:, 2] < clipped[:, 3])]
+            for min_x, max_x, min_y, max_y in clipped:
+                for tile_min_x in self._tile_starts(min_x, max_x, roi_min_x, roi_max_x,
+                                                    size, step):
+                    for tile_min_y in self._tile_starts(min_y, max_y, roi_min_y, roi_max_y,
+                                                        size, step):
+                        tiles.append((tile_min_x, min(tile_min_x + size, roi_max_x),
+                                      tile_min_y, min(tile_min_y + size, roi_max_y)))
+
+        tiles_array = numpy.unique(numpy.array(tiles, dtype=numpy.int32).reshape(-1, 4), axis=0)
+        if len(tiles_array) > self._max_tiles:
+            logger.debug("Too many tiles (%d), detecting on the regions of interest.",
+                         len(tiles_array))
+            return roi
+        return tiles_array
+
+    @staticmethod
+    def _tile_starts(start: int,  # pylint: disable=too-many-arguments,too-many-positional-arguments
+                     end: int, lower: int, upper: int,
+                     size: int, step: int) -> list[int]:
+        """This method returns the tile offsets covering [start, end) within [lower, upper)."""
+        if (length := end - start) <= size:
+            # Centre a single tile on the region.
+            offsets = [start + (length - size) // 2]
+        else:
+            count = ceil((length - size) / step) + 1
+            offsets = numpy.linspace(start, end - size, count).astype(int).tolist()
+        return [int(min(max(offset, lower), max(lower, upper - size))) for offset in offsets]
+
+    @staticmethod
+    def _crop(frame: numpy.ndarray, crop: numpy.ndarray, rotation: int | None) -> numpy.ndarray:
+        """This method returns a view of the frame, for a crop of the rotated frame."""
+        min_x, max_x, min_y, max_y = unrotated_region(crop, frame.shape, rotation)
+        return frame[min_y:max_y, min_x:max_x]
+
+    @staticmethod
+    def _is_inside(regions: numpy.ndarray, roi: numpy.ndarray) -> numpy.ndarray:
+        """This method returns a mask of the regions centred within any region of interest."""
+        centre_x = (regions[:, 0] + regions[:, 1])[:, None] / 2
+        centre_y = (regions[:, 2] + regions[:, 3])[:, None] / 2
+        return numpy.any((centre_x >= roi[:, 0]) & (centre_x < roi[:, 1])
+                         & (centre_y >= roi[:, 2]) & (centre_y < roi[:, 3]), axis=1)
@@ -3,6 +3,7 @@ The base strategy for eye strategies.
 This strategy is used to define the interface for all eye strategies.
 """
 from abc import ABCMeta, abstractmethod
+from time import perf_counter
 
 from numpy import ndarray
 
@@ -11,12 +12,17 @@ from core.strategies.detectors.base_detector_strategy import (
     DetectorResult,
 )
 from core.utils.datatypes import EyeStrategyResult
+from core.utils.preprocessing import rotate_frame
+from core.utils.regions import scale_regions
 
 
 class BaseEyeStrategy(metaclass=ABCMeta):
     """
     The base strategy for eye strategies.
     """
+    # The default rotation (cv2.ROTATE_*) to apply on the raw frames of the camera.
+    ROTATION: int | None = None
+
     @abstractmethod
     def set_detector(self, detector: BaseDetectorStrategy) -> None:
         """This method sets the detector strategy."""
@@ -29,17 +35,51 @@ class BaseEyeStrategy(metaclass=ABCMeta):
     def get_frame(self) -> ndarray:
         """This method returns the frame from the camera."""
 
+    def get_rotation(self) -> int | None:
+        """This method returns the rotation to apply on the raw frames of the camera."""
+        return self.ROTATION
+
+    def get_raw_frame(self) -> ndarray:
+        """This method returns the frame from the camera, before the rotation."""
+        return self.get_frame()
+
+    def get_still_frame(self) -> ndarray:
+        """This method returns the highest quality frame for evidence images."""
+        return self.get_frame()
+
+    def get_still_regions(self,
+                          regions: ndarray,
+                          frame_shape: tuple[int, ...],
+                          still_shape: tuple[int, ...]) -> ndarray:
+        """This method maps the regions of a frame onto the last still frame, of the same view."""
+        return scale_regions(regions, frame_shape, still_shape)
+
+    def close(self) -> None:
+        """This method releases the resources of the camera."""
+
     def _detect_humans(self, frame: ndarray) -> DetectorResult:
         """This method checks if there is a person in front of the camera."""
-        return self.get_detector().detect_humans(frame)
+        return self.get_detector().detect_humans(frame, self.get_rotation())
 
     def check_if_detected(self) -> EyeStrategyResult:
         """This method checks if there are any protectors around."""
-        #  Get the frame from the camera.
+        #  Get the frame from the camera.
         try:
-            frame = self.get_frame()
+            frame = self.get_raw_frame()
         except RuntimeError as error:
             raise RuntimeError from error
-        # Detect humans in the frame.
+        return self.detect(frame)
+
+    def detect(self, frame: ndarray) -> EyeStrategyResult:
+        """This method checks if there are any humans in the given raw frame."""
+        start_time = perf_counter()
         result = self._detect_humans(frame)
-        return EyeStrategyResult(image=result.image, result=result.human_found)
+        inference_time = perf_counter() - start_time
+        # Only the frames kept as evidence are rotated in full size.
+        rotation = self.get_rotation()
+        image = rotate_frame(result.image, rotation) if result.human_found else result.image
+        return EyeStrategyResult(image=image,
+                                 result=result.human_found,
+                                 motion=result.motion,
+                                 inference_time=inference_time,
+                                 regions=result.regions)
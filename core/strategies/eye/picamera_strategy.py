@@ -1,30 +1,58 @@
 """
 The Camera strategy for eye strategies.
 """
+from threading import Event, Lock, Thread
+
 import cv2
 import numpy
 from picamera2 import Picamera2
 
 from core.strategies.detectors.base_detector_strategy import BaseDetectorStrategy
 from core.strategies.eye.base_eye_strategy import BaseEyeStrategy
+from core.utils.frame_buffer import LatestFrameBuffer
 from core.utils.logger import get_logger
+from core.utils.regions import map_regions
 
 # Add logging support.
 logger = get_logger(__name__)
 
 
-class PiCameraStrategy(BaseEyeStrategy):
+class PiCameraStrategy(BaseEyeStrategy):  # pylint: disable=too-many-instance-attributes
     """
     The camera strategy for eye strategies.
+    In streaming mode, the camera is kept started with a low-resolution
+    video configuration, and full-resolution stills are captured on demand.
+    The sensor areas (ScalerCrop) of both are kept, to map the regions between them.
     """
+    STREAM_SIZE: tuple[int, int] = (640, 480)
+    FRAME_TIMEOUT: float = 5.0
+    ROTATION: int = cv2.ROTATE_90_COUNTERCLOCKWISE
 
-    def __init__(self):
+    def __init__(self,
+                 streaming: bool = False,
+                 stream_size: tuple[int, int] = STREAM_SIZE):
         self._detector = None
+        self._streaming: bool = streaming
         self._picam2 = Picamera2()
-        still_configuration = self._picam2.create_still_configuration(
+        self._still_configuration = self._picam2.create_still_configuration(
             main={"format": 'XRGB8888'}
         )
-        self._picam2.configure(still_configuration)
+
+        # Streaming mode related attributes.
+        self._frame_buffer: LatestFrameBuffer = LatestFrameBuffer()
+        self._capture_lock: Lock = Lock()
+        self._running: Event = Event()
+        self._grabber: Thread | None = None
+        self._stream_crop: tuple[int, int, int, int] | None = None
+        self._still_crop: tuple[int, int, int, int] | None = None
+
+        if streaming:
+            video_configuration = self._picam2.create_video_configuration(
+                main={"size": stream_size, "format": 'XRGB8888'}
+            )
+            self._picam2.configure(video_configuration)
+        else:
+            self._picam2.configure(self._still_configuration)
 
     # Interface methods.
     def set_detector(self, detector: BaseDetectorStrategy) -> None:
@@ -37,6 +65,18 @@ class PiCameraStrategy(BaseEyeStrategy):
 
     def get_frame(self) -> numpy.ndarray:
         """This method returns the frame from the camera."""
+        return cv2.rotate(self.get_raw_frame(), self.ROTATION)
+
+    def get_raw_frame(self) -> numpy.ndarray:
+        """This method returns the XRGB8888 frame from the camera, before the rotation."""
+        if self._streaming:
+            self._start_streaming()
+            try:
+                return self._frame_buffer.get(timeout=self.FRAME_TIMEOUT)
+            except TimeoutError as error:
+                logger.error("No frame has been streamed from the camera.")
+                raise RuntimeError from error
+
         try:
             self._picam2.start()
             frame = self._picam2.capture_array()
@@ -45,5 +85,89 @@ class PiCameraStrategy(BaseEyeStrategy):
             logger.error(
                 "An error occurred while capturing the frame: %s", error)
             raise RuntimeError from error
-        return cv2.rotate(frame,
-                          cv2.ROTATE_90_COUNTERCLOCKWISE)
+        return frame
+
+    def get_still_frame(self) -> numpy.ndarray:
+        """This method returns a full-resolution frame from the camera."""
+        if not self._streaming:
+            return self.get_frame()
+
+        self._start_streaming()
+        try:
+            with self._capture_lock:
+                request = self._picam2.switch_mode_and_capture_request(self._still_configuration)
+                frame, self._still_crop = self._read_request(request)
+        except Exception as error:
+            logger.error(
+                "An error occurred while capturing the still frame: %s", error)
+            raise RuntimeError from error
+        return cv2.rotate(frame, self.ROTATION)
+
+    def get_still_regions(self,
+                          regions: numpy.ndarray,
+                          frame_shape: tuple[int, ...],
+                          still_shape: tuple[int, ...]) -> numpy.ndarray:
+        """
+        This method maps the regions of a streamed frame onto the last still frame.
+        The still is scaled from a larger area of the sensor than the stream
+        if their aspect ratios differ, so the regions are mapped through the sensor.
+        """
+        if self._stream_crop is None or self._still_crop is None:
+            return super().get_still_regions(regions, frame_shape, still_shape)
+        return map_regions(regions, frame_shape, self._stream_crop,
+                           still_shape, self._still_crop, self.ROTATION)
+
+    def close(self) -> None:
+        """This method stops the streaming and releases the camera."""
+        self._running.clear()
+        if self._grabber is not None:
+            self._grabber.join(timeout=self.FRAME_TIMEOUT)
+            self._grabber = None
+        self._picam2.stop()
+        self._frame_buffer.clear()
+
+    # Internal methods
+    def _start_streaming(self) -> None:
+        """This method starts the camera and the grabber thread if not running."""
+        if self._running.is_set():
+            return
+        with self._capture_lock:
+            if self._running.is_set():
+                return
+            if self._grabber is not None:
+                # The grabber has stopped after an error, the camera may still be started.
+                logger.debug("Stopping the camera before it is started again.")
+                self._grabber.join(timeout=self.FRAME_TIMEOUT)
+                self._grabber = None
+                self._picam2.stop()
+            logger.debug("Starting the camera in streaming mode.")
+            self._picam2.start()
+            self._running.set()
+            self._grabber = Thread(target=self._grab_frames,
+                                   name="picamera-grabber",
+                                   daemon=True)
+            self._grabber.start()
+
+    def _grab_frames(self) -> None:
+        """This method keeps the latest streamed frame in the buffer."""
+        while self._running.is_set():
+            try:
+                with self._capture_lock:
+                    frame, self._stream_crop = self._read_request(self._picam2.capture_request())
+            except Exception as error:  # pylint: disable=broad-exception-caught
+                logger.error(
+                    "An error occurred while streaming the frame: %s", error)
+                self._frame_buffer.clear()
+                self._running.clear()
+                return
+            self._frame_buffer.put(frame)
+
+    @staticmethod
+    def _read_request(request) -> tuple[numpy.ndarray, tuple[int, int, int, int] | None]:
+        """This method returns the frame of the request and the sensor area it is scaled from."""
+        try:
+            frame = request.make_array("main")
+            scaler_crop = request.get_metadata().get("ScalerCrop")
+        finally:
+            request.release()
+        return frame, tuple(scaler_crop) if scaler_crop is not None else None
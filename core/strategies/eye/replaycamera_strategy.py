@@ -0,0 +1,158 @@
+"""
+The replay camera strategy for eye strategies.
+"""
+import glob
+import os
+from collections.abc import Iterator
+from random import Random
+from threading import Lock
+from time import monotonic, sleep
+
+import cv2
+import numpy
+
+from core.strategies.detectors.base_detector_strategy import BaseDetectorStrategy
+from core.strategies.eye.base_eye_strategy import BaseEyeStrategy
+from core.utils.logger import get_logger
+
+# Add logging support.
+logger = get_logger(__name__)
+
+
+class ReplayCameraStrategy(BaseEyeStrategy):  # pylint: disable=too-many-instance-attributes
+    """
+    The replay camera strategy serves recorded frames instead of a camera,
+    so the whole pipeline can be tested and profiled without hardware.
+    The source can be a video file, a directory of images, a .npy frame
+    dump, or a raw frame dump of the given frame shape; the dumps are
+    memory-mapped. Frames are served at the frame rate, with an optional
+    random jitter, or as fast as they are asked for without a frame rate.
+    """
+    IMAGE_PATTERNS: tuple[str, ...] = ("*.jpg", "*.jpeg", "*.png", "*.bmp")
+
+    def __init__(self,  # pylint: disable=too-many-arguments,too-many-positional-arguments
+                 source: str,
+                 frame_rate: float | None = None,
+                 loop: bool = True,
+                 jitter: float = 0.0,
+                 frame_shape: tuple[int, ...] | None = None,
+                 rotation: int | None = None,
+                 seed: int | None = None) -> None:
+        self._rotation: int | None = rotation
+        self._source: str = os.path.expanduser(source)
+        self._frame_interval: float | None = 1 / frame_rate if frame_rate else None
+        self._loop: bool = loop
+        self._jitter: float = jitter
+        self._frame_shape: tuple[int, ...] | None = tuple(frame_shape) if frame_shape else None
+        self._random: Random = Random(seed)
+        self._detector: BaseDetectorStrategy | None = None
+
+        self._lock: Lock = Lock()
+        self._frames: Iterator[tuple[str, numpy.ndarray]] = self._read_frames()
+        self._next_frame_at: float | None = None
+        # The name of the last frame, e.g. to look up its label.
+        self.frame_name: str | None = None
+        self._last_frame: numpy.ndarray | None = None
+
+    # Interface methods.
+    def set_detector(self, detector: BaseDetectorStrategy) -> None:
+        """This method sets the detector strategy."""
+        self._detector = detector
+
+    def get_detector(self) -> BaseDetectorStrategy:
+        """This method returns the detector strategy."""
+        return self._detector
+
+    def get_rotation(self) -> int | None:
+        """This method returns the rotation of the recorded frames."""
+        return self._rotation
+
+    def get_frame(self) -> numpy.ndarray:
+        """This method returns the next frame, after the rotation."""
+        return self._rotate(self.get_raw_frame())
+
+    def get_still_frame(self) -> numpy.ndarray:
+        """This method returns the last frame again, so the evidence matches the detection."""
+        frame = self._last_frame if self._last_frame is not None else self.get_raw_frame()
+        return self._rotate(frame)
+
+    def get_raw_frame(self) -> numpy.ndarray:
+        """
+        This method returns the next frame once it is due.
+        EOFError is raised after the last frame, unless the replay loops,
+        and the eye subject stops then.
+        """
+        with self._lock:
+            self._wait_for_frame()
+            try:
+                self.frame_name, frame = next(self._frames)
+            except StopIteration as error:
+                if not self._loop:
+                    raise EOFError(f"The replay of {self._source} has ended.") from error
+                logger.debug("The replay of %s is restarted.", self._source)
+                self._frames = self._read_frames()
+                try:
+                    self.frame_name, frame = next(self._frames)
+                except StopIteration:
+                    raise EOFError(f"There are no frames in {self._source}.") from error
+            self._last_frame = frame
+            return frame
+
+    # Internal methods
+    def _rotate(self, frame: numpy.ndarray) -> numpy.ndarray:
+        """This method rotates the frame, if a rotation is given."""
+        return cv2.rotate(frame, self._rotation) if self._rotation is not None else frame
+
+    def _wait_for_frame(self) -> None:
+        """This method sleeps until the next frame is due, at the frame rate."""
+        if self._frame_interval is None:
+            return
+        now = monotonic()
+        if self._next_frame_at is None or self._next_frame_at < now - self._frame_interval:
+            # Do not try to catch up after a long pause.
+            self._next_frame_at = now
+        elif self._next_frame_at > now:
+            sleep(self._next_frame_at - now)
+        jitter = self._random.uniform(-self._jitter, self._jitter) if self._jitter else 0.0
+        self._next_frame_at += max(0.0, self._frame_interval + jitter)
+
+    def _read_frames(self) -> Iterator[tuple[str, numpy.ndarray]]:
+        """This method yields the name and the frame of each recorded frame."""
+        if os.path.isdir(self._source):
+            yield from self._read_images()
+        elif self._source.endswith(".npy") or self._frame_shape is not None:
+            yield from self._read_dump()
+        else:
+            yield from self._read_video()
+
+    def _read_images(self) -> Iterator[tuple[str, numpy.ndarray]]:
+        """This method yields the images of the directory in name order."""
+        paths = sorted(path for pattern in self.IMAGE_PATTERNS
+                       for path in glob.glob(os.path.join(self._source, pattern)))
+        for path in paths:
+            if (frame := cv2.imread(path)) is not None:
+                yield os.path.basename(path), frame
+
+    def _read_dump(self) -> Iterator[tuple[str, numpy.ndarray]]:
+        """This method yields the frames of a memory-mapped frame dump, without copying them."""
+        if self._source.endswith(".npy"):
+            frames = numpy.load(self._source, mmap_mode="r")
+        else:
+            frames = numpy.memmap(self._source, dtype=numpy.uint8, mode="r")
+            frames = frames.reshape((-1,) + self._frame_shape)
+        for index, frame in enumerate(frames):
+            yield f"{index:06d}", frame
+
+    def _read_video(self) -> Iterator[tuple[str, numpy.ndarray]]:
+        """This method yields the frames of a video file."""
+        capture = cv2.VideoCapture(self._source)
+        try:
+            index = 0
+            while True:
+                grabbed, frame = capture.read()
+                if not grabbed:
+                    break
+                yield f"{index:06d}", frame
+                index += 1
+        finally:
+            capture.release()
@@ -1,24 +1,56 @@
 """
 The Camera strategy for eye strategies.
 """
+import os
+from collections.abc import Callable
+from threading import Event, Lock, Thread
+from time import monotonic, sleep
+from typing import Any
+
 import cv2
 import numpy
 
 from core.strategies.detectors.base_detector_strategy import BaseDetectorStrategy
 from core.strategies.eye.base_eye_strategy import BaseEyeStrategy
+from core.utils.frame_buffer import LatestFrameBuffer
 from core.utils.logger import get_logger
 
 # Add logging support.
 logger = get_logger(__name__)
 
 
-class UsbCameraStrategy(BaseEyeStrategy):
+class UsbCameraStrategy(BaseEyeStrategy):  # pylint: disable=too-many-instance-attributes
     """
     The camera strategy for eye strategies.
+    The capture handle is kept open, and a grabber thread drains the
+    driver buffer so that the newest frame is always ready.
+    The source can be a camera index, a device path or a video file.
+    A lost camera is re-opened every reconnect interval, and its last frame
+    is dropped meanwhile, so the readers time out instead of getting a stale
+    frame. A video file is read at its own frame rate, and EOFError is raised
+    once it has ended.
     """
-    def __init__(self, camera_id: int = 0):
+    FRAME_SIZE: tuple[int, int] = (640, 480)
+    FRAME_TIMEOUT: float = 5.0
+    RECONNECT_INTERVAL: float = 2.0
+
+    def __init__(self,
+                 camera_id: int | str = 0,
+                 frame_size: tuple[int, int] = FRAME_SIZE,
+                 capture_factory: Callable[[], Any] | None = None):
         self._camera_id = camera_id
+        self._frame_size: tuple[int, int] = frame_size
+        self._capture_factory: Callable[[], Any] = capture_factory or self._open_capture
         self._detector = None
+        self._is_file: bool = isinstance(camera_id, str) \
+            and os.path.isfile(os.path.expanduser(camera_id))
+
+        # Grabber thread related attributes.
+        self._frame_buffer: LatestFrameBuffer = LatestFrameBuffer()
+        self._start_lock: Lock = Lock()
+        self._running: Event = Event()
+        self._ended: Event = Event()
+        self._grabber: Thread | None = None
 
     # Interface methods.
     def set_detector(self, detector: BaseDetectorStrategy) -> None:
@@ -30,14 +62,94 @@ class UsbCameraStrategy(BaseEyeStrategy):
         return self._detector
 
     def get_frame(self) -> numpy.ndarray:
-        """This method returns the frame from the camera."""
-        # Create a camera object.
-        camera = cv2.VideoCapture(self._camera_id)
-        # Set the camera resolution.
-        camera.set(3, 640)
-        camera.set(4, 480)
-        #  Read the frame from the camera.
-        _, frame = camera.read()
-        # Release the camera.
-        camera.release()
-        return frame
+        """This method returns the newest frame from the camera."""
+        self._start_grabbing()
+        try:
+            return self._frame_buffer.get(timeout=self.FRAME_TIMEOUT)
+        except TimeoutError as error:
+            if self._ended.is_set():
+                raise EOFError(f"The video {self._camera_id} has ended.") from error
+            logger.error("No frame has been grabbed from the camera %s.", self._camera_id)
+            raise RuntimeError from error
+
+    def close(self) -> None:
+        """This method stops the grabber thread and releases the camera."""
+        self._running.clear()
+        if self._grabber is not None:
+            self._grabber.join(timeout=self.FRAME_TIMEOUT)
+            self._grabber = None
+        self._frame_buffer.clear()
+
+    # Internal methods
+    def _open_capture(self) -> cv2.VideoCapture:
+        """This method opens the camera and sets the resolution."""
+        camera = cv2.VideoCapture(
+            os.path.expanduser(self._camera_id) if self._is_file else self._camera_id)
+        camera.set(cv2.CAP_PROP_FRAME_WIDTH, self._frame_size[0])
+        camera.set(cv2.CAP_PROP_FRAME_HEIGHT, self._frame_size[1])
+        # Keep the driver queue short to avoid stale frames.
+        camera.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+        return camera
+
+    def _start_grabbing(self) -> None:
+        """This method starts the grabber thread if it is not running."""
+        if self._running.is_set() or self._ended.is_set():
+            return
+        with self._start_lock:
+            if self._running.is_set() or self._ended.is_set():
+                return
+            self._running.set()
+            self._grabber = Thread(target=self._grab_frames,
+                                   name="usbcamera-grabber",
+                                   daemon=True)
+            self._grabber.start()
+
+    def _grab_frames(self) -> None:
+        """This method keeps reading frames, and re-opens the camera if it disappears."""
+        camera = None
+        frame_interval = 0.0
+        while self._running.is_set():
+            if camera is None:
+                if (camera := self._connect()) is None:
+                    continue
+                frame_interval = self._get_frame_interval(camera)
+
+            read_at = monotonic()
+            success, frame = camera.read()
+            if not success:
+                camera.release()
+                camera = None
+                # The last frame is stale now, let the readers time out instead.
+                self._frame_buffer.clear()
+                if self._is_file:
+                    logger.info("The video %s has ended.", self._camera_id)
+                    self._ended.set()
+                    self._running.clear()
+                    break
+                logger.warning("Camera %s is lost, reconnecting...", self._camera_id)
+                sleep(self.RECONNECT_INTERVAL)
+                continue
+            self._frame_buffer.put(frame)
+            # Read a video at its own pace, a camera paces itself.
+            sleep(max(0.0, frame_interval - (monotonic() - read_at)))
+
+        if camera is not None:
+            camera.release()
+
+    def _connect(self) -> Any | None:
+        """This method opens the camera, or waits the reconnect interval if it cannot."""
+        camera = self._capture_factory()
+        if not camera.isOpened():
+            logger.warning("Camera %s could not be opened, retrying...", self._camera_id)
+            camera.release()
+            sleep(self.RECONNECT_INTERVAL)
+            return None
+        logger.debug("Camera %s is opened.", self._camera_id)
+        return camera
+
+    def _get_frame_interval(self, camera: Any) -> float:
+        """This method returns the seconds between the frames of a video, zero for cameras."""
+        if not self._is_file:
+            return 0.0
+        fps = camera.get(cv2.CAP_PROP_FPS)
+        return 1 / fps if fps and fps > 0 else 0.0
@@ -10,6 +10,8 @@ class BaseNotifierStrategy(metaclass=ABCMeta):
     """
     The base notifier strategy.
     This class is used to create notifier strategies.
+    The per-reciever send methods raise an error if the message could not be
+    sent, so the callers can retry them.
     """
     def __init__(self) -> None:
         self._recievers: list[NotifierReciever] = []
@@ -18,7 +20,32 @@ class BaseNotifierStrategy(metaclass=ABCMeta):
         """This method is called when a reciever is added."""
         self._recievers.append(reciever)
 
-    @abstractmethod
+    def get_recievers(self) -> list[NotifierReciever]:
+        """This method returns the recievers of the notifier."""
+        return list(self._recievers)
+
     def notify_all(self, message: str) -> None:
-        """This method is called when the notifier is updated."""
+        """This method sends the message to all the recievers, one after another."""
+        for reciever in self.get_recievers():
+            self.send_message(reciever, message)
+
+    @abstractmethod
+    def send_message(self, reciever: NotifierReciever, message: str) -> None:
+        """This method sends a message to the reciever."""
         raise NotImplementedError
+
+    def send_image(self,
+                   reciever: NotifierReciever,
+                   image: bytes,  # pylint: disable=unused-argument
+                   caption: str) -> None:
+        """
+        This method sends an image to the reciever.
+        Notifiers which cannot send images ignore the image, and send only the caption.
+        """
+        self.send_message(reciever, caption)
+
+    def send_images(self, reciever: NotifierReciever, images: list[bytes], caption: str) -> None:
+        """This method sends a group of images to the reciever, one after another by default."""
+        self.send_message(reciever, caption)
+        for image in images:
+            self.send_image(reciever, image, "")
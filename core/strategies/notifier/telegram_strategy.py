@@ -4,7 +4,7 @@ This module contains the Telegram notifier strategy.
 import telebot
 
 from core.strategies.notifier.base_notifier_strategy import BaseNotifierStrategy
-from core.utils.datatypes import TelegramReciever
+from core.utils.datatypes import NotifierReciever, TelegramReciever
 from core.utils.logger import get_logger
 
 # Get the logger instance.
@@ -23,12 +23,27 @@ class TelegramStrategy(BaseNotifierStrategy):
                                     num_threads=2)
         super().__init__()
 
-    def notify_all(self, message: str) -> None:
-        """This method is called when the notifier is updated."""
-        for reciever in self._recievers:
-            if isinstance(reciever, TelegramReciever):
-                logger.debug("Sending Telegram message (%s) to %s", message, reciever.chat_id)
-                self._bot.send_message(reciever.chat_id, message)
+    def send_message(self, reciever: NotifierReciever, message: str) -> None:
+        """This method sends a message to the reciever."""
+        if isinstance(reciever, TelegramReciever):
+            logger.debug("Sending Telegram message (%s) to %s", message, reciever.chat_id)
+            self._bot.send_message(reciever.chat_id, message)
+
+    def send_image(self, reciever: NotifierReciever, image: bytes, caption: str) -> None:
+        """This method sends an image with the caption to the reciever."""
+        if isinstance(reciever, TelegramReciever):
+            logger.debug("Sending image to %s", reciever.chat_id)
+            self._bot.send_photo(reciever.chat_id, image, caption=caption)
+
+    def send_images(self, reciever: NotifierReciever, images: list[bytes], caption: str) -> None:
+        """This method sends the images to the reciever as one media group."""
+        if isinstance(reciever, TelegramReciever):
+            logger.debug("Sending %d images to %s", len(images), reciever.chat_id)
+            # Telegram accepts up to 10 photos in a media group.
+            self._bot.send_media_group(reciever.chat_id, [
+                telebot.types.InputMediaPhoto(image, caption=caption if index == 0 else None)
+                for index, image in enumerate(images[:10])
+            ])
 
     def send_image_all(self, image: bytes) -> None:
         """This method is called when the notifier is updated."""
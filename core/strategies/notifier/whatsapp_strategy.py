@@ -1,10 +1,12 @@
 """
 This module contains the Whatsapp notifier strategy.
 """
+from threading import Lock
 import requests
 
 from core.strategies.notifier.base_notifier_strategy import BaseNotifierStrategy
-from core.utils.datatypes import WhatsappReciever
+from core.utils.datatypes import NotifierReciever, WhatsappReciever
+from core.utils.fileio_adaptor import upload_to_fileio
 from core.utils.logger import get_logger
 
 # Get the logger instance.
@@ -14,23 +16,60 @@ logger = get_logger(__name__)
 class WhatsappStrategy(BaseNotifierStrategy):
     """
     The Whatsapp notifier strategy.
+    Images are uploaded to File.io once, and their link is sent to every reciever.
     """
     API_URL = "https://api.callmebot.com/whatsapp.php"
+    UPLOAD_CACHE_SIZE = 20
 
-    def notify_all(self, message: str) -> None:
-        """This method is called when the notifier is updated."""
-        for reciever in self._recievers:
-            if isinstance(reciever, WhatsappReciever):
-                self._send_message(reciever, message)
+    def __init__(self) -> None:
+        super().__init__()
+        # The links of the recently uploaded images by their hash.
+        self._uploads: dict[int, str] = {}
+        self._upload_lock: Lock = Lock()
+
+    def send_message(self, reciever: NotifierReciever, message: str) -> None:
+        """This method sends a message to the reciever."""
+        if not isinstance(reciever, WhatsappReciever):
+            return
+        if not self._send_message(reciever, message):
+            raise ConnectionError(
+                f"Failed to send WhatsApp message to {reciever.telephone_number}")
+
+    def send_image(self, reciever: NotifierReciever, image: bytes, caption: str) -> None:
+        """This method sends the File.io link of the image with the caption to the reciever."""
+        if not isinstance(reciever, WhatsappReciever):
+            return
+        self.send_message(reciever, f"{caption} {self._upload_image(image)}")
+
+    def send_images(self, reciever: NotifierReciever, images: list[bytes], caption: str) -> None:
+        """This method sends the File.io links of the images in one message to the reciever."""
+        if not isinstance(reciever, WhatsappReciever):
+            return
+        links = " ".join(self._upload_image(image) for image in images)
+        self.send_message(reciever, f"{caption} {links}")
+
+    def _upload_image(self, image: bytes) -> str:
+        """This method uploads the image once, and returns its link."""
+        key = hash(image)
+        with self._upload_lock:
+            if key not in self._uploads:
+                if (link := upload_to_fileio(image)) == "File upload failed!":
+                    raise ConnectionError("Failed to upload the image to File.io")
+                self._uploads[key] = link
+                # Forget the oldest uploads.
+                for old_key in list(self._uploads)[:-self.UPLOAD_CACHE_SIZE]:
+                    del self._uploads[old_key]
+            return self._uploads[key]
 
     def _send_message(self, reciever: WhatsappReciever, message: str) -> bool:
         """Send a WhatsApp message to the user."""
         logger.debug("Sending WhatsApp message (%s) to %s", message, reciever.telephone_number)
         # Send the request.
-        request_url = f"{self.API_URL}?" \
-            f"phone={reciever.telephone_number}&" \
-            f"text={message}&apikey={reciever.api_key}"
-        response = requests.get(request_url, timeout=10)
+        response = requests.get(self.API_URL, params={
+            "phone": reciever.telephone_number,
+            "text": message,
+            "apikey": reciever.api_key,
+        }, timeout=10)
 
         # Check if the request was unsuccessful.
         if response.status_code != 200 or "ERROR" in response.text:
@@ -0,0 +1,149 @@
+"""
+The scheduler strategy which adapts the sampling rate.
+"""
+from collections import deque
+from collections.abc import Callable
+from dataclasses import dataclass
+from threading import Lock
+from time import monotonic
+
+from core.strategies.scheduler.base_scheduler_strategy import BaseSchedulerStrategy
+from core.utils.datatypes import EyeStrategyResult
+from core.utils.logger import get_logger
+
+# Add logging support.
+logger = get_logger(__name__)
+
+THERMAL_ZONE_PATH: str = "/sys/class/thermal/thermal_zone0/temp"
+
+
+def read_cpu_temperature() -> float | None:
+    """This function returns the CPU temperature in Celsius, if available."""
+    try:
+        with open(THERMAL_ZONE_PATH, "r", encoding="utf-8") as thermal_zone:
+            return int(thermal_zone.read().strip()) / 1000
+    except (OSError, ValueError):
+        return None
+
+
+@dataclass
+class SampleRecord:
+    """This class represents a recorded sample of the eye."""
+    timestamp: float
+    detected: bool
+    motion: bool
+    inference_time: float
+
+
+class AdaptiveSchedulerStrategy(BaseSchedulerStrategy):
+    """
+    The scheduler strategy which samples fast while there is a detection
+    or motion in the recent history, and backs off exponentially while the
+    scene is quiet. The interval is stretched to keep the duty cycle of the
+    inference under the budget, and when the CPU is getting hot.
+    """
+    # pylint: disable=too-many-instance-attributes
+    MIN_INTERVAL: float = 0.5
+    MOTION_INTERVAL: float = 1.0
+    MAX_INTERVAL: float = 10.0
+    BACKOFF_FACTOR: float = 1.5
+    HISTORY_WINDOW: float = 30.0
+    MAX_DUTY_CYCLE: float = 0.5
+    THERMAL_SOFT_LIMIT: float = 70.0
+    THERMAL_HARD_LIMIT: float = 80.0
+
+    def __init__(self,  # pylint: disable=too-many-arguments,too-many-positional-arguments
+                 min_interval: float = MIN_INTERVAL,
+                 motion_interval: float = MOTION_INTERVAL,
+                 max_interval: float = MAX_INTERVAL,
+                 backoff_factor: float = BACKOFF_FACTOR,
+                 history_window: float = HISTORY_WINDOW,
+                 max_duty_cycle: float = MAX_DUTY_CYCLE,
+                 thermal_soft_limit: float = THERMAL_SOFT_LIMIT,
+                 thermal_hard_limit: float = THERMAL_HARD_LIMIT,
+                 *,
+                 clock: Callable[[], float] = monotonic,
+                 temperature_reader: Callable[[], float | None] = read_cpu_temperature
+                 ) -> None:
+        self._min_interval: float = min_interval
+        self._motion_interval: float = motion_interval
+        self._max_interval: float = max_interval
+        self._backoff_factor: float = backoff_factor
+        self._history_window: float = history_window
+        self._max_duty_cycle: float = max_duty_cycle
+        self._thermal_soft_limit: float = thermal_soft_limit
+        self._thermal_hard_limit: float = thermal_hard_limit
+        self._clock: Callable[[], float] = clock
+        self._temperature_reader: Callable[[], float | None] = temperature_reader
+
+        self._history: deque[SampleRecord] = deque()
+        self._idle_interval: float = motion_interval
+        self._lock: Lock = Lock()
+
+    def record(self, result: EyeStrategyResult) -> None:
+        """This method records the result of the latest sample."""
+        with self._lock:
+            self._history.append(SampleRecord(
+                timestamp=self._clock(),
+                detected=bool(result.result),
+                motion=bool(result.motion),
+                inference_time=result.inference_time or 0.0,
+            ))
+
+    def next_interval(self) -> float:
+        """This method returns the seconds to wait before the next sample."""
+        with self._lock:
+            self._drop_old_records()
+            interval = self._activity_interval()
+            interval = max(interval, self._duty_cycle_interval())
+        interval = self._apply_thermal_budget(interval)
+        logger.debug("Next sampling interval: %.2f seconds.", interval)
+        return interval
+
+    def reset(self) -> None:
+        """This method forgets the recorded history."""
+        with self._lock:
+            self._history.clear()
+            self._idle_interval = self._motion_interval
+
+    # Internal methods
+    def _drop_old_records(self) -> None:
+        """This method drops the records which are out of the history window."""
+        oldest_allowed = self._clock() - self._history_window
+        while self._history and self._history[0].timestamp < oldest_allowed:
+            self._history.popleft()
+
+    def _activity_interval(self) -> float:
+        """This method returns the interval based on recent detections and motion."""
+        if any(record.detected for record in self._history):
+            self._idle_interval = self._motion_interval
+            return self._min_interval
+        if any(record.motion for record in self._history):
+            self._idle_interval = self._motion_interval
+            return self._motion_interval
+
+        # Back off exponentially while the scene is quiet.
+        self._idle_interval = min(self._max_interval,
+                                  self._idle_interval * self._backoff_factor)
+        return self._idle_interval
+
+    def _duty_cycle_interval(self) -> float:
+        """This method returns the shortest interval which respects the duty cycle."""
+        if not self._history:
+            return 0.0
+        inference_time = sum(record.inference_time for record in self._history) \
+            / len(self._history)
+        return inference_time * (1 - self._max_duty_cycle) / self._max_duty_cycle
+
+    def _apply_thermal_budget(self, interval: float) -> float:
+        """This method stretches the interval when the CPU is hot."""
+        temperature = self._temperature_reader()
+        if temperature is None or temperature <= self._thermal_soft_limit:
+            return interval
+        if temperature >= self._thermal_hard_limit:
+            logger.warning("CPU temperature is %.1f C, sampling at the slowest rate.",
+                           temperature)
+            return max(interval, self._max_interval)
+        ratio = (temperature - self._thermal_soft_limit) \
+            / (self._thermal_hard_limit - self._thermal_soft_limit)
+        return max(interval, interval + ratio * (self._max_interval - interval))
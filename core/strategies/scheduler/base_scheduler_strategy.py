@@ -0,0 +1,24 @@
+"""
+The base strategy for scheduler strategies.
+This strategy is used to define the interface for all scheduler strategies,
+which decide how long the eye should wait before sampling the next frame.
+"""
+from abc import ABCMeta, abstractmethod
+
+from core.utils.datatypes import EyeStrategyResult
+
+
+class BaseSchedulerStrategy(metaclass=ABCMeta):
+    """
+    The base strategy for scheduler strategies.
+    """
+    @abstractmethod
+    def record(self, result: EyeStrategyResult) -> None:
+        """This method records the result of the latest sample."""
+
+    @abstractmethod
+    def next_interval(self) -> float:
+        """This method returns the seconds to wait before the next sample."""
+
+    def reset(self) -> None:
+        """This method forgets the recorded history."""
@@ -0,0 +1,33 @@
+"""
+The scheduler strategy which uses fixed intervals.
+"""
+from core.strategies.scheduler.base_scheduler_strategy import BaseSchedulerStrategy
+from core.utils.datatypes import EyeStrategyResult
+
+
+class FixedSchedulerStrategy(BaseSchedulerStrategy):
+    """
+    The scheduler strategy which uses a fixed interval,
+    and a shorter one after a human is detected.
+    """
+    DEFAULT_INTERVAL: float = 10
+    DETECTED_INTERVAL: float = 2
+
+    def __init__(self,
+                 default_interval: float = DEFAULT_INTERVAL,
+                 detected_interval: float = DETECTED_INTERVAL) -> None:
+        self._default_interval: float = default_interval
+        self._detected_interval: float = detected_interval
+        self._detected: bool = False
+
+    def record(self, result: EyeStrategyResult) -> None:
+        """This method records the result of the latest sample."""
+        self._detected = result.result
+
+    def next_interval(self) -> float:
+        """This method returns the seconds to wait before the next sample."""
+        return self._detected_interval if self._detected else self._default_interval
+
+    def reset(self) -> None:
+        """This method forgets the recorded history."""
+        self._detected = False
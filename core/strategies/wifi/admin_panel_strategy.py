@@ -1,15 +1,15 @@
 """
 The strategy which searches for MAC addresses using Admin Panel.
 """
+import re
 from typing import Any
 
 import requests
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
-from bs4 import BeautifulSoup
 
 from core.strategies.wifi.base_wifi_strategy import BaseWiFiStrategy
-from core.utils.datatypes import ConnectedDeviceResult, WiFiStrategyResult
+from core.utils.datatypes import ConnectedDeviceResult
 from core.utils.logger import get_logger
 
 # Add logging support.
@@ -19,13 +19,32 @@ logger = get_logger(__name__)
 class AdminPanelStrategy(BaseWiFiStrategy):
     """
     The strategy which searches for MAC addresses using Admin Panel.
+    The session logs in once, and logs in again only when the router
+    redirects to the login page or rejects the session. The device list
+    is fetched once per check, and the MAC addresses are extracted from
+    its "tabdata" cells with a regular expression.
     """
+    BASE_URL: str = "http://192.168.1.95"
+    LOGIN_PAGE: str = "/login_security.html"
+    LOGIN_FORM: str = "/Forms/login_security_1"
+    DEVICE_PAGE: str = "/status/status_deviceinfo.htm"
+    TIMEOUT: float = 10.0
+    # The text of the "tabdata" cells, and the MAC addresses among them.
+    TABDATA_PATTERN: re.Pattern = re.compile(
+        r"<td\b[^>]*\bclass\s*=\s*[\"']?tabdata\b[^>]*>\s*([^<]*?)\s*<", re.IGNORECASE)
+    MAC_ADDRESS_PATTERN: re.Pattern = re.compile(r"(?:[0-9A-Fa-f]{2}[:-]){5}[0-9A-Fa-f]{2}")
 
-    def __init__(self, login_data: dict[str, Any]) -> None:
+    def __init__(self,
+                 login_data: dict[str, Any],
+                 base_url: str = BASE_URL,
+                 timeout: float = TIMEOUT) -> None:
         """Constructor for AdminPanelStrategy."""
         super().__init__()
         self._login_data: dict[str, Any] = login_data
+        self._base_url: str = base_url.rstrip("/")
+        self._timeout: float = timeout
         self._session: requests.Session = requests.Session()
+        self._logged_in: bool = False
 
         # Create a HTTP adapter to limit the number of connections.
         retries = Retry(total=3, backoff_factor=0.3, backoff_max=5.0)
@@ -35,43 +54,68 @@ class AdminPanelStrategy(BaseWiFiStrategy):
         self._session.mount("http://", http_adaptor)
         self._session.mount("https://", http_adaptor)
 
-    def check_protectors(self) -> WiFiStrategyResult:
-        """This method checks if there are any protectors around."""
-        for protector in self.protectors:
-            # Check if the protector is connected to the network.
-            if protector.address in [device.address for device in self._get_all_connected()]:
-                logger.debug("Protector found: %s", protector.name)
-                return WiFiStrategyResult(protector, True)
-        logger.debug("No protectors found.")
-        return WiFiStrategyResult(None, False)
+    @classmethod
+    def from_config(cls, config: dict[str, Any]) -> "AdminPanelStrategy":
+        """
+        This method creates the strategy from its configuration.
+        The optional "base_url" is the address of the router, the rest is the login form data.
+        """
+        login_data = dict(config)
+        return cls(login_data, login_data.pop('base_url', cls.BASE_URL))
 
     # Internal methods
-    def _get_all_connected(self) -> list[ConnectedDeviceResult]:
-        """This method returns a list of addresses of the clients connected to the network."""
-        # Create a session to store cookies.
-        self._session.get("http://192.168.1.95/login_security.html")
-        self._session.post(
-            "http://192.168.1.95/Forms/login_security_1",
+    def _login(self) -> None:
+        """This method logs in to the admin panel, the session keeps the cookies."""
+        logger.debug("Logging in to the admin panel...")
+        self._session.cookies.clear()
+        self._session.get(self._base_url + self.LOGIN_PAGE, timeout=self._timeout)
+        response = self._session.post(
+            self._base_url + self.LOGIN_FORM,
             headers={
                 "Content-Type": "application/x-www-form-urlencoded",
-                "Referer": "http://192.168.1.95/login_security.html",
+                "Referer": self._base_url + self.LOGIN_PAGE,
             },
-            data=self._login_data
+            data=self._login_data,
+            timeout=self._timeout
         )
+        response.raise_for_status()
+        self._logged_in = True
+
+    def _get_device_page(self) -> str:
+        """This method returns the page with the device list, and logs in when needed."""
+        if not self._logged_in:
+            self._login()
+        response = self._session.get(self._base_url + self.DEVICE_PAGE,
+                                     allow_redirects=False, timeout=self._timeout)
+        if self._is_expired(response):
+            # The session has expired, log in again and retry once.
+            logger.debug("The admin panel session has expired.")
+            self._logged_in = False
+            self._login()
+            response = self._session.get(self._base_url + self.DEVICE_PAGE,
+                                         allow_redirects=False, timeout=self._timeout)
+            if self._is_expired(response):
+                self._logged_in = False
+                raise ConnectionError("The admin panel did not accept the login.")
+        response.raise_for_status()
+        return response.text
 
-        # Get the response for the page with MAC address list.
-        response = self._session.get(
-            "http://192.168.1.95/status/status_deviceinfo.htm")
+    @staticmethod
+    def _is_expired(response: requests.Response) -> bool:
+        """This method checks if the router has redirected to the login page, or rejected us."""
+        return (response.is_redirect
+                or response.status_code in {401, 403}
+                or AdminPanelStrategy.LOGIN_FORM in response.text)
 
-        # Parse the response.
-        soup = BeautifulSoup(response.text, "html.parser")
-        tabdata = soup.find_all("td", class_="tabdata")
+    def _get_all_connected(self) -> list[ConnectedDeviceResult]:
+        """This method returns a list of addresses of the clients connected to the network."""
+        page = self._get_device_page()
 
         # Get the MAC addresses.
         mac_addrs: list[str] = [
-            element.text
-            for element in tabdata
-            if len(element.text) == 17
+            cell
+            for cell in self.TABDATA_PATTERN.findall(page)
+            if self.MAC_ADDRESS_PATTERN.fullmatch(cell)
         ]
 
         logger.debug("Connected devices: %s", str(mac_addrs))
@@ -2,17 +2,33 @@
 The base strategy for WiFi strategies.
 This strategy is used to define the interface for all WiFi strategies.
 """
+import ipaddress
+import re
 from abc import ABCMeta, abstractmethod
+from collections.abc import Iterable
+from time import sleep
 
-from core.utils.datatypes import Protector, WiFiStrategyResult
+from core.utils.datatypes import ConnectedDeviceResult, Protector, WiFiStrategyResult
+from core.utils.logger import get_logger
+
+# Add logging support.
+logger = get_logger(__name__)
 
 
 class BaseWiFiStrategy(metaclass=ABCMeta):
     """
     The base strategy for WiFi strategies.
+    The protectors are indexed by their normalised address, so every check
+    scans the network once, and matches the devices with set lookups.
     """
+    # MAC addresses such as "a:b:c:d:e:f", "AA-BB-CC-DD-EE-FF" or "aabb.ccdd.eeff".
+    MAC_OCTETS_PATTERN: re.Pattern = re.compile(r"[0-9A-Fa-f]{1,2}(?:[:-][0-9A-Fa-f]{1,2}){5}")
+    MAC_DIGITS_PATTERN: re.Pattern = re.compile(r"[0-9A-Fa-f]{12}")
+
     def __init__(self):
         self.protectors: list[Protector] = []
+        # The protectors by their normalised address.
+        self._protector_index: dict[str, list[Protector]] = {}
 
     def add_protector(self, protector: Protector | list[Protector]) -> None:
         """This method adds a protector to the list of protectors."""
@@ -20,6 +36,7 @@ class BaseWiFiStrategy(metaclass=ABCMeta):
             self.protectors.extend(protector)
         else:
             self.protectors.append(protector)
+        self._update_index()
 
     def remove_protector(self, protector: Protector | list[Protector]) -> None:
         """This method removes a protector from the list of protectors."""
@@ -28,7 +45,66 @@ class BaseWiFiStrategy(metaclass=ABCMeta):
                 self.protectors.remove(p)
         else:
             self.protectors.remove(protector)
+        self._update_index()
+
+    def get_connected(self) -> list[ConnectedDeviceResult]:
+        """This method scans the network, and returns the devices connected to it."""
+        return self._get_all_connected()
 
-    @abstractmethod
     def check_protectors(self) -> WiFiStrategyResult:
         """This method checks if there are any protectors around."""
+        protectors = self.match_protectors(
+            device.address for device in self.get_connected())
+        if not protectors:
+            logger.debug("No protectors found.")
+            return WiFiStrategyResult(None, False)
+        logger.debug("Protectors found: %s", str([protector.name for protector in protectors]))
+        return WiFiStrategyResult(protectors[0], True, protectors)
+
+    def wait_for_change(self, timeout: float) -> bool:
+        """
+        This method waits until the presence of the protectors may have changed.
+        True is returned early on a change event; the strategies without events
+        wait for the whole timeout, and return False to be polled.
+        """
+        sleep(timeout)
+        return False
+
+    def match_protectors(self, addresses: Iterable[str]) -> list[Protector]:
+        """This method returns the protectors with any of the addresses, in their given order."""
+        found = {self.normalise_address(address) for address in addresses}
+        return [protector
+                for address, protectors in self._protector_index.items() if address in found
+                for protector in protectors]
+
+    @classmethod
+    def normalise_address(cls, address: str) -> str:
+        """
+        This method returns the canonical form of an address, so the addresses
+        can be compared regardless of their case and notation.
+        MAC addresses become upper case "AA:BB:CC:DD:EE:FF", IP addresses are
+        compressed, and any other address, e.g. a host name, is lower cased.
+        """
+        address = address.strip()
+        try:
+            return ipaddress.ip_address(address).compressed
+        except ValueError:
+            pass
+        if cls.MAC_OCTETS_PATTERN.fullmatch(address):
+            return ":".join(octet.zfill(2) for octet in re.split(r"[:-]", address)).upper()
+        digits = address.replace(".", "")
+        if cls.MAC_DIGITS_PATTERN.fullmatch(digits):
+            return ":".join(digits[index:index + 2] for index in range(0, 12, 2)).upper()
+        return address.lower()
+
+    # Internal methods
+    def _update_index(self) -> None:
+        """This method indexes the protectors by their normalised address."""
+        self._protector_index = {}
+        for protector in self.protectors:
+            self._protector_index.setdefault(
+                self.normalise_address(protector.address), []).append(protector)
+
+    @abstractmethod
+    def _get_all_connected(self) -> list[ConnectedDeviceResult]:
+        """This method returns the addresses of the devices connected to the network."""
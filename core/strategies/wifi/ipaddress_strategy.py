@@ -1,10 +1,12 @@
 """
 The strategy which searches for IP addresses.
 """
+from collections.abc import Iterable
+
 from core.strategies.wifi.base_wifi_strategy import BaseWiFiStrategy
-from core.utils.datatypes import WiFiStrategyResult
+from core.utils.datatypes import ConnectedDeviceResult
 from core.utils.logger import get_logger
-from core.utils.program_launcher import PingCommands, run_program
+from core.utils.network_probe import NetworkProber
 
 # Add logging support.
 logger = get_logger(__name__)
@@ -13,27 +15,20 @@ logger = get_logger(__name__)
 class IpAddressStrategy(BaseWiFiStrategy):
     """
     The strategy which searches for IP addresses.
+    All the protectors are probed at once, so an absent protector costs
+    at most the deadline of the poll, not a ping timeout of its own.
     """
 
-    def __init__(self):
+    def __init__(self,
+                 deadline: float = NetworkProber.DEADLINE,
+                 tcp_ports: Iterable[int] = NetworkProber.TCP_PORTS,
+                 cache_ttl: float = NetworkProber.CACHE_TTL):
         super().__init__()
-        # Check if the program is installed.
-        try:
-            run_program(PingCommands.GET_VERSION_INFO)
-            logger.debug("Program is already installed.")
-        except RuntimeError:
-            logger.debug("Program is not installed. Installing...")
-            run_program(PingCommands.INSTALL_PROGRAM)
+        self._prober: NetworkProber = NetworkProber(deadline, tcp_ports, cache_ttl)
 
-    def check_protectors(self) -> WiFiStrategyResult:
-        """This method checks if there are any protectors around."""
-        for protector in self.protectors:
-            # Send a ping to the protector.
-            logger.debug("Sending ping to %s", protector.name)
-            output = run_program(PingCommands.PING_TO + " " + protector.address)
-            # Check if the ping was successful.
-            if "Destination Host Unreachable" not in output:
-                logger.debug("Protector found: %s", protector.name)
-                return WiFiStrategyResult(protector, True)
-        logger.debug("No protectors found.")
-        return WiFiStrategyResult(None, False)
+    # Internal methods
+    def _get_all_connected(self) -> list[ConnectedDeviceResult]:
+        """This method returns the addresses of the protectors which answer a probe."""
+        reachable = self._prober.probe(protector.address for protector in self.protectors)
+        logger.debug("Reachable protectors: %s", str(sorted(reachable)))
+        return [ConnectedDeviceResult(address) for address in reachable]
@@ -2,7 +2,7 @@
 The strategy which searches for MAC addresses.
 """
 from core.strategies.wifi.base_wifi_strategy import BaseWiFiStrategy
-from core.utils.datatypes import ConnectedDeviceResult, WiFiStrategyResult
+from core.utils.datatypes import ConnectedDeviceResult
 from core.utils.logger import get_logger
 from core.utils.program_launcher import ArpScanCommands, run_program
 
@@ -24,16 +24,6 @@ class MacAddressStrategy(BaseWiFiStrategy):
             logger.debug("Program is not installed. Installing...")
             run_program(ArpScanCommands.INSTALL_PROGRAM)
 
-    def check_protectors(self) -> WiFiStrategyResult:
-        """This method checks if there are any protectors around."""
-        for protector in self.protectors:
-            # Check if the protector is connected to the network.
-            if protector.address in [device.address for device in self._get_all_connected()]:
-                logger.debug("Protector found: %s", protector.name)
-                return WiFiStrategyResult(protector, True)
-        logger.debug("No protectors found.")
-        return WiFiStrategyResult(None, False)
-
     # Internal methods
     def _get_all_connected(self) -> list[ConnectedDeviceResult]:
         """This method returns a list of addresses of the clients connected to the network."""
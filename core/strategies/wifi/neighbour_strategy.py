@@ -0,0 +1,264 @@
+"""
+The strategy which watches the neighbour table and the DHCP leases passively.
+"""
+import errno
+import os
+import select
+import socket
+import struct
+from collections.abc import Iterator
+from dataclasses import dataclass
+from time import monotonic, sleep, time
+
+from core.strategies.wifi.base_wifi_strategy import BaseWiFiStrategy
+from core.utils.datatypes import ConnectedDeviceResult
+from core.utils.logger import get_logger
+from core.utils.network_probe import read_arp_table
+
+# Add logging support.
+logger = get_logger(__name__)
+
+# The netlink constants, see linux/netlink.h, linux/rtnetlink.h and linux/neighbour.h.
+NETLINK_ROUTE = 0
+RTMGRP_NEIGH = 0x4
+NLMSG_ERROR = 2
+NLMSG_DONE = 3
+RTM_NEWNEIGH = 28
+RTM_DELNEIGH = 29
+RTM_GETNEIGH = 30
+NLM_F_REQUEST = 0x1
+NLM_F_DUMP = 0x300
+NDA_DST = 1
+NDA_LLADDR = 2
+NDA_CACHEINFO = 3
+NUD_REACHABLE = 0x02
+NUD_STALE = 0x04
+NUD_DELAY = 0x08
+NUD_PROBE = 0x10
+NLMSG_HEADER = struct.Struct("=IHHII")
+NDMSG = struct.Struct("=BxxxiHBB")
+RTATTR = struct.Struct("=HH")
+# The confirmed, used and updated ages in clock ticks, and the reference count.
+NDA_CACHEINFO_STRUCT = struct.Struct("=IIII")
+CLOCK_TICKS = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+
+
+@dataclass
+class NeighbourMessage:
+    """This class represents a netlink message, and its neighbour if it has one."""
+    message_type: int
+    ip_address: str | None = None
+    mac_address: str | None = None
+    state: int = 0
+    # The seconds since the neighbour was last confirmed to be reachable.
+    confirmed_ago: float | None = None
+    # The seconds since the entry was last updated, e.g. by an ARP request of the neighbour.
+    updated_ago: float | None = None
+
+    @property
+    def seen_ago(self) -> float | None:
+        """This property returns the seconds since the neighbour was last heard of."""
+        ages = [age for age in (self.confirmed_ago, self.updated_ago) if age is not None]
+        return min(ages) if ages else None
+
+
+def parse_neighbour_message(data: bytes, offset: int, length: int) -> NeighbourMessage:
+    """This function parses the neighbour message at the offset."""
+    body = offset + NLMSG_HEADER.size
+    family, _, state, _, _ = NDMSG.unpack_from(data, body)
+    message = NeighbourMessage(RTM_NEWNEIGH, state=state)
+    attribute = body + NDMSG.size
+    while attribute + RTATTR.size <= offset + length:
+        attribute_length, attribute_type = RTATTR.unpack_from(data, attribute)
+        if attribute_length < RTATTR.size:
+            break
+        value = data[attribute + RTATTR.size:attribute + attribute_length]
+        if attribute_type == NDA_DST and family in {socket.AF_INET, socket.AF_INET6}:
+            message.ip_address = socket.inet_ntop(family, value)
+        elif attribute_type == NDA_LLADDR and len(value) == 6:
+            message.mac_address = ":".join(f"{octet:02X}" for octet in value)
+        elif attribute_type == NDA_CACHEINFO and len(value) >= NDA_CACHEINFO_STRUCT.size:
+            confirmed, _, updated, _ = NDA_CACHEINFO_STRUCT.unpack_from(value)
+            message.confirmed_ago = confirmed / CLOCK_TICKS
+            message.updated_ago = updated / CLOCK_TICKS
+        # The attributes are aligned to 4 bytes.
+        attribute += (attribute_length + 3) & ~3
+    return message
+
+
+def parse_neighbour_messages(data: bytes) -> Iterator[NeighbourMessage]:
+    """This function yields every message in the netlink data, with its neighbour if any."""
+    offset = 0
+    while offset + NLMSG_HEADER.size <= len(data):
+        length, message_type, _, _, _ = NLMSG_HEADER.unpack_from(data, offset)
+        if length < NLMSG_HEADER.size:
+            return
+        if message_type in {RTM_NEWNEIGH, RTM_DELNEIGH}:
+            message = parse_neighbour_message(data, offset, length)
+            message.message_type = message_type
+            yield message
+        else:
+            yield NeighbourMessage(message_type)
+        offset += (length + 3) & ~3
+
+
+def read_leases(path: str) -> list[tuple[str, str]]:
+    """This function returns the MAC and the IP address of the active leases of dnsmasq."""
+    leases: list[tuple[str, str]] = []
+    now = time()
+    try:
+        with open(path, "r", encoding="utf-8") as file:
+            for line in file:
+                # <expiry time> <MAC address> <IP address> <host name> <client id>
+                fields = line.split()
+                if len(fields) >= 3 and fields[0].isdigit():
+                    expiry = int(fields[0])
+                    if expiry == 0 or expiry > now:
+                        leases.append((fields[1].upper(), fields[2]))
+    except OSError as error:
+        logger.warning("The leases file could not be read: %s", error)
+    return leases
+
+
+class NeighbourStrategy(BaseWiFiStrategy):
+    """
+    The strategy which watches the neighbour table and the DHCP leases passively.
+    Nothing is sent to the network. The kernel neighbour table is read through
+    netlink, and the changes are received as netlink events, so an arriving
+    phone is noticed as soon as it talks to the host. The active leases of a
+    dnsmasq leases file can be added too, which suits networks with short leases.
+    The host only sees the phones which talk to it, so it has to be the gateway
+    or the DHCP server of the network; on any other host the phones stay absent.
+
+    A stale neighbour is only checked again by the kernel when the host sends
+    it traffic, which this strategy never does, and small tables are never
+    garbage-collected, so a stale entry may stay forever after the phone has
+    left. An idle phone at home goes stale too, but it still renews its lease
+    and answers the gateway now and then. Stale neighbours therefore count as
+    present until stale_timeout seconds after they were last heard of, which
+    is longer than the departure grace of the presence tracker by default.
+    Without netlink, the complete entries of /proc/net/arp are polled instead,
+    which cannot tell stale entries apart.
+    """
+    PRESENT_STATES: int = NUD_REACHABLE | NUD_DELAY | NUD_PROBE
+    STALE_TIMEOUT: float = 300.0
+    POLL_INTERVAL: float = 1.0
+    RECEIVE_SIZE: int = 65536
+
+    def __init__(self,
+                 neighbour_table: bool = True,
+                 leases_path: str | None = None,
+                 stale_timeout: float = STALE_TIMEOUT,
+                 poll_interval: float = POLL_INTERVAL) -> None:
+        super().__init__()
+        self._neighbour_table: bool = neighbour_table
+        self._leases_path: str | None = (
+            os.path.expanduser(leases_path) if leases_path else None
+        )
+        self._stale_timeout: float = stale_timeout
+        self._poll_interval: float = poll_interval
+        self._leases_mtime: float | None = None
+        self._events: socket.socket | None = None
+        if neighbour_table:
+            try:
+                # Subscribe to the changes of the neighbour table.
+                self._events = socket.socket(socket.AF_NETLINK, socket.SOCK_RAW, NETLINK_ROUTE)
+                self._events.bind((0, RTMGRP_NEIGH))
+                self._events.setblocking(False)
+            except (AttributeError, OSError) as error:
+                logger.warning("Netlink is not available, /proc/net/arp is polled, "
+                               "and stale entries count as present: %s", error)
+                self._events = None
+
+    def wait_for_change(self, timeout: float) -> bool:
+        """This method waits until the neighbour of a protector or the leases change."""
+        deadline = monotonic() + timeout
+        while (remaining := deadline - monotonic()) > 0:
+            wait = min(remaining, self._poll_interval)
+            if self._events is not None:
+                readable, _, _ = select.select([self._events], [], [], wait)
+                if readable and self._is_protector_event():
+                    return True
+            else:
+                sleep(wait)
+            if self._has_leases_changed():
+                return True
+            if self._events is None and self._neighbour_table:
+                # Without events, every poll of the table is a possible change.
+                return True
+        return False
+
+    # Internal methods
+    def _get_all_connected(self) -> list[ConnectedDeviceResult]:
+        """This method returns the MAC and the IP addresses of the present neighbours."""
+        neighbours: list[tuple[str | None, str | None]] = []
+        if self._neighbour_table:
+            neighbours.extend(self._read_neighbours())
+        if self._leases_path is not None:
+            neighbours.extend(read_leases(self._leases_path))
+        connected = {address for neighbour in neighbours for address in neighbour if address}
+        logger.debug("Present neighbours: %s", str(sorted(connected)))
+        return [ConnectedDeviceResult(address) for address in connected]
+
+    def _is_present(self, message: NeighbourMessage) -> bool:
+        """This method checks if the neighbour of a dumped message is present."""
+        if message.message_type != RTM_NEWNEIGH:
+            return False
+        if message.state & self.PRESENT_STATES:
+            return True
+        # A stale neighbour is present for a while after it was last heard of.
+        return bool(message.state & NUD_STALE
+                    and (seen_ago := message.seen_ago) is not None
+                    and seen_ago < self._stale_timeout)
+
+    def _read_neighbours(self) -> list[tuple[str | None, str | None]]:
+        """This method returns the MAC and the IP address of the present neighbours."""
+        if self._events is None:
+            return [(mac_address, ip_address)
+                    for ip_address, mac_address in read_arp_table().items()]
+        with socket.socket(socket.AF_NETLINK, socket.SOCK_RAW, NETLINK_ROUTE) as dump:
+            dump.bind((0, 0))
+            request = NDMSG.pack(socket.AF_UNSPEC, 0, 0, 0, 0)
+            dump.send(NLMSG_HEADER.pack(NLMSG_HEADER.size + len(request), RTM_GETNEIGH,
+                                        NLM_F_REQUEST | NLM_F_DUMP, 1, 0) + request)
+            neighbours: list[tuple[str | None, str | None]] = []
+            while data := dump.recv(self.RECEIVE_SIZE):
+                for message in parse_neighbour_messages(data):
+                    if message.message_type in {NLMSG_DONE, NLMSG_ERROR}:
+                        return neighbours
+                    if self._is_present(message):
+                        neighbours.append((message.mac_address, message.ip_address))
+            return neighbours
+
+    def _is_protector_event(self) -> bool:
+        """This method reads the waiting neighbour events, and checks if any is a protector's."""
+        relevant = False
+        while True:
+            try:
+                data = self._events.recv(self.RECEIVE_SIZE)
+            except (BlockingIOError, InterruptedError):
+                return relevant
+            except OSError as error:
+                # The events have overflowed the socket buffer, resync with a dump.
+                if error.errno == errno.ENOBUFS:
+                    logger.debug("Neighbour events are lost, the table is read again.")
+                else:
+                    logger.warning("Neighbour events could not be read: %s", error)
+                return True
+            for message in parse_neighbour_messages(data):
+                addresses = [address for address in (message.ip_address, message.mac_address)
+                             if address]
+                if self.match_protectors(addresses):
+                    relevant = True
+
+    def _has_leases_changed(self) -> bool:
+        """This method checks if the leases file has been modified since the last check."""
+        if self._leases_path is None:
+            return False
+        try:
+            mtime = os.stat(self._leases_path).st_mtime
+        except OSError:
+            return False
+        changed = self._leases_mtime is not None and mtime != self._leases_mtime
+        self._leases_mtime = mtime
+        return changed
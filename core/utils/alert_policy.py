@@ -0,0 +1,110 @@
+"""
+This module contains the alert policy, which groups detections into incidents.
+The first image of an incident is alerted immediately. The later images are
+collected, and sent together as a digest at most once per cooldown window.
+An incident is closed after a quiet period without detections.
+"""
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from itertools import count
+from threading import Lock
+from time import monotonic
+
+from core.utils.logger import get_logger
+
+# Add logging support.
+logger = get_logger(__name__)
+
+
+@dataclass
+class Alert:
+    """This class represents an alert to be sent."""
+    message: str
+    images: list[bytes] = field(default_factory=list)
+    # The urgent alerts are never dropped by the dispatcher.
+    urgent: bool = False
+
+
+@dataclass
+class Incident:
+    """This class represents the detections of an intrusion."""
+    incident_id: int
+    started_at: float
+    last_seen_at: float
+    last_sent_at: float
+    detections: int = 1
+    pending_images: list[bytes] = field(default_factory=list)
+
+
+class AlertPolicy:
+    """
+    The alert policy decides which detections are alerted, and how.
+    """
+    COOLDOWN: float = 60.0
+    QUIET_PERIOD: float = 180.0
+    MAX_DIGEST_IMAGES: int = 10
+
+    def __init__(self,
+                 cooldown: float = COOLDOWN,
+                 quiet_period: float = QUIET_PERIOD,
+                 max_digest_images: int = MAX_DIGEST_IMAGES,
+                 clock: Callable[[], float] = monotonic) -> None:
+        self._cooldown: float = cooldown
+        self._quiet_period: float = quiet_period
+        self._max_digest_images: int = max_digest_images
+        self._clock: Callable[[], float] = clock
+        self._incident: Incident | None = None
+        self._incident_ids = count(1)
+        self._lock: Lock = Lock()
+
+    def update(self, detected: bool, image: bytes | None = None) -> list[Alert]:
+        """This method records an eye update, and returns the alerts to send."""
+        with self._lock:
+            now = self._clock()
+            # The first detection opens an incident, and is alerted immediately.
+            if (incident := self._incident) is None:
+                if not detected:
+                    return []
+                self._incident = Incident(next(self._incident_ids), now, now, now)
+                logger.info("Incident %d is started.", self._incident.incident_id)
+                return [Alert("There is an intruder! Here is the image:",
+                              [image] if image else [], urgent=True)]
+
+            alerts: list[Alert] = []
+            if detected:
+                incident.detections += 1
+                incident.last_seen_at = now
+                if image:
+                    incident.pending_images.append(image)
+                    # Keep the newest images only.
+                    del incident.pending_images[:-self._max_digest_images]
+
+            # Send the collected images once per cooldown window.
+            if incident.pending_images and now - incident.last_sent_at >= self._cooldown:
+                alerts.append(self._create_digest(incident))
+                incident.last_sent_at = now
+
+            # Close the incident after the quiet period.
+            if not detected and now - incident.last_seen_at >= self._quiet_period:
+                if incident.pending_images:
+                    alerts.append(self._create_digest(incident))
+                alerts.append(Alert(
+                    f"The intrusion is over: {incident.detections} detection(s) in "
+                    f"{(incident.last_seen_at - incident.started_at) / 60:.0f} minute(s)."
+                ))
+                logger.info("Incident %d is closed.", incident.incident_id)
+                self._incident = None
+            return alerts
+
+    def reset(self) -> None:
+        """This method closes the incident without alerts, e.g. when a protector comes home."""
+        with self._lock:
+            self._incident = None
+
+    # Internal methods
+    @staticmethod
+    def _create_digest(incident: Incident) -> Alert:
+        """This method creates a digest of the pending images, and clears them."""
+        images = incident.pending_images
+        incident.pending_images = []
+        return Alert(f"The intruder is still around, {len(images)} more image(s):", images)
@@ -1,7 +1,7 @@
 """
 This module contains datatypes needed for architecture.
 """
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import IntEnum, auto, unique
 
 
@@ -17,6 +17,8 @@ class WiFiStrategyResult:
     """This class represents a strategy result."""
     protector: Protector
     result: bool
+    # All the protectors around, the protector is the first of them.
+    protectors: list[Protector] = field(default_factory=list)
 
 
 @dataclass
@@ -24,6 +26,9 @@ class EyeStrategyResult:
     """This class represents a strategy result."""
     image: object
     result: bool
+    motion: bool = None
+    inference_time: float = None
+    regions: object = None
 
 
 @dataclass
@@ -53,6 +58,13 @@ class EyeStates(ObserverStates):
     NOT_DETECTED = auto()
 
 
+@dataclass
+class EyeEvent:
+    """This class represents a state change of an eye, with its JPEG encoded image."""
+    state: EyeStates
+    image: bytes | None = None
+
+
 @dataclass
 class NotifierReciever:
     """This class represents a notifier reciever."""
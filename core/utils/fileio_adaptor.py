@@ -3,10 +3,8 @@ This module contains the functionality neccessary
 to upload intruder's photos to File.io server before
 sending it over WhatsApp.
 """
-import glob
 import json
 import os
-from time import sleep
 from typing import Any
 
 import requests
@@ -16,40 +14,27 @@ from core.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# The seconds to wait for File.io to accept the upload.
+UPLOAD_TIMEOUT: float = 30.0
 
-def read_latest_file(dir_path: str) -> str:
-    """This method reads the latest file from the given directory."""
-    # Check if ~ is used.
-    if dir_path.startswith("~"):
-        dir_path = os.path.expanduser(dir_path)
 
-    # Check if the directory exists.
-    if not os.path.exists(dir_path):
-        raise FileNotFoundError(f"The given directory path does not exist: {dir_path}")
-
-    # Get the latest file.
-    while True:
-        list_of_files = glob.glob(dir_path + '/*')
-        if len(list_of_files) == 0:
-            # Wait for save operation to complete.
-            sleep(2)
-        else:
-            break
-    return max(list_of_files, key=os.path.getctime)
-
-
-def upload_to_fileio(file_path: str) -> str:
-    """Uploads a image file to File.io server."""
+def upload_to_fileio(image: str | bytes) -> str:
+    """Uploads a image file, or an encoded image in memory, to File.io server."""
     with open(".config.json", "r", encoding="utf-8") as file:
         _config = json.load(file)
     file_io_key = _config['file_io_key']
 
-    with open(file_path, 'rb') as file:
-        response = requests.post(
-            'https://file.io/',
-            files={"file": file},
-            auth=HTTPBasicAuth(file_io_key, '')
-        )
+    if isinstance(image, bytes):
+        files = {"file": ("image.jpg", image, "image/jpeg")}
+    else:
+        with open(image, 'rb') as file:
+            files = {"file": (os.path.basename(image), file.read(), "image/jpeg")}
+    response = requests.post(
+        'https://file.io/',
+        files=files,
+        auth=HTTPBasicAuth(file_io_key, ''),
+        timeout=UPLOAD_TIMEOUT
+    )
 
     logger.debug("File.io response: %s", str(response.status_code))
 
@@ -0,0 +1,37 @@
+"""
+This module contains a bounded buffer which only keeps the latest frames.
+It is used to hand frames from a capturing thread to the consumers
+without blocking the camera.
+"""
+from collections import deque
+from threading import Condition
+
+import numpy
+
+
+class LatestFrameBuffer:
+    """
+    A bounded buffer which keeps the newest frames.
+    Older frames are dropped when the buffer is full.
+    """
+    def __init__(self, size: int = 1) -> None:
+        self._frames: deque[numpy.ndarray] = deque(maxlen=size)
+        self._condition: Condition = Condition()
+
+    def put(self, frame: numpy.ndarray) -> None:
+        """This method puts a frame, dropping the oldest one if full."""
+        with self._condition:
+            self._frames.append(frame)
+            self._condition.notify_all()
+
+    def get(self, timeout: float | None = None) -> numpy.ndarray:
+        """This method returns the newest frame, waiting if there is none yet."""
+        with self._condition:
+            if not self._condition.wait_for(lambda: len(self._frames) > 0, timeout):
+                raise TimeoutError("No frame has been received in time.")
+            return self._frames[-1]
+
+    def clear(self) -> None:
+        """This method drops all the frames in the buffer."""
+        with self._condition:
+            self._frames.clear()
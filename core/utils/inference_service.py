@@ -0,0 +1,174 @@
+"""
+This module contains a shared inference service for several cameras.
+Frames of all cameras are collected in one queue, and a pool of workers
+runs them through the detectors, batched where the model allows it.
+"""
+import heapq
+from collections.abc import Callable
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from itertools import count
+from threading import Condition, Lock, Thread
+from time import monotonic
+
+import numpy
+
+from core.strategies.detectors.base_detector_strategy import (
+    BaseDetectorStrategy,
+    DetectorResult,
+)
+from core.utils.logger import get_logger
+
+# Add logging support.
+logger = get_logger(__name__)
+
+
+@dataclass
+class CameraSettings:
+    """This class represents the inference settings of a camera."""
+    name: str
+    priority: int = 0
+    latency_target: float = 1.0
+
+
+@dataclass
+class CameraStats:
+    """This class represents the inference statistics of a camera."""
+    name: str
+    frames: int = 0
+    mean_latency: float = 0.0
+    missed_targets: int = 0
+
+
+@dataclass(order=True)
+class InferenceRequest:
+    """This class represents a frame waiting for inference."""
+    sort_key: tuple[float, int]
+    camera: CameraSettings = field(compare=False)
+    frame: numpy.ndarray = field(compare=False)
+    rotation: int | None = field(compare=False)
+    submitted_at: float = field(compare=False)
+    future: Future = field(compare=False)
+
+
+class InferenceService:  # pylint: disable=too-many-instance-attributes
+    """
+    The shared inference service.
+    Requests are served by the earliest deadline, and each priority level
+    of a camera moves its deadlines earlier by the priority step. A busy
+    camera of a higher priority is served first, but the requests of the
+    others age past its new ones, so no camera is starved.
+    Each worker owns one detector, so the model memory is bound to the
+    number of workers, not to the number of cameras.
+    """
+    MAX_BATCH_SIZE: int = 4
+    BATCH_WINDOW: float = 0.01
+    PRIORITY_STEP: float = 1.0
+
+    def __init__(self,
+                 detector_factory: Callable[[], BaseDetectorStrategy],
+                 workers: int = 1,
+                 max_batch_size: int = MAX_BATCH_SIZE,
+                 batch_window: float = BATCH_WINDOW,
+                 priority_step: float = PRIORITY_STEP) -> None:
+        self._max_batch_size: int = max_batch_size
+        self._batch_window: float = batch_window
+        self._priority_step: float = priority_step
+        self._requests: list[InferenceRequest] = []
+        self._condition: Condition = Condition()
+        self._sequence = count()
+        self._stats: dict[str, CameraStats] = {}
+        self._stats_lock: Lock = Lock()
+
+        # Every worker creates its own detector, since interpreters are not shared.
+        self._workers: list[Thread] = [
+            Thread(target=self._work,
+                   args=(detector_factory(),),
+                   name=f"inference-{index}",
+                   daemon=True)
+            for index in range(workers)
+        ]
+        for worker in self._workers:
+            worker.start()
+
+    def submit(self,
+               camera: CameraSettings,
+               frame: numpy.ndarray,
+               rotation: int | None = None) -> Future:
+        """
+        This method queues a frame of the camera, and returns its future result.
+        A request whose future is cancelled before it is served is skipped.
+        """
+        submitted_at = monotonic()
+        request = InferenceRequest(
+            sort_key=(submitted_at + camera.latency_target
+                      - camera.priority * self._priority_step,
+                      next(self._sequence)),
+            camera=camera,
+            frame=frame,
+            rotation=rotation,
+            submitted_at=submitted_at,
+            future=Future(),
+        )
+        with self._condition:
+            heapq.heappush(self._requests, request)
+            self._condition.notify()
+        return request.future
+
+    def get_stats(self) -> list[CameraStats]:
+        """This method returns the statistics of each camera."""
+        with self._stats_lock:
+            return [CameraStats(**vars(stats)) for stats in self._stats.values()]
+
+    # Internal methods
+    def _next_batch(self) -> list[InferenceRequest]:
+        """This method waits for requests, and pops a batch of them."""
+        with self._condition:
+            self._condition.wait_for(lambda: len(self._requests) > 0)
+            # Give other cameras a short chance to join the batch,
+            # without passing the deadline of the most urgent request.
+            window = min(self._batch_window,
+                         self._requests[0].submitted_at
+                         + self._requests[0].camera.latency_target - monotonic())
+            if len(self._requests) < self._max_batch_size and window > 0:
+                self._condition.wait_for(
+                    lambda: len(self._requests) >= self._max_batch_size,
+                    window,
+                )
+            batch_size = min(self._max_batch_size, len(self._requests))
+            batch = [heapq.heappop(self._requests) for _ in range(batch_size)]
+        # The callers which have given up on their requests have cancelled them.
+        return [request for request in batch if request.future.set_running_or_notify_cancel()]
+
+    def _work(self, detector: BaseDetectorStrategy) -> None:
+        """This method serves the requests forever."""
+        while True:
+            if not (batch := self._next_batch()):
+                continue
+            try:
+                results: list[DetectorResult] = detector.detect_humans_batch(
+                    [request.frame for request in batch],
+                    [request.rotation for request in batch],
+                )
+            except Exception as error:  # pylint: disable=broad-exception-caught
+                logger.error("An error occurred while running the inference: %s", error)
+                for request in batch:
+                    request.future.set_exception(RuntimeError(error))
+                continue
+
+            finished_at = monotonic()
+            for request, result in zip(batch, results):
+                self._record(request, finished_at - request.submitted_at)
+                request.future.set_result(result)
+
+    def _record(self, request: InferenceRequest, latency: float) -> None:
+        """This method records the end-to-end latency of a request."""
+        with self._stats_lock:
+            stats = self._stats.setdefault(request.camera.name,
+                                           CameraStats(request.camera.name))
+            stats.frames += 1
+            stats.mean_latency += (latency - stats.mean_latency) / stats.frames
+            if latency > request.camera.latency_target:
+                stats.missed_targets += 1
+                logger.debug("Camera %s missed its latency target: %.3f seconds.",
+                             request.camera.name, latency)
@@ -0,0 +1,260 @@
+"""
+This module contains the network prober, which checks which addresses are reachable.
+All the addresses are probed at the same time from a single thread, with
+ICMP echo requests and TCP connection attempts, until a shared deadline.
+A TCP reset proves the host is up as much as an accepted connection does.
+Hosts which answer neither, e.g. sleeping phones, are still found if the
+probes have resolved their ARP entry. The ARP fallback counts any complete
+entry, including STALE and DELAY ones, so a host which has left is still
+found until the kernel expires its entry, which delays a departure by about
+one ARP cache lifetime. The reachable addresses are cached for a short
+time, and the resolved names for longer. The names are resolved before the
+deadline starts, and no lock is held while resolving or probing.
+"""
+import errno
+import os
+import selectors
+import socket
+import struct
+from collections.abc import Iterable
+from threading import Lock
+from time import monotonic
+
+from core.utils.logger import get_logger
+
+# Add logging support.
+logger = get_logger(__name__)
+
+ICMP_ECHO_REQUEST = 8
+ICMP_ECHO_REPLY = 0
+ARP_TABLE_PATH = "/proc/net/arp"
+# The connection errors, which are sent by the host itself.
+HOST_UP_ERRORS = (0, errno.ECONNREFUSED, errno.ECONNRESET)
+
+
+def checksum(data: bytes) -> int:
+    """This function returns the internet checksum of the data."""
+    if len(data) % 2:
+        data += b"\0"
+    total = sum(struct.unpack(f"!{len(data) // 2}H", data))
+    total = (total >> 16) + (total & 0xFFFF)
+    total += total >> 16
+    return ~total & 0xFFFF
+
+
+def create_icmp_socket() -> socket.socket | None:
+    """
+    This function opens an unprivileged ICMP socket, or a raw one with root rights.
+    None is returned if neither is permitted.
+    """
+    for kind in (socket.SOCK_DGRAM, socket.SOCK_RAW):
+        try:
+            icmp_socket = socket.socket(socket.AF_INET, kind, socket.IPPROTO_ICMP)
+        except OSError:
+            continue
+        icmp_socket.setblocking(False)
+        return icmp_socket
+    return None
+
+
+def read_arp_table(path: str = ARP_TABLE_PATH) -> dict[str, str]:
+    """This function returns the MAC addresses of the resolved ARP entries by IP address."""
+    table: dict[str, str] = {}
+    try:
+        with open(path, "r", encoding="utf-8") as file:
+            next(file, None)
+            for line in file:
+                fields = line.split()
+                # The flags of a complete entry have the 0x2 bit.
+                if len(fields) >= 4 and int(fields[2], 16) & 0x2:
+                    table[fields[0]] = fields[3].upper()
+    except OSError:
+        pass
+    return table
+
+
+class NetworkProber:  # pylint: disable=too-many-instance-attributes
+    """
+    The network prober checks which addresses are reachable.
+    With the ARP fallback, a host which has left is reachable until its
+    STALE or DELAY entry expires from the ARP cache. The unreachable
+    addresses are not cached, so an arriving host is found by the next probe.
+    """
+    DEADLINE: float = 1.0
+    TCP_PORTS: tuple[int, ...] = (62078, 5353, 80, 443)
+    CACHE_TTL: float = 10.0
+    RESOLVE_TTL: float = 300.0
+
+    def __init__(self,  # pylint: disable=too-many-arguments,too-many-positional-arguments
+                 deadline: float = DEADLINE,
+                 tcp_ports: Iterable[int] = TCP_PORTS,
+                 cache_ttl: float = CACHE_TTL,
+                 use_icmp: bool = True,
+                 use_arp: bool = True,
+                 resolve_ttl: float = RESOLVE_TTL) -> None:
+        self._deadline: float = deadline
+        self._tcp_ports: tuple[int, ...] = tuple(tcp_ports)
+        self._cache_ttl: float = cache_ttl
+        self._use_icmp: bool = use_icmp
+        self._use_arp: bool = use_arp
+        self._resolve_ttl: float = resolve_ttl
+        # The time of the last successful probe by address.
+        self._cache: dict[str, float] = {}
+        # The IPv4 address and the time of the last resolution by address.
+        self._resolved: dict[str, tuple[str, float]] = {}
+        self._lock: Lock = Lock()
+        self._sequence: int = 0
+
+    def probe(self, addresses: Iterable[str]) -> set[str]:
+        """This method returns the reachable addresses, probing the ones which are not cached."""
+        addresses = set(addresses)
+        with self._lock:
+            now = monotonic()
+            reachable = {address for address in addresses
+                         if address in self._cache
+                         and now - self._cache[address] < self._cache_ttl}
+        if unknown := [address for address in addresses if address not in reachable]:
+            found = self._probe(self._resolve(unknown))
+            with self._lock:
+                now = monotonic()
+                for address in found:
+                    self._cache[address] = now
+            reachable |= found
+        return reachable
+
+    def clear_cache(self) -> None:
+        """This method forgets the results of the earlier probes, and the resolved names."""
+        with self._lock:
+            self._cache.clear()
+            self._resolved.clear()
+
+    # Internal methods
+    def _probe(self, targets: dict[str, str]) -> set[str]:
+        """This method probes the IPv4 addresses of the targets concurrently, until the deadline."""
+        started_at = monotonic()
+        found: set[str] = set()
+
+        selector = selectors.DefaultSelector()
+        icmp_socket = create_icmp_socket() if self._use_icmp else None
+        try:
+            self._start_probes(selector, icmp_socket, targets)
+            found = self._wait_for_answers(selector, icmp_socket, targets,
+                                           started_at + self._deadline)
+        finally:
+            for key in list(selector.get_map().values()):
+                key.fileobj.close()
+            selector.close()
+
+        if self._use_arp and len(found) < len(targets):
+            found |= self._find_in_arp_table(targets)
+        logger.debug("Probed %d addresses in %.3f seconds, reachable: %s",
+                     len(targets), monotonic() - started_at, str(sorted(found)))
+        return found
+
+    def _start_probes(self,
+                      selector: selectors.BaseSelector,
+                      icmp_socket: socket.socket | None,
+                      targets: dict[str, str]) -> None:
+        """This method sends the echo requests, and starts the connection attempts."""
+        if icmp_socket is not None:
+            self._send_echo_requests(icmp_socket, targets)
+            selector.register(icmp_socket, selectors.EVENT_READ, None)
+        else:
+            logger.debug("ICMP is not permitted, only TCP is used.")
+        for address, ip_address in targets.items():
+            for port in self._tcp_ports:
+                if (tcp_socket := self._connect(ip_address, port)) is not None:
+                    selector.register(tcp_socket, selectors.EVENT_WRITE, address)
+
+    def _wait_for_answers(self,
+                          selector: selectors.BaseSelector,
+                          icmp_socket: socket.socket | None,
+                          targets: dict[str, str],
+                          deadline: float) -> set[str]:
+        """This method collects the answering addresses, until all answered or the deadline."""
+        found: set[str] = set()
+        while len(found) < len(targets) and selector.get_map():
+            if (timeout := deadline - monotonic()) <= 0:
+                break
+            for key, _ in selector.select(timeout):
+                if key.fileobj is icmp_socket:
+                    found |= self._read_echo_replies(icmp_socket, targets)
+                    continue
+                # The connection attempt has finished, successfully or not.
+                error = key.fileobj.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR)
+                if error in HOST_UP_ERRORS:
+                    found.add(key.data)
+                selector.unregister(key.fileobj)
+                key.fileobj.close()
+        return found
+
+    @staticmethod
+    def _find_in_arp_table(targets: dict[str, str]) -> set[str]:
+        """
+        This method returns the addresses with a complete ARP entry.
+        The stale entries count too, so a departed host is found until its entry expires.
+        """
+        arp_table = read_arp_table()
+        return {address for address, ip_address in targets.items() if ip_address in arp_table}
+
+    def _resolve(self, addresses: list[str]) -> dict[str, str]:
+        """
+        This method returns the IPv4 address of each address, by address.
+        The resolved names are cached, and the failed ones are tried again next time.
+        """
+        targets: dict[str, str] = {}
+        for address in addresses:
+            with self._lock:
+                cached = self._resolved.get(address)
+            if cached is not None and monotonic() - cached[1] < self._resolve_ttl:
+                targets[address] = cached[0]
+                continue
+            try:
+                targets[address] = socket.gethostbyname(address)
+            except OSError:
+                logger.warning("The address %s could not be resolved.", address)
+                continue
+            with self._lock:
+                self._resolved[address] = (targets[address], monotonic())
+        return targets
+
+    @staticmethod
+    def _connect(ip_address: str, port: int) -> socket.socket | None:
+        """This method starts a non-blocking connection attempt."""
+        tcp_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        tcp_socket.setblocking(False)
+        if tcp_socket.connect_ex((ip_address, port)) in (0, errno.EINPROGRESS):
+            return tcp_socket
+        tcp_socket.close()
+        return None
+
+    def _send_echo_requests(self, icmp_socket: socket.socket, targets: dict[str, str]) -> None:
+        """This method sends an echo request to every target."""
+        with self._lock:
+            self._sequence = sequence = (self._sequence + 1) & 0xFFFF
+        identifier = os.getpid() & 0xFFFF
+        header = struct.pack("!BBHHH", ICMP_ECHO_REQUEST, 0, 0, identifier, sequence)
+        payload = b"home-security-system"
+        packet = struct.pack("!BBHHH", ICMP_ECHO_REQUEST, 0, checksum(header + payload),
+                             identifier, sequence) + payload
+        for ip_address in set(targets.values()):
+            try:
+                icmp_socket.sendto(packet, (ip_address, 0))
+            except OSError as error:
+                logger.debug("The echo request to %s could not be sent: %s", ip_address, error)
+
+    @staticmethod
+    def _read_echo_replies(icmp_socket: socket.socket, targets: dict[str, str]) -> set[str]:
+        """This method reads the waiting echo replies, and returns the addresses they came from."""
+        found: set[str] = set()
+        while True:
+            try:
+                packet, (ip_address, _) = icmp_socket.recvfrom(1024)
+            except OSError:
+                return found
+            # A raw socket also returns the IP header.
+            if icmp_socket.type == socket.SOCK_RAW:
+                packet = packet[(packet[0] & 0x0F) * 4:]
+            if packet and packet[0] == ICMP_ECHO_REPLY:
+                found |= {address for address, target in targets.items()
+                          if target == ip_address}
@@ -0,0 +1,190 @@
+"""
+This module contains the notification dispatcher.
+The notifications are put into a bounded outbox and sent by worker threads,
+so the subject threads never wait for the network. Each reciever has its
+own bounded queue and sender thread, so the notifications are fanned out to
+the recievers concurrently, a slow reciever does not hold up the others, and
+the order of the notifications is kept per reciever. Failed sends are retried
+with an exponential backoff, and every reciever is rate limited. When a queue
+is full, or the rate limit is exceeded, the notification is dropped, except
+the urgent ones, e.g. the first alert of an incident; those wait for the rate
+limit instead.
+"""
+from dataclasses import dataclass, field
+from math import inf
+from random import uniform
+from threading import Lock
+from time import monotonic, sleep
+
+from core.strategies.notifier.base_notifier_strategy import BaseNotifierStrategy
+from core.utils.datatypes import NotifierReciever
+from core.utils.logger import get_logger
+from core.utils.pipeline import PipelineStage, StageStats
+
+# Add logging support.
+logger = get_logger(__name__)
+
+
+@dataclass
+class Notification:
+    """This class represents a notification in the outbox."""
+    message: str
+    images: list[bytes] = field(default_factory=list)
+    urgent: bool = False
+
+
+class RateLimiter:
+    """
+    A token bucket, which allows a burst of messages, and then a message per period.
+    """
+    def __init__(self, burst: int, period: float) -> None:
+        self._burst: int = burst
+        self._period: float = period
+        self._tokens: float = float(burst)
+        self._updated_at: float = monotonic()
+        self._lock: Lock = Lock()
+
+    def reserve(self, max_wait: float) -> float | None:
+        """
+        This method takes a token, and returns how long to wait before using it.
+        None is returned, and no token is taken, if the wait would be longer than max_wait.
+        """
+        with self._lock:
+            now = monotonic()
+            self._tokens = min(self._burst,
+                               self._tokens + (now - self._updated_at) / self._period)
+            self._updated_at = now
+            if (wait := max(0.0, (1 - self._tokens) * self._period)) > max_wait:
+                return None
+            self._tokens -= 1
+            return wait
+
+
+@dataclass
+class RecieverChannel:
+    """This class represents the rate limit and the sender queue of a reciever."""
+    rate_limiter: RateLimiter
+    sender: PipelineStage
+
+
+class NotificationDispatcher:  # pylint: disable=too-many-instance-attributes
+    """
+    The notification dispatcher sends the notifications of the outbox
+    with its own worker threads.
+    """
+    OUTBOX_SIZE: int = 16
+    CHANNEL_SIZE: int = 8
+    MAX_RETRIES: int = 3
+    BACKOFF: float = 1.0
+    MAX_BACKOFF: float = 30.0
+    RATE_BURST: int = 5
+    RATE_PERIOD: float = 6.0
+    MAX_RATE_WAIT: float = 60.0
+
+    def __init__(self,  # pylint: disable=too-many-arguments,too-many-positional-arguments
+                 notifier: BaseNotifierStrategy,
+                 outbox_size: int = OUTBOX_SIZE,
+                 channel_size: int = CHANNEL_SIZE,
+                 max_retries: int = MAX_RETRIES,
+                 backoff: float = BACKOFF,
+                 max_backoff: float = MAX_BACKOFF,
+                 rate_burst: int = RATE_BURST,
+                 rate_period: float = RATE_PERIOD,
+                 max_rate_wait: float = MAX_RATE_WAIT) -> None:
+        self._notifier: BaseNotifierStrategy = notifier
+        self._channel_size: int = channel_size
+        self._max_retries: int = max_retries
+        self._backoff: float = backoff
+        self._max_backoff: float = max_backoff
+        self._rate_burst: int = rate_burst
+        self._rate_period: float = rate_period
+        self._max_rate_wait: float = max_rate_wait
+        self._channels: dict[str, RecieverChannel] = {}
+        self._channels_lock: Lock = Lock()
+
+        self._outbox: PipelineStage = PipelineStage("outbox", self._fan_out, outbox_size,
+                                                    droppable=self._is_droppable)
+        self._outbox.start()
+
+    def get_notifier(self) -> BaseNotifierStrategy:
+        """This method returns the notifier."""
+        return self._notifier
+
+    def notify(self, message: str, images: list[bytes] | None = None,
+               urgent: bool = False) -> None:
+        """
+        This method puts a notification with the encoded images into the outbox.
+        The urgent notifications are never dropped when the queues are full.
+        """
+        self._outbox.put(Notification(message, list(images or []), urgent))
+
+    def get_stats(self) -> StageStats:
+        """This method returns the statistics of the outbox."""
+        return self._outbox.get_stats()
+
+    # Internal methods
+    def _fan_out(self, notification: Notification) -> None:
+        """This method puts the notification into the queue of every reciever."""
+        for reciever in self._notifier.get_recievers():
+            self._get_channel(reciever).sender.put(notification)
+
+    @staticmethod
+    def _is_droppable(notification: Notification) -> bool:
+        """This method checks if the notification may be dropped when a queue is full."""
+        return not notification.urgent
+
+    def _deliver(self,
+                 rate_limiter: RateLimiter,
+                 reciever: NotifierReciever,
+                 notification: Notification) -> None:
+        """
+        This method sends a notification to a reciever, within the rate limit.
+        The urgent notifications wait for their turn however long it takes.
+        """
+        max_wait = inf if notification.urgent else self._max_rate_wait
+        if (wait := rate_limiter.reserve(max_wait)) is None:
+            logger.warning("Rate limit of %s is exceeded, the notification is dropped.",
+                           reciever.name)
+            return
+        sleep(wait)
+        self._send(reciever, notification)
+
+    def _send(self, reciever: NotifierReciever, notification: Notification) -> None:
+        """This method sends a notification, and retries with an exponential backoff."""
+        for attempt in range(self._max_retries + 1):
+            try:
+                if not notification.images:
+                    self._notifier.send_message(reciever, notification.message)
+                elif len(notification.images) == 1:
+                    self._notifier.send_image(reciever, notification.images[0],
+                                              notification.message)
+                else:
+                    self._notifier.send_images(reciever, notification.images,
+                                               notification.message)
+                return
+            except Exception as error:  # pylint: disable=broad-exception-caught
+                if attempt == self._max_retries:
+                    logger.error("The notification could not be sent to %s: %s",
+                                 reciever.name, error)
+                    return
+                # Back-off exponentially, with jitter to spread the retries.
+                delay = min(self._max_backoff, self._backoff * 2 ** attempt)
+                delay = uniform(delay / 2, delay)
+                logger.warning("Sending to %s has failed (%s), retrying in %.1f seconds...",
+                               reciever.name, error, delay)
+                sleep(delay)
+
+    def _get_channel(self, reciever: NotifierReciever) -> RecieverChannel:
+        """This method returns the channel of the reciever, and starts its sender."""
+        with self._channels_lock:
+            if reciever.name not in self._channels:
+                rate_limiter = RateLimiter(self._rate_burst, self._rate_period)
+                sender = PipelineStage(
+                    f"notifier-{reciever.name}",
+                    lambda notification: self._deliver(rate_limiter, reciever, notification),
+                    self._channel_size,
+                    droppable=self._is_droppable,
+                )
+                sender.start()
+                self._channels[reciever.name] = RecieverChannel(rate_limiter, sender)
+            return self._channels[reciever.name]
@@ -0,0 +1,194 @@
+"""
+This module contains the building blocks of staged pipelines.
+Every stage owns a bounded queue which drops the oldest item when full,
+so that a slow stage never blocks the stages before it. The items which
+must not be lost can be protected, then only the droppable items are
+dropped, and the queue may grow up to its hard size to keep them. A queue
+can also coalesce the droppable items, when only the latest of them matters.
+"""
+from collections import deque
+from collections.abc import Callable
+from dataclasses import dataclass
+from queue import Empty
+from threading import Condition, Lock, Thread
+from time import perf_counter
+from typing import Any
+
+from core.utils.logger import get_logger
+
+# Add logging support.
+logger = get_logger(__name__)
+
+
+@dataclass
+class StageStats:  # pylint: disable=too-many-instance-attributes
+    """This class represents the statistics of a pipeline stage."""
+    name: str
+    queue_depth: int = 0
+    processed: int = 0
+    dropped: int = 0
+    failed: int = 0
+    mean_wait: float = 0.0
+    mean_latency: float = 0.0
+    max_latency: float = 0.0
+
+
+class DropOldestQueue:
+    """
+    A bounded FIFO queue which drops the oldest droppable item when it is full.
+    Every item is droppable unless the droppable check is given. With coalesce,
+    a droppable item replaces the droppable item at the end of the queue.
+    The protected items may fill the queue over its size, up to the hard size,
+    which is four times the size by default; then the oldest item is dropped.
+    """
+    HARD_SIZE_FACTOR: int = 4
+
+    def __init__(self,
+                 maxsize: int,
+                 droppable: Callable[[Any], bool] | None = None,
+                 coalesce: bool = False,
+                 hard_maxsize: int | None = None) -> None:
+        self._items: deque[Any] = deque()
+        self._maxsize: int = maxsize
+        self._hard_maxsize: int = max(maxsize, hard_maxsize or maxsize * self.HARD_SIZE_FACTOR)
+        self._droppable: Callable[[Any], bool] | None = droppable
+        self._coalesce: bool = coalesce
+        self._condition: Condition = Condition()
+        self.dropped: int = 0
+
+    def put(self, item: Any) -> None:
+        """This method puts an item, dropping the oldest droppable one if full."""
+        with self._condition:
+            if self._coalesce and self._items \
+                    and self._is_droppable(item) and self._is_droppable(self._items[-1]):
+                # Coalesce the droppable items, only the latest one matters.
+                self._items[-1] = item
+                self.dropped += 1
+                return
+            if len(self._items) >= self._maxsize:
+                self._drop_oldest()
+            self._items.append(item)
+            self._condition.notify()
+
+    def get(self, timeout: float | None = None) -> Any:
+        """This method returns the oldest item, waiting until there is one."""
+        with self._condition:
+            if not self._condition.wait_for(lambda: len(self._items) > 0, timeout):
+                raise Empty
+            return self._items.popleft()
+
+    def qsize(self) -> int:
+        """This method returns the number of items in the queue."""
+        with self._condition:
+            return len(self._items)
+
+    # Internal methods
+    def _drop_oldest(self) -> None:
+        """This method drops the oldest droppable item, or the oldest item at the hard size."""
+        for index, queued in enumerate(self._items):
+            if self._is_droppable(queued):
+                del self._items[index]
+                self.dropped += 1
+                return
+        # The protected items are kept even if the queue grows over its size, up to a limit.
+        if len(self._items) >= self._hard_maxsize:
+            logger.warning("The queue is full of protected items, the oldest one is dropped.")
+            self._items.popleft()
+            self.dropped += 1
+
+    def _is_droppable(self, item: Any) -> bool:
+        """This method checks if the item may be dropped."""
+        return self._droppable is None or self._droppable(item)
+
+
+class StageMonitor:
+    """
+    Collects the waiting time and the latency of a stage.
+    """
+    def __init__(self, name: str) -> None:
+        self._stats: StageStats = StageStats(name)
+        self._lock: Lock = Lock()
+
+    def record(self, latency: float, wait: float = 0.0, failed: bool = False) -> None:
+        """This method records a processed item."""
+        with self._lock:
+            stats = self._stats
+            stats.processed += 1
+            stats.failed += int(failed)
+            stats.mean_wait += (wait - stats.mean_wait) / stats.processed
+            stats.mean_latency += (latency - stats.mean_latency) / stats.processed
+            stats.max_latency = max(stats.max_latency, latency)
+
+    def get_stats(self, queue_depth: int = 0, dropped: int = 0) -> StageStats:
+        """This method returns a copy of the statistics."""
+        with self._lock:
+            return StageStats(name=self._stats.name,
+                              queue_depth=queue_depth,
+                              processed=self._stats.processed,
+                              dropped=dropped,
+                              failed=self._stats.failed,
+                              mean_wait=self._stats.mean_wait,
+                              mean_latency=self._stats.mean_latency,
+                              max_latency=self._stats.max_latency)
+
+
+class PipelineStage:
+    """
+    A pipeline stage which processes the items of its queue
+    with the given handler in one or more worker threads.
+    """
+    def __init__(self,  # pylint: disable=too-many-arguments
+                 name: str,
+                 handler: Callable[[Any], None],
+                 maxsize: int = 2,
+                 workers: int = 1,
+                 *,
+                 droppable: Callable[[Any], bool] | None = None,
+                 coalesce: bool = False,
+                 hard_maxsize: int | None = None) -> None:
+        self.name: str = name
+        self._handler: Callable[[Any], None] = handler
+        # The queue holds the items with the time they were put.
+        self._queue: DropOldestQueue = DropOldestQueue(
+            maxsize, (lambda entry: droppable(entry[1])) if droppable is not None else None,
+            coalesce, hard_maxsize)
+        self._monitor: StageMonitor = StageMonitor(name)
+        self._workers: list[Thread] = [
+            Thread(target=self._work, name=f"{name}-{index}", daemon=True)
+            for index in range(workers)
+        ]
+        self._started: bool = False
+        self._start_lock: Lock = Lock()
+
+    def start(self) -> None:
+        """This method starts the workers if they are not started yet."""
+        with self._start_lock:
+            if self._started:
+                return
+            self._started = True
+            for worker in self._workers:
+                worker.start()
+
+    def put(self, item: Any) -> None:
+        """This method puts an item into the stage queue."""
+        self._queue.put((perf_counter(), item))
+
+    def get_stats(self) -> StageStats:
+        """This method returns the statistics of the stage."""
+        return self._monitor.get_stats(self._queue.qsize(), self._queue.dropped)
+
+    # Internal methods
+    def _work(self) -> None:
+        """This method processes the items of the queue forever."""
+        while True:
+            enqueued_at, item = self._queue.get()
+            started_at = perf_counter()
+            failed = False
+            try:
+                self._handler(item)
+            except Exception:  # pylint: disable=broad-exception-caught
+                logger.exception("[%s] An error occurred while processing an item.", self.name)
+                failed = True
+            self._monitor.record(latency=perf_counter() - started_at,
+                                 wait=started_at - enqueued_at,
+                                 failed=failed)
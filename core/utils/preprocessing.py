@@ -0,0 +1,134 @@
+"""
+This module contains the preprocessing path from the camera buffer
+into the input tensor of a model. The full-size frame is only read once
+by the resize; the rotation and the colour conversion are applied on
+the small image, using preallocated scratch buffers.
+"""
+import cv2
+import numpy
+
+# The rotations by the names used in the configurations.
+ROTATIONS: dict[str, int | None] = {
+    "none": None,
+    "90cw": cv2.ROTATE_90_CLOCKWISE,
+    "90ccw": cv2.ROTATE_90_COUNTERCLOCKWISE,
+    "180": cv2.ROTATE_180,
+}
+# Rotations which swap the width and the height of the frame.
+TRANSPOSING_ROTATIONS: tuple[int, ...] = (cv2.ROTATE_90_CLOCKWISE, cv2.ROTATE_90_COUNTERCLOCKWISE)
+
+
+def get_rotation(name: str | None) -> int | None:
+    """
+    This function returns the cv2 rotation of the given name, or None without a name.
+    The raw cv2 values are not accepted, since 0 would be a 90 degrees rotation.
+    """
+    if name is None:
+        return None
+    if name not in ROTATIONS:
+        raise ValueError(f"Unknown rotation {name!r}, expected one of {sorted(ROTATIONS)}.")
+    return ROTATIONS[name]
+
+
+def rotated_shape(shape: tuple[int, ...], rotation: int | None) -> tuple[int, int]:
+    """This function returns the (height, width) of a frame after the rotation."""
+    height, width = shape[:2]
+    if rotation in TRANSPOSING_ROTATIONS:
+        return width, height
+    return height, width
+
+
+def rotate_frame(frame: numpy.ndarray, rotation: int | None) -> numpy.ndarray:
+    """This function returns the rotated frame, or the frame itself without a rotation."""
+    if rotation is None:
+        return frame
+    return cv2.rotate(frame, rotation)
+
+
+class TensorPreprocessor:
+    """
+    Converts BGR, BGRA or XRGB8888 frames into an RGB input tensor.
+    The scratch buffers are allocated once per frame layout, and re-used.
+    """
+    def __init__(self, input_width: int, input_height: int) -> None:
+        self._input_width: int = input_width
+        self._input_height: int = input_height
+        self._scratch: dict[tuple[int, int | None], tuple[numpy.ndarray, ...]] = {}
+
+    def process(self,
+                frame: numpy.ndarray,
+                out: numpy.ndarray,
+                rotation: int | None = None) -> numpy.ndarray:
+        """This method writes the preprocessed frame into the given (H, W, 3) output."""
+        channels = frame.shape[2] if frame.ndim == 3 else 1
+        resized, rotated = self._get_scratch(channels, rotation)
+
+        # Resize the full frame first, so every other step works on the small image.
+        cv2.resize(frame, (resized.shape[1], resized.shape[0]),
+                   dst=resized, interpolation=cv2.INTER_AREA)
+        if rotated is not None:
+            cv2.rotate(resized, rotation, dst=rotated)
+            resized = rotated
+
+        # Convert the colours straight into the output memory.
+        if channels == 4:
+            cv2.cvtColor(resized, cv2.COLOR_BGRA2RGB, dst=out)
+        elif channels == 3:
+            cv2.cvtColor(resized, cv2.COLOR_BGR2RGB, dst=out)
+        else:
+            cv2.cvtColor(resized, cv2.COLOR_GRAY2RGB, dst=out)
+        return out
+
+    # Internal methods
+    def _get_scratch(self,
+                     channels: int,
+                     rotation: int | None) -> tuple[numpy.ndarray, numpy.ndarray | None]:
+        """This method returns the scratch buffers for the frame layout."""
+        if (key := (channels, rotation)) not in self._scratch:
+            height, width = self._input_height, self._input_width
+            # The frame is resized to the size before the rotation.
+            resized_height, resized_width = rotated_shape((height, width), rotation)
+            shape = (resized_height, resized_width, channels) if channels > 1 \
+                else (resized_height, resized_width)
+            resized = numpy.empty(shape, dtype=numpy.uint8)
+            rotated = None
+            if rotation is not None:
+                rotated = numpy.empty((height, width) + shape[2:], dtype=numpy.uint8)
+            self._scratch[key] = (resized, rotated)
+        return self._scratch[key]
+
+
+def unrotated_region(region: numpy.ndarray,
+                     shape: tuple[int, ...],
+                     rotation: int | None) -> tuple[int, int, int, int]:
+    """
+    This function maps a (min_x, max_x, min_y, max_y) region of the rotated
+    frame back onto the frame of the given shape, before the rotation.
+    """
+    height, width = shape[:2]
+    min_x, max_x, min_y, max_y = (int(value) for value in region)
+    if rotation == cv2.ROTATE_90_COUNTERCLOCKWISE:
+        return width - max_y, width - min_y, min_x, max_x
+    if rotation == cv2.ROTATE_90_CLOCKWISE:
+        return min_y, max_y, height - max_x, height - min_x
+    if rotation == cv2.ROTATE_180:
+        return width - max_x, width - min_x, height - max_y, height - min_y
+    return min_x, max_x, min_y, max_y
+
+
+def rotated_region(region: numpy.ndarray,
+                   shape: tuple[int, ...],
+                   rotation: int | None) -> tuple[int, int, int, int]:
+    """
+    This function maps a (min_x, max_x, min_y, max_y) region of the frame
+    of the given shape onto the frame after the rotation.
+    """
+    height, width = shape[:2]
+    min_x, max_x, min_y, max_y = (int(value) for value in region)
+    if rotation == cv2.ROTATE_90_COUNTERCLOCKWISE:
+        return min_y, max_y, width - max_x, width - min_x
+    if rotation == cv2.ROTATE_90_CLOCKWISE:
+        return height - max_y, height - min_y, min_x, max_x
+    if rotation == cv2.ROTATE_180:
+        return width - max_x, width - min_x, height - max_y, height - min_y
+    return min_x, max_x, min_y, max_y
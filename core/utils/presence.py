@@ -0,0 +1,126 @@
+"""
+This module contains the presence tracker, which debounces the WiFi scans.
+A protector arrives once it has been seen for the arrival grace period,
+and leaves only after it has not been seen for the departure grace period,
+so a phone which skips a scan in power-save mode is still home. An arriving
+protector may also miss scans, as long as it is seen again within the
+arrival grace period, and its arrival is not restarted. When the scans
+fail, the protectors are aged out after the departure grace period, so
+an unreachable router does not keep the camera off forever. The scans
+are backed off exponentially while nothing changes, and are run at the
+shortest interval while a protector is arriving or may be leaving.
+"""
+from collections.abc import Callable
+from dataclasses import dataclass
+from threading import Lock
+from time import monotonic
+
+from core.utils.datatypes import Protector
+from core.utils.logger import get_logger
+
+# Add logging support.
+logger = get_logger(__name__)
+
+
+@dataclass
+class ProtectorPresence:
+    """This class represents the presence of a protector."""
+    name: str
+    first_seen_at: float
+    last_seen_at: float
+    present: bool = False
+
+
+class PresenceTracker:  # pylint: disable=too-many-instance-attributes
+    """
+    The presence tracker decides if the protectors are around from the scans.
+    """
+    ARRIVAL_GRACE: float = 0.0
+    DEPARTURE_GRACE: float = 120.0
+    MIN_INTERVAL: float = 5.0
+    MAX_INTERVAL: float = 15.0
+    BACKOFF: float = 2.0
+
+    def __init__(self,  # pylint: disable=too-many-arguments
+                 arrival_grace: float = ARRIVAL_GRACE,
+                 departure_grace: float = DEPARTURE_GRACE,
+                 min_interval: float = MIN_INTERVAL,
+                 max_interval: float = MAX_INTERVAL,
+                 backoff: float = BACKOFF,
+                 *,
+                 clock: Callable[[], float] = monotonic) -> None:
+        self._arrival_grace: float = arrival_grace
+        self._departure_grace: float = departure_grace
+        self._min_interval: float = min_interval
+        self._max_interval: float = max_interval
+        self._backoff: float = backoff
+        self._clock: Callable[[], float] = clock
+        self._protectors: dict[str, ProtectorPresence] = {}
+        self._present: bool = False
+        self._interval: float = min_interval
+        self._lock: Lock = Lock()
+
+    def update(self, protectors: list[Protector]) -> bool:
+        """This method records the protectors of a scan, and returns if any is around."""
+        with self._lock:
+            now = self._clock()
+            seen = {protector.name for protector in protectors}
+            for name in seen:
+                if (presence := self._protectors.get(name)) is None:
+                    presence = self._protectors[name] = ProtectorPresence(name, now, now)
+                presence.last_seen_at = now
+            return self._evaluate(now, seen)
+
+    def expire(self) -> bool:
+        """
+        This method ages the protectors out after a failed scan, and returns if any is around.
+        Nobody is seen, but nobody is known to be missing either.
+        """
+        with self._lock:
+            return self._evaluate(self._clock(), set())
+
+    def is_present(self) -> bool:
+        """This method returns if any protector is around."""
+        with self._lock:
+            return self._present
+
+    def get_present(self) -> list[str]:
+        """This method returns the names of the protectors around."""
+        with self._lock:
+            return [name for name, presence in self._protectors.items() if presence.present]
+
+    def get_interval(self) -> float:
+        """This method returns how long to wait until the next scan."""
+        with self._lock:
+            return self._interval
+
+    # Internal methods
+    def _evaluate(self, now: float, seen: set[str]) -> bool:
+        """This method decides the arrivals and the departures, and the next interval."""
+        settling = False
+        for name, presence in list(self._protectors.items()):
+            missed_for = now - presence.last_seen_at
+            if presence.present:
+                if missed_for >= self._departure_grace:
+                    logger.info("Protector has left: %s", name)
+                    del self._protectors[name]
+                    continue
+                # A missed scan might be a departure, keep scanning closely.
+                settling |= name not in seen
+            elif name in seen and now - presence.first_seen_at >= self._arrival_grace:
+                logger.info("Protector has arrived: %s", name)
+                presence.present = True
+            elif name not in seen and missed_for > self._arrival_grace:
+                # The arrival was not confirmed.
+                del self._protectors[name]
+            else:
+                settling = True
+
+        present = any(presence.present for presence in self._protectors.values())
+        if present != self._present or settling:
+            self._interval = self._min_interval
+        else:
+            # Nothing has changed, scan less often.
+            self._interval = min(self._max_interval, self._interval * self._backoff)
+        self._present = present
+        return present
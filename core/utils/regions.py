@@ -0,0 +1,125 @@
+"""
+This module contains helpers for detection regions.
+Regions are kept as (N, 4) integer arrays of (min_x, max_x, min_y, max_y).
+"""
+import cv2
+import numpy
+
+from core.strategies.detectors.base_detector_strategy import DetectorResult
+from core.utils.preprocessing import rotated_region, rotated_shape, unrotated_region
+
+
+def empty_regions() -> numpy.ndarray:
+    """This function returns an empty region array."""
+    return numpy.empty((0, 4), dtype=numpy.int32)
+
+
+def rectangles_to_regions(rectangles: numpy.ndarray, scale: float = 1.0) -> numpy.ndarray:
+    """This function converts (x, y, w, h) rectangles into regions, scaled by the scale."""
+    rectangles = numpy.asarray(rectangles, dtype=numpy.float64).reshape(-1, 4)
+    return numpy.rint(numpy.stack([
+        rectangles[:, 0],
+        rectangles[:, 0] + rectangles[:, 2],
+        rectangles[:, 1],
+        rectangles[:, 1] + rectangles[:, 3],
+    ], axis=1) * scale).astype(numpy.int32)
+
+
+def intersection_over_union(region: numpy.ndarray, regions: numpy.ndarray) -> numpy.ndarray:
+    """This function returns the IoU of a region with each of the regions."""
+    width = numpy.minimum(region[1], regions[:, 1]) - numpy.maximum(region[0], regions[:, 0])
+    height = numpy.minimum(region[3], regions[:, 3]) - numpy.maximum(region[2], regions[:, 2])
+    intersection = numpy.clip(width, 0, None) * numpy.clip(height, 0, None)
+    area = (region[1] - region[0]) * (region[3] - region[2])
+    areas = (regions[:, 1] - regions[:, 0]) * (regions[:, 3] - regions[:, 2])
+    union = area + areas - intersection
+    return numpy.divide(intersection, union,
+                        out=numpy.zeros(len(regions), dtype=numpy.float64),
+                        where=union > 0)
+
+
+def non_max_suppression(regions: numpy.ndarray,
+                        scores: numpy.ndarray,
+                        iou_threshold: float) -> numpy.ndarray:
+    """This function returns the indices of the regions kept after NMS, best first."""
+    order = numpy.argsort(scores)[::-1]
+    keep: list[int] = []
+    while len(order) > 0:
+        best = order[0]
+        keep.append(best)
+        overlaps = intersection_over_union(regions[best], regions[order[1:]])
+        order = order[1:][overlaps < iou_threshold]
+    return numpy.array(keep, dtype=numpy.intp)
+
+
+def create_result(frame: numpy.ndarray,
+                  regions: numpy.ndarray,
+                  scores: numpy.ndarray,
+                  iou_threshold: float | None,
+                  motion: bool | None = None) -> DetectorResult:
+    """This function merges the overlapping regions, and returns the result of the frame."""
+    regions = regions.astype(numpy.int32)
+    if iou_threshold is not None and len(regions) > 1:
+        keep = non_max_suppression(regions, scores, iou_threshold)
+        regions = regions[keep]
+        scores = scores[keep]
+    return DetectorResult(
+        image=frame,
+        human_found=len(regions) > 0,
+        regions=regions,
+        num_detections=len(regions),
+        motion=motion,
+        scores=scores,
+    )
+
+
+def annotate_regions(frame: numpy.ndarray, regions: numpy.ndarray) -> numpy.ndarray:
+    """This function returns a copy of the frame with the regions drawn."""
+    annotated = frame.copy()
+    for min_x, max_x, min_y, max_y in regions:
+        cv2.rectangle(annotated, (int(min_x), int(min_y)), (int(max_x), int(max_y)),
+                      (0, 255, 0), 5)
+    return annotated
+
+
+def scale_regions(regions: numpy.ndarray,
+                  from_shape: tuple[int, ...],
+                  to_shape: tuple[int, ...]) -> numpy.ndarray:
+    """This function scales the regions of a frame to another frame of the same view."""
+    scale_x = to_shape[1] / from_shape[1]
+    scale_y = to_shape[0] / from_shape[0]
+    scaled = regions * numpy.array([scale_x, scale_x, scale_y, scale_y])
+    return numpy.rint(scaled).astype(numpy.int32)
+
+
+def map_regions(regions: numpy.ndarray,
+                from_shape: tuple[int, ...],
+                from_crop: tuple[int, int, int, int],
+                to_shape: tuple[int, ...],
+                to_crop: tuple[int, int, int, int],
+                rotation: int | None = None) -> numpy.ndarray:
+    """
+    This function maps the regions of a frame onto another frame of the same sensor.
+    The crops are the (x, y, width, height) areas of the sensor the frames are scaled
+    from, and the shapes and the regions are of the frames after the rotation.
+    """
+    # pylint: disable=too-many-arguments,too-many-positional-arguments
+    # The rotations are quarter turns, so the shapes before the rotation are found the same way.
+    from_height, from_width = rotated_shape(from_shape, rotation)
+    to_height, to_width = rotated_shape(to_shape, rotation)
+    raw_regions = numpy.array([unrotated_region(region, (from_height, from_width), rotation)
+                               for region in regions], dtype=numpy.float64).reshape(-1, 4)
+
+    # From the pixels of the frame to the sensor, and from the sensor to the other frame.
+    from_x, from_y, from_crop_width, from_crop_height = from_crop
+    to_x, to_y, to_crop_width, to_crop_height = to_crop
+    raw_regions[:, :2] = ((from_x + raw_regions[:, :2] * from_crop_width / from_width - to_x)
+                          * to_width / to_crop_width)
+    raw_regions[:, 2:] = ((from_y + raw_regions[:, 2:] * from_crop_height / from_height - to_y)
+                          * to_height / to_crop_height)
+    raw_regions[:, :2] = numpy.clip(raw_regions[:, :2], 0, to_width)
+    raw_regions[:, 2:] = numpy.clip(raw_regions[:, 2:], 0, to_height)
+
+    return numpy.array([rotated_region(region, (to_height, to_width), rotation)
+                        for region in numpy.rint(raw_regions)],
+                       dtype=numpy.int32).reshape(-1, 4)
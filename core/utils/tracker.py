@@ -0,0 +1,135 @@
+"""
+This module contains a lightweight multi-object tracker for detections.
+Detections are associated across frames by IoU, or by the distance of the
+centroids for small or fast moving boxes, and a track is confirmed after
+K hits within its last N frames.
+"""
+from collections import deque
+from dataclasses import dataclass, field
+from itertools import count
+from threading import Lock
+
+import numpy
+
+from core.utils.regions import intersection_over_union
+
+
+@dataclass
+class Track:
+    """This class represents a tracked object."""
+    track_id: int
+    region: numpy.ndarray
+    hits: deque = field(default_factory=deque)
+    missed: int = 0
+    confirmed: bool = False
+
+    @property
+    def centroid(self) -> numpy.ndarray:
+        """This property returns the (x, y) centre of the region."""
+        return numpy.array([(self.region[0] + self.region[1]) / 2,
+                            (self.region[2] + self.region[3]) / 2])
+
+
+class DetectionTracker:  # pylint: disable=too-many-instance-attributes
+    """
+    The detection tracker follows the detected regions across frames.
+    A track is confirmed once, when it is seen in confirm_hits of its last
+    confirm_window frames, so the same person is only reported once.
+    """
+    IOU_THRES: float = 0.3
+    CENTROID_THRES: float = 0.5
+    CONFIRM_HITS: int = 2
+    CONFIRM_WINDOW: int = 3
+    MAX_MISSED: int = 5
+
+    def __init__(self,
+                 iou_threshold: float = IOU_THRES,
+                 centroid_threshold: float = CENTROID_THRES,
+                 confirm_hits: int = CONFIRM_HITS,
+                 confirm_window: int = CONFIRM_WINDOW,
+                 max_missed: int = MAX_MISSED) -> None:
+        self._iou_threshold: float = iou_threshold
+        self._centroid_threshold: float = centroid_threshold
+        self._confirm_hits: int = confirm_hits
+        self._confirm_window: int = confirm_window
+        self._max_missed: int = max_missed
+        self._tracks: list[Track] = []
+        self._track_ids = count(1)
+        self._lock: Lock = Lock()
+
+    def update(self, regions: numpy.ndarray) -> list[Track]:
+        """This method associates the regions of a frame, and returns the newly confirmed tracks."""
+        with self._lock:
+            matches = self._associate(regions)
+            matched_regions = set(matches.values())
+
+            # Update the tracks with their matches, and forget the lost ones.
+            for index, track in enumerate(self._tracks):
+                if index in matches:
+                    track.region = regions[matches[index]]
+                    track.hits.append(True)
+                    track.missed = 0
+                else:
+                    track.hits.append(False)
+                    track.missed += 1
+            self._tracks = [track for track in self._tracks if track.missed <= self._max_missed]
+
+            # Start new tracks for the unmatched regions.
+            for index, region in enumerate(regions):
+                if index not in matched_regions:
+                    self._tracks.append(Track(next(self._track_ids), region,
+                                              deque([True], maxlen=self._confirm_window)))
+
+            confirmed: list[Track] = []
+            for track in self._tracks:
+                if not track.confirmed and sum(track.hits) >= self._confirm_hits:
+                    track.confirmed = True
+                    confirmed.append(track)
+            return confirmed
+
+    def is_tracking(self) -> bool:
+        """
+        This method returns True if a confirmed track was seen in the last frame.
+        The tentative tracks are not counted, they have not been reported yet.
+        """
+        with self._lock:
+            return any(track.confirmed and track.missed == 0 for track in self._tracks)
+
+    def reset(self) -> None:
+        """This method forgets all the tracks."""
+        with self._lock:
+            self._tracks = []
+
+    # Internal methods
+    def _associate(self, regions: numpy.ndarray) -> dict[int, int]:
+        """This method greedily matches the tracks with the regions, best match first."""
+        if not self._tracks or len(regions) == 0:
+            return {}
+
+        # Score every pair by IoU, and fall back to the centroid distance relative to the size.
+        scores = numpy.stack([intersection_over_union(track.region, regions)
+                              for track in self._tracks])
+        centroids = numpy.stack([(regions[:, 0] + regions[:, 1]) / 2,
+                                 (regions[:, 2] + regions[:, 3]) / 2], axis=1)
+        for index, track in enumerate(self._tracks):
+            diagonal = numpy.hypot(track.region[1] - track.region[0],
+                                   track.region[3] - track.region[2])
+            distances = numpy.linalg.norm(centroids - track.centroid, axis=1) / max(diagonal, 1)
+            # Close centroids score just below the IoU threshold, so IoU matches come first.
+            scores[index] = numpy.where(
+                scores[index] >= self._iou_threshold,
+                scores[index],
+                numpy.where(distances <= self._centroid_threshold,
+                            self._iou_threshold * (1 - distances / 2), 0.0)
+            )
+
+        matches: dict[int, int] = {}
+        for flat_index in numpy.argsort(scores, axis=None)[::-1]:
+            index = numpy.unravel_index(flat_index, scores.shape)
+            track_index, region_index = int(index[0]), int(index[1])
+            if scores[track_index, region_index] <= 0:
+                break
+            if track_index in matches or region_index in matches.values():
+                continue
+            matches[track_index] = region_index
+        return matches
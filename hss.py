@@ -4,19 +4,42 @@ Main application layer for Home Security System.
 import json
 import sys
 from concurrent.futures import wait
+from functools import partial
 from time import sleep
 from typing import Any
 
 from core.observers.observer.hss_observer import HomeSecuritySystemObserver
 from core.observers.subject.eye_subject import EyeSubject
 from core.observers.subject.wifi_subject import WiFiSubject
+from core.strategies.detectors.base_detector_strategy import BaseDetectorStrategy
+from core.strategies.detectors.cascade_strategy import CascadeDetectorStrategy
 from core.strategies.detectors.efficientdet_strategy import EfficientdetStrategy
-from core.strategies.eye.picamera_strategy import PiCameraStrategy
+from core.strategies.detectors.hog_descriptor_strategy import HogDescriptorStrategy
+from core.strategies.detectors.motion_gate_strategy import MotionGateStrategy
+from core.strategies.detectors.motion_strategy import MotionStrategy
+from core.strategies.detectors.process_pool_strategy import ProcessPoolDetectorStrategy
+from core.strategies.detectors.shared_strategy import SharedDetectorStrategy
+from core.strategies.detectors.tiling_strategy import TilingStrategy
+from core.strategies.eye.base_eye_strategy import BaseEyeStrategy
+from core.strategies.notifier.base_notifier_strategy import BaseNotifierStrategy
 from core.strategies.notifier.telegram_strategy import TelegramStrategy
 from core.strategies.notifier.whatsapp_strategy import WhatsappStrategy
+from core.strategies.scheduler.adaptive_scheduler_strategy import AdaptiveSchedulerStrategy
 from core.strategies.wifi.admin_panel_strategy import AdminPanelStrategy
+from core.strategies.wifi.base_wifi_strategy import BaseWiFiStrategy
+from core.strategies.wifi.neighbour_strategy import NeighbourStrategy
+from core.utils.alert_policy import AlertPolicy
 from core.utils.datatypes import Protector, TelegramReciever
 from core.utils.fileio_adaptor import upload_to_fileio
+from core.utils.inference_service import CameraSettings, InferenceService
+from core.utils.logger import get_logger
+from core.utils.notification_dispatcher import NotificationDispatcher
+from core.utils.presence import PresenceTracker
+from core.utils.preprocessing import get_rotation
+from core.utils.tracker import DetectionTracker
+
+# Add logging support.
+logger = get_logger(__name__)
 
 
 def read_configurations() -> tuple[dict[str, Any], dict[str, Any]]:
@@ -31,6 +54,77 @@ def read_configurations() -> tuple[dict[str, Any], dict[str, Any]]:
     return main_settings, strategy_settings
 
 
+def create_camera(camera_config: dict[str, Any]) -> BaseEyeStrategy:
+    """
+    This method creates the eye strategy for the camera configuration.
+    The camera modules are imported lazily, so the hardware libraries of
+    the other camera types do not have to be installed.
+    """
+    # pylint: disable=import-outside-toplevel
+    camera_type = camera_config.get('type', "picamera")
+    if camera_type == "usbcamera":
+        from core.strategies.eye.usbcamera_strategy import UsbCameraStrategy
+        return UsbCameraStrategy(camera_config.get('source', 0))
+    if camera_type == "replay":
+        from core.strategies.eye.replaycamera_strategy import ReplayCameraStrategy
+        return ReplayCameraStrategy(camera_config['source'],
+                                    frame_rate=camera_config.get('frame_rate'),
+                                    loop=camera_config.get('loop', True),
+                                    jitter=camera_config.get('jitter', 0.0),
+                                    frame_shape=camera_config.get('frame_shape'),
+                                    rotation=get_rotation(camera_config.get('rotation')))
+    from core.strategies.eye.picamera_strategy import PiCameraStrategy
+    return PiCameraStrategy(streaming=True)
+
+
+def create_detector(detector: BaseDetectorStrategy,
+                    strategy_config: dict[str, Any]) -> BaseDetectorStrategy:
+    """
+    This method creates the detector stages in front of the given detector.
+    """
+    motion_strategy = MotionStrategy(**strategy_config.get('motion_strategy', {}))
+    tiling_config = strategy_config.get('tiling_strategy')
+    tiled_detector = detector
+    if tiling_config is not None:
+        tiled_detector = TilingStrategy(detector, **tiling_config)
+
+    if 'cascade_strategy' not in strategy_config:
+        return MotionGateStrategy(tiled_detector, motion_strategy)
+
+    cascade_config = dict(strategy_config['cascade_strategy'])
+    first_stage: BaseDetectorStrategy = motion_strategy
+    hog_preset = cascade_config.pop('hog_preset', "fast")
+    if cascade_config.pop('first_stage', "motion") == "hog":
+        first_stage = HogDescriptorStrategy(hog_preset)
+    refine_detector = None
+    if cascade_config.pop('refine', True):
+        refine_detector = TilingStrategy(detector, **{**(tiling_config or {}), 'tiling': True})
+    return CascadeDetectorStrategy(first_stage, tiled_detector, refine_detector,
+                                   **cascade_config)
+
+
+def send_start_notifications(notifier: BaseNotifierStrategy, image_paths: list[str]) -> None:
+    """
+    This method notifies that the system is started, with the initial frame of each camera.
+    The system keeps running if the notifications could not be sent, e.g. on
+    a ConnectionError or a requests error, which are both OSErrors.
+    """
+    try:
+        notifier.notify_all("Home Security System is started.")
+        sleep(5)
+
+        for image_path in image_paths:
+            with open(f"{image_path}/initial_frame.jpg", "rb") as file:
+                initial_frame = file.read()
+            if isinstance(notifier, TelegramStrategy):
+                notifier.send_image_all(initial_frame)
+            elif isinstance(notifier, WhatsappStrategy):
+                fileio_link = upload_to_fileio(initial_frame)
+                notifier.notify_all(f"Here is the initial frame: {fileio_link}.")
+    except OSError as error:
+        logger.error("The start notifications could not be sent: %s", error)
+
+
 def main():
     """
     This method is the entry point of the application.
@@ -44,42 +138,82 @@ def main():
                                                reciever['chat_id']))
 
     # Create a Protector within IpAddressStrategy.
-    network_strategy = AdminPanelStrategy(strategy_config['admin_panel_strategy'])
+    network_strategy: BaseWiFiStrategy
+    if 'neighbour_strategy' in strategy_config:
+        # Watch the neighbour table passively instead of polling the router.
+        network_strategy = NeighbourStrategy(**strategy_config['neighbour_strategy'])
+    else:
+        network_strategy = AdminPanelStrategy.from_config(strategy_config['admin_panel_strategy'])
     for protector in config['protectors']:
         network_strategy.add_protector(Protector(protector['name'],
                                                  protector['address']))
 
     # Create observer.
-    hss_observer = HomeSecuritySystemObserver()
-    hss_observer.set_notifier(notifier)
-
-    #  Create subjects to observe.
-    wifi_subject = WiFiSubject()
+    hss_observer = HomeSecuritySystemObserver(
+        AlertPolicy(**strategy_config.get('alert_policy', {}))
+    )
+    hss_observer.set_dispatcher(NotificationDispatcher(
+        notifier, **strategy_config.get('notification_dispatcher', {})
+    ))
+
+    # Create subjects to observe.
+    wifi_subject = WiFiSubject(PresenceTracker(**strategy_config.get('presence_tracker', {})))
     wifi_subject.attach(hss_observer)
-    eye_subject = EyeSubject()
-    eye_subject.attach(hss_observer)
 
     # Run subjects.
     wifi_subject.run(network_strategy)
 
-    # Set-up the camera to detect humans.
-    camera = PiCameraStrategy()
-    camera.set_detector(EfficientdetStrategy())
-    eye_subject.run(camera, wifi_subject.get_protector_lock())
+    # Create one inference service to be shared by all the cameras.
+    detector_config = strategy_config.get('efficientdet_strategy', {})
+    if 'cascade_strategy' in strategy_config:
+        # Let the borderline detections through, the cascade decides on them.
+        detector_config = {
+            **detector_config,
+            'detection_threshold': strategy_config['cascade_strategy'].get(
+                'borderline_threshold', CascadeDetectorStrategy.BORDERLINE_THRES),
+        }
+    detector_factory = partial(EfficientdetStrategy, **detector_config)
+    service_config = strategy_config.get('inference_service', {})
+    service_factory = detector_factory
+    if 'process_pool' in strategy_config:
+        # Run the detector in worker processes, and keep one service thread per process.
+        process_pool = ProcessPoolDetectorStrategy(detector_factory,
+                                                   **strategy_config['process_pool'])
+        service_factory = process_pool.get_detector
+        service_config = {'workers': strategy_config['process_pool'].get('workers', 1),
+                          **service_config}
+    inference_service = InferenceService(service_factory, **service_config)
+
+    # Set-up the cameras to detect humans.
+    eye_subjects: list[EyeSubject] = []
+    for camera_config in config.get('cameras', [{"name": "picamera", "type": "picamera"}]):
+        camera = create_camera(camera_config)
+        camera.set_detector(create_detector(
+            SharedDetectorStrategy(inference_service, CameraSettings(
+                camera_config['name'],
+                camera_config.get('priority', 0),
+                camera_config.get('latency_target', 1.0),
+            )),
+            strategy_config
+        ))
+        # Every camera saves its images into its own directory.
+        eye_subject = EyeSubject(
+            image_path=f"{EyeSubject.DEFAULT_IMAGE_LOCATIONS}/{camera_config['name']}",
+            scheduler=AdaptiveSchedulerStrategy(
+                **strategy_config.get('adaptive_scheduler_strategy', {})
+            ),
+            tracker=DetectionTracker(**strategy_config.get('detection_tracker', {})),
+        )
+        eye_subject.attach(hss_observer)
+        eye_subject.run(camera, wifi_subject.get_protector_lock())
+        eye_subjects.append(eye_subject)
 
     # Notify that the system is running.
-    notifier.notify_all("Home Security System is started.")
-    sleep(5)
-
-    if isinstance(notifier, TelegramStrategy):
-        with open(f"{eye_subject._image_path}/initial_frame.jpg", "rb") as initial_frame:
-            notifier.send_image_all(initial_frame)
-    elif isinstance(notifier, WhatsappStrategy):
-        fileio_link = upload_to_fileio(initial_frame)
-        notifier.notify_all(f"Here is the initial frame: {fileio_link}.")
+    send_start_notifications(notifier, [subject.get_image_path() for subject in eye_subjects])
 
     # Wait for the futures.
-    _, failures = wait([wifi_subject.thread, eye_subject.thread], return_when="FIRST_COMPLETED")
+    _, failures = wait([wifi_subject.thread] + [subject.thread for subject in eye_subjects],
+                       return_when="FIRST_COMPLETED")
     for failure in failures:
         notifier.notify_all("Home Security System has failed to run. Please check the logs.")
         notifier.notify_all("Failure: " + str(failure))
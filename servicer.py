@@ -22,6 +22,7 @@ from telebot.async_telebot import AsyncTeleBot
 
 from core.strategies.eye.picamera_strategy import PiCameraStrategy
 from core.strategies.wifi.admin_panel_strategy import AdminPanelStrategy
+from core.utils.datatypes import Protector
 
 
 def read_configurations() -> tuple[dict[str, Any], dict[str, Any]]:
@@ -39,6 +40,10 @@ def read_configurations() -> tuple[dict[str, Any], dict[str, Any]]:
 MAIN_CONIGS, STRATEGY_CONFIGS = read_configurations()
 SERVICER_BOT = AsyncTeleBot(
     token=STRATEGY_CONFIGS["telegram_strategy"]["bot_key"])
+# The strategy is kept, so its session is reused by every /inhouse command.
+NETWORK_STRATEGY = AdminPanelStrategy.from_config(STRATEGY_CONFIGS["admin_panel_strategy"])
+NETWORK_STRATEGY.add_protector([Protector(protector['name'], protector['address'])
+                                for protector in MAIN_CONIGS["protectors"]])
 KNOWN_LOG_LOCATIONS: dict[str, str] = {
     "hss.service": "/home/raspberry/.home-security-system/logs/hss.log"
 }
@@ -122,14 +127,12 @@ async def in_house(message):
     """
     This method is called when the /in-house command is sent.
     """
-    protectors_list = MAIN_CONIGS["protectors"]
-    strategy = AdminPanelStrategy(STRATEGY_CONFIGS["admin_panel_strategy"])
-    connected_macs = strategy._get_all_connected()
-    connected_protectors = "\n\t- " + "\n\t- ".join([
-        protector['name'] for protector in protectors_list
-        if protector['address'] in [device.address for device in connected_macs]
-    ])
-    response = f"Connected MACs: {[device.address for device in connected_macs]}\n\n\n" \
+    connected_devices = NETWORK_STRATEGY.get_connected()
+    connected_addresses = [device.address for device in connected_devices]
+    connected_protectors = "\n\t- " + "\n\t- ".join(
+        protector.name for protector in NETWORK_STRATEGY.match_protectors(connected_addresses)
+    )
+    response = f"Connected MACs: {connected_addresses}\n\n\n" \
                f"Protectors in house: {connected_protectors}"
     await SERVICER_BOT.reply_to(message, response)
 
@@ -140,7 +143,7 @@ async def image_shot(message):
     This method is called when the /image-shot command is sent.
     """
     camera = PiCameraStrategy()
-    frame = camera.get_frame()
+    frame = camera.get_still_frame()
     success, encoded_frame = cv2.imencode('.png', frame)
     if not success:
         await SERVICER_BOT.reply_to(message, "Failed to capture the image.")
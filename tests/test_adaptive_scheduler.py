@@ -0,0 +1,100 @@
+"""
+The tests of the adaptive scheduler, with a fake clock.
+"""
+import pytest
+
+from core.strategies.scheduler.adaptive_scheduler_strategy import AdaptiveSchedulerStrategy
+from core.utils.datatypes import EyeStrategyResult
+
+
+class FakeClock:
+    """A clock which only moves when it is told to."""
+    def __init__(self) -> None:
+        self.now: float = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float) -> None:
+        """This method moves the clock forward."""
+        self.now += seconds
+
+
+def create_result(detected: bool = False,
+                  motion: bool = False,
+                  inference_time: float = 0.1) -> EyeStrategyResult:
+    """This function creates the result of a sample."""
+    return EyeStrategyResult(image=None, result=detected, motion=motion,
+                             inference_time=inference_time)
+
+
+def create_scheduler(clock: FakeClock,
+                     temperature: float | None = None,
+                     **kwargs) -> AdaptiveSchedulerStrategy:
+    """This function creates a scheduler with the fake clock and a fixed temperature."""
+    return AdaptiveSchedulerStrategy(clock=clock, temperature_reader=lambda: temperature,
+                                     **kwargs)
+
+
+def test_backs_off_while_quiet():
+    """The interval grows by the backoff factor while the scene is quiet, up to the maximum."""
+    clock = FakeClock()
+    scheduler = create_scheduler(clock)
+    intervals = []
+    for _ in range(8):
+        scheduler.record(create_result())
+        intervals.append(scheduler.next_interval())
+        clock.advance(intervals[-1])
+    assert intervals[:3] == pytest.approx([1.5, 2.25, 3.375])
+    assert intervals[-1] == AdaptiveSchedulerStrategy.MAX_INTERVAL
+
+
+def test_detection_samples_fast():
+    """A detection in the history samples at the minimum interval, until it is out of it."""
+    clock = FakeClock()
+    scheduler = create_scheduler(clock)
+    scheduler.record(create_result(detected=True))
+    assert scheduler.next_interval() == AdaptiveSchedulerStrategy.MIN_INTERVAL
+    clock.advance(AdaptiveSchedulerStrategy.HISTORY_WINDOW - 1)
+    assert scheduler.next_interval() == AdaptiveSchedulerStrategy.MIN_INTERVAL
+    clock.advance(2)
+    # The backoff starts again from the motion interval.
+    assert scheduler.next_interval() == pytest.approx(1.5)
+
+
+def test_motion_samples_at_motion_interval():
+    """Motion without a detection samples at the motion interval."""
+    scheduler = create_scheduler(FakeClock())
+    scheduler.record(create_result(motion=True))
+    assert scheduler.next_interval() == AdaptiveSchedulerStrategy.MOTION_INTERVAL
+
+
+def test_keeps_duty_cycle():
+    """A slow inference stretches the interval, so the inference keeps to the duty cycle."""
+    scheduler = create_scheduler(FakeClock(), max_duty_cycle=0.25)
+    scheduler.record(create_result(detected=True, inference_time=1.0))
+    assert scheduler.next_interval() == pytest.approx(3.0)
+
+
+@pytest.mark.parametrize("temperature, interval", [
+    (None, 0.5),
+    (60.0, 0.5),
+    (75.0, 5.25),
+    (85.0, 10.0),
+])
+def test_thermal_budget(temperature, interval):
+    """The interval is stretched linearly above the soft limit, to the maximum at the hard one."""
+    scheduler = create_scheduler(FakeClock(), temperature)
+    scheduler.record(create_result(detected=True))
+    assert scheduler.next_interval() == pytest.approx(interval)
+
+
+def test_reset_forgets_history():
+    """A reset forgets the detections and the backoff."""
+    clock = FakeClock()
+    scheduler = create_scheduler(clock)
+    for _ in range(3):
+        scheduler.next_interval()
+    scheduler.record(create_result(detected=True))
+    scheduler.reset()
+    assert scheduler.next_interval() == pytest.approx(1.5)
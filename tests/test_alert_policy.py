@@ -0,0 +1,106 @@
+"""
+The tests of the alert policy, with a fake clock.
+"""
+from core.utils.alert_policy import AlertPolicy
+
+
+class FakeClock:
+    """A clock which only moves when it is told to."""
+    def __init__(self) -> None:
+        self.now: float = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float) -> None:
+        """This method moves the clock forward."""
+        self.now += seconds
+
+
+def create_policy(clock: FakeClock, **kwargs) -> AlertPolicy:
+    """This function creates a policy with a short cooldown and quiet period."""
+    settings = {"cooldown": 60.0, "quiet_period": 180.0, "max_digest_images": 3, **kwargs}
+    return AlertPolicy(clock=clock, **settings)
+
+
+def test_first_detection_is_urgent():
+    """The first detection opens an incident, and is alerted at once with its image."""
+    policy = create_policy(FakeClock())
+    alerts = policy.update(True, b"first")
+    assert len(alerts) == 1
+    assert alerts[0].urgent
+    assert alerts[0].images == [b"first"]
+
+
+def test_no_detection_is_quiet():
+    """Nothing is alerted without a detection."""
+    policy = create_policy(FakeClock())
+    assert not policy.update(False)
+
+
+def test_later_images_are_digested_once_per_cooldown():
+    """The images within the cooldown are collected, and sent together after it."""
+    clock = FakeClock()
+    policy = create_policy(clock)
+    policy.update(True, b"first")
+    for image in (b"second", b"third"):
+        clock.advance(10.0)
+        assert not policy.update(True, image)
+    clock.advance(40.0)
+    alerts = policy.update(False)
+    assert len(alerts) == 1
+    assert not alerts[0].urgent
+    assert alerts[0].images == [b"second", b"third"]
+
+
+def test_digest_keeps_newest_images():
+    """A digest keeps the newest images only."""
+    clock = FakeClock()
+    policy = create_policy(clock)
+    policy.update(True, b"first")
+    for index in range(5):
+        clock.advance(1.0)
+        policy.update(True, bytes([index]))
+    clock.advance(60.0)
+    assert policy.update(False)[0].images == [bytes([2]), bytes([3]), bytes([4])]
+
+
+def test_incident_closes_after_quiet_period():
+    """The incident is closed with a summary after the quiet period, and a new one opens."""
+    clock = FakeClock()
+    policy = create_policy(clock)
+    policy.update(True, b"first")
+    clock.advance(120.0)
+    policy.update(True)
+    clock.advance(179.0)
+    assert not policy.update(False)
+    clock.advance(1.0)
+    alerts = policy.update(False)
+    assert [alert.message for alert in alerts] == \
+        ["The intrusion is over: 2 detection(s) in 2 minute(s)."]
+    assert policy.update(True, b"again")[0].urgent
+
+
+def test_closing_sends_pending_images():
+    """The images still pending when the incident closes are sent before the summary."""
+    clock = FakeClock()
+    policy = create_policy(clock, cooldown=1000.0)
+    policy.update(True, b"first")
+    clock.advance(1.0)
+    policy.update(True, b"second")
+    clock.advance(180.0)
+    alerts = policy.update(False)
+    assert alerts[0].images == [b"second"]
+    assert alerts[1].message.startswith("The intrusion is over")
+
+
+def test_reset_closes_silently():
+    """A reset closes the incident without alerts, and the next detection is urgent again."""
+    clock = FakeClock()
+    policy = create_policy(clock)
+    policy.update(True, b"first")
+    policy.update(True, b"second")
+    policy.reset()
+    clock.advance(1000.0)
+    assert not policy.update(False)
+    assert policy.update(True, b"again")[0].urgent
@@ -0,0 +1,107 @@
+"""
+The tests of the shared inference service, with a fake detector.
+"""
+from threading import Event
+from time import sleep
+
+import numpy
+import pytest
+
+from core.strategies.detectors.base_detector_strategy import BaseDetectorStrategy, DetectorResult
+from core.strategies.detectors.shared_strategy import SharedDetectorStrategy
+from core.utils.inference_service import CameraSettings, InferenceService
+
+BLOCKER = -1
+
+
+class FakeDetector(BaseDetectorStrategy):
+    """A detector which records the frames, and holds the blocking frame until released."""
+    def __init__(self) -> None:
+        self.seen: list[int] = []
+        self.released: Event = Event()
+
+    def detect_humans(self,
+                      frame: numpy.ndarray,
+                      rotation: int | None = None  # pylint: disable=unused-argument
+                      ) -> DetectorResult:
+        """This method records the frame, and finds a human in the even ones."""
+        if int(frame[0]) == BLOCKER:
+            self.released.wait(1.0)
+        else:
+            self.seen.append(int(frame[0]))
+        return DetectorResult(image=frame, human_found=int(frame[0]) % 2 == 0)
+
+
+def create_frame(value: int) -> numpy.ndarray:
+    """This function returns a frame which carries the value."""
+    return numpy.array([value])
+
+
+@pytest.fixture(name="detector")
+def fixture_detector():
+    """This fixture creates the fake detector, and releases it after the test."""
+    detector = FakeDetector()
+    yield detector
+    detector.released.set()
+
+
+@pytest.fixture(name="service")
+def fixture_service(detector):
+    """This fixture creates a service of one worker, which is busy with the blocking frame."""
+    service = InferenceService(lambda: detector, max_batch_size=1, batch_window=0.0,
+                               priority_step=0.05)
+    service.submit(CameraSettings("blocker"), create_frame(BLOCKER))
+    sleep(0.05)
+    return service
+
+
+def test_priority_is_served_first(service, detector):
+    """The requests of a higher priority are served before those submitted at the same time."""
+    futures = [service.submit(CameraSettings("low"), create_frame(1))]
+    futures += [service.submit(CameraSettings("high", priority=1), create_frame(value))
+                for value in (2, 3)]
+    detector.released.set()
+    for future in futures:
+        future.result(timeout=1.0)
+    assert detector.seen == [2, 3, 1]
+
+
+def test_waiting_requests_are_not_starved(service, detector):
+    """A request which has waited longer than the priority step is served before new ones."""
+    futures = [service.submit(CameraSettings("low"), create_frame(1))]
+    sleep(0.1)
+    futures += [service.submit(CameraSettings("high", priority=1), create_frame(value))
+                for value in (2, 3)]
+    detector.released.set()
+    for future in futures:
+        future.result(timeout=1.0)
+    assert detector.seen == [1, 2, 3]
+
+
+def test_cancelled_requests_are_skipped(service, detector):
+    """A request cancelled before it is served never reaches the detector."""
+    cancelled = service.submit(CameraSettings("camera"), create_frame(1))
+    served = service.submit(CameraSettings("camera"), create_frame(2))
+    assert cancelled.cancel()
+    detector.released.set()
+    assert served.result(timeout=1.0).human_found
+    assert detector.seen == [2]
+
+
+def test_shared_detector_returns_results_in_order(service, detector):
+    """The shared detector returns the results of a batch in the order of its frames."""
+    detector.released.set()
+    shared = SharedDetectorStrategy(service, CameraSettings("camera"))
+    results = shared.detect_humans_batch([create_frame(value) for value in (1, 2, 3)])
+    assert [result.human_found for result in results] == [False, True, False]
+
+
+def test_shared_detector_times_out(service, detector):
+    """The shared detector gives up after its timeout, and cancels its requests."""
+    shared = SharedDetectorStrategy(service, CameraSettings("camera", latency_target=0.05),
+                                    timeout_factor=2.0)
+    with pytest.raises(RuntimeError):
+        shared.detect_humans(create_frame(1))
+    detector.released.set()
+    service.submit(CameraSettings("camera"), create_frame(2)).result(timeout=1.0)
+    assert detector.seen == [2]
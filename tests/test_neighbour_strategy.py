@@ -0,0 +1,123 @@
+"""
+The tests of the neighbour strategy, with canned netlink messages and leases files.
+"""
+import socket
+from time import time
+
+import pytest
+
+from core.strategies.wifi.neighbour_strategy import (
+    CLOCK_TICKS,
+    NDA_CACHEINFO,
+    NDA_CACHEINFO_STRUCT,
+    NDA_DST,
+    NDA_LLADDR,
+    NDMSG,
+    NLMSG_DONE,
+    NLMSG_HEADER,
+    NUD_REACHABLE,
+    NUD_STALE,
+    RTATTR,
+    RTM_DELNEIGH,
+    RTM_NEWNEIGH,
+    NeighbourStrategy,
+    parse_neighbour_messages,
+    read_leases,
+)
+from core.utils.presence import PresenceTracker
+
+PHONE_MAC = bytes([0x02, 0xAB, 0xCD, 0xEF, 0x01, 0x23])
+
+
+def pack_attribute(attribute_type: int, value: bytes) -> bytes:
+    """This function packs a netlink attribute, padded to 4 bytes."""
+    length = RTATTR.size + len(value)
+    return (RTATTR.pack(length, attribute_type) + value).ljust((length + 3) & ~3, b"\0")
+
+
+def pack_neighbour(message_type: int,
+                   family: int,
+                   address: str,
+                   state: int,
+                   ages: tuple[int, int, int] | None = None) -> bytes:
+    """This function packs a neighbour message, with the ages in clock ticks if given."""
+    body = NDMSG.pack(family, 0, state, 0, 0)
+    body += pack_attribute(NDA_DST, socket.inet_pton(family, address))
+    body += pack_attribute(NDA_LLADDR, PHONE_MAC)
+    if ages is not None:
+        body += pack_attribute(NDA_CACHEINFO, NDA_CACHEINFO_STRUCT.pack(*ages, 1))
+    return NLMSG_HEADER.pack(NLMSG_HEADER.size + len(body), message_type, 0, 1, 0) + body
+
+
+def pack_done() -> bytes:
+    """This function packs the message which ends a dump."""
+    return NLMSG_HEADER.pack(NLMSG_HEADER.size + 4, NLMSG_DONE, 0, 1, 0) + b"\0" * 4
+
+
+def test_parses_neighbours():
+    """The addresses, the state and the ages of every neighbour are parsed, in order."""
+    data = (pack_neighbour(RTM_NEWNEIGH, socket.AF_INET, "192.168.1.20", NUD_STALE,
+                           (60 * CLOCK_TICKS, 0, 10 * CLOCK_TICKS))
+            + pack_neighbour(RTM_DELNEIGH, socket.AF_INET6, "fe80::1", NUD_REACHABLE)
+            + pack_done())
+    messages = list(parse_neighbour_messages(data))
+
+    assert [message.message_type for message in messages] == \
+        [RTM_NEWNEIGH, RTM_DELNEIGH, NLMSG_DONE]
+    assert messages[0].ip_address == "192.168.1.20"
+    assert messages[0].mac_address == "02:AB:CD:EF:01:23"
+    assert messages[0].state == NUD_STALE
+    assert messages[0].confirmed_ago == 60
+    assert messages[0].seen_ago == 10
+    assert messages[1].ip_address == "fe80::1"
+    assert messages[1].seen_ago is None
+
+
+def test_stops_at_truncated_message():
+    """A message shorter than its header ends the parsing."""
+    data = NLMSG_HEADER.pack(4, RTM_NEWNEIGH, 0, 1, 0)
+    assert not list(parse_neighbour_messages(data))
+
+
+@pytest.mark.parametrize("state, seen_ago, present", [
+    (NUD_REACHABLE, None, True),
+    (NUD_STALE, 30, True),
+    (NUD_STALE, 200, True),
+    (NUD_STALE, 600, False),
+    (NUD_STALE, None, False),
+])
+def test_stale_neighbours_are_present_for_a_while(state, seen_ago, present):
+    """A stale neighbour is present for the stale timeout after it was last heard of."""
+    ages = (seen_ago * CLOCK_TICKS,) * 3 if seen_ago is not None else None
+    data = pack_neighbour(RTM_NEWNEIGH, socket.AF_INET, "192.168.1.20", state, ages)
+    message = next(parse_neighbour_messages(data))
+    strategy = NeighbourStrategy(neighbour_table=False)
+    assert strategy._is_present(message) == present  # pylint: disable=protected-access
+
+
+def test_stale_timeout_outlasts_departure_grace():
+    """An idle phone is not reported absent before the presence tracker would wait for it."""
+    assert NeighbourStrategy.STALE_TIMEOUT > PresenceTracker.DEPARTURE_GRACE
+
+
+def test_reads_active_leases(tmp_path):
+    """The active and the infinite leases are read, the expired and the malformed are not."""
+    leases = tmp_path / "dnsmasq.leases"
+    now = int(time())
+    leases.write_text(
+        f"{now + 3600} 02:ab:cd:ef:01:23 192.168.1.20 phone 01:02:ab:cd:ef:01:23\n"
+        f"{now - 3600} 02:ab:cd:ef:01:24 192.168.1.21 old-phone *\n"
+        "0 02:ab:cd:ef:01:25 192.168.1.22 printer *\n"
+        "duid 00:01:00:01:2b:3c:4d:5e:02:ab:cd:ef:01:23\n"
+        "broken\n",
+        encoding="utf-8",
+    )
+    assert read_leases(str(leases)) == [
+        ("02:AB:CD:EF:01:23", "192.168.1.20"),
+        ("02:AB:CD:EF:01:25", "192.168.1.22"),
+    ]
+
+
+def test_missing_leases_file(tmp_path):
+    """A missing leases file has no leases."""
+    assert not read_leases(str(tmp_path / "missing.leases"))
@@ -0,0 +1,98 @@
+"""
+The tests of the network prober, against a listening socket of the local host.
+"""
+import socket
+from threading import Event, Thread
+from time import monotonic
+
+import pytest
+
+from core.utils.network_probe import NetworkProber
+
+
+class FakeResolver:
+    """A resolver which counts the lookups, fails unknown names, and may be held."""
+    def __init__(self, names: dict[str, str]) -> None:
+        self.names: dict[str, str] = names
+        self.lookups: list[str] = []
+        self.released: Event = Event()
+        self.released.set()
+
+    def __call__(self, name: str) -> str:
+        self.lookups.append(name)
+        self.released.wait(1.0)
+        if name not in self.names:
+            raise socket.gaierror(f"Unknown name {name}.")
+        return self.names[name]
+
+
+@pytest.fixture(name="listener")
+def fixture_listener():
+    """This fixture listens on a local TCP port, and returns the port."""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as listener:
+        listener.bind(("127.0.0.1", 0))
+        listener.listen()
+        yield listener.getsockname()[1]
+
+
+@pytest.fixture(name="resolver")
+def fixture_resolver(monkeypatch):
+    """This fixture replaces the name lookups with a fake resolver."""
+    resolver = FakeResolver({"phone.local": "127.0.0.1", "127.0.0.1": "127.0.0.1"})
+    monkeypatch.setattr(socket, "gethostbyname", resolver)
+    return resolver
+
+
+def create_prober(port: int, **options) -> NetworkProber:
+    """This function creates a prober which only connects to the port."""
+    return NetworkProber(deadline=0.5, tcp_ports=(port,), use_icmp=False, use_arp=False,
+                         **options)
+
+
+def test_finds_reachable_address(listener, resolver):
+    """An address which accepts the connection is reachable, and an unknown name is not."""
+    prober = create_prober(listener)
+    assert prober.probe(["phone.local", "unknown.local"]) == {"phone.local"}
+    assert set(resolver.lookups) == {"phone.local", "unknown.local"}
+
+
+def test_caches_names(listener, resolver):
+    """A resolved name is not looked up again, a failed one is tried again."""
+    prober = create_prober(listener, cache_ttl=0.0)
+    for _ in range(3):
+        prober.probe(["phone.local", "unknown.local"])
+    assert resolver.lookups.count("phone.local") == 1
+    assert resolver.lookups.count("unknown.local") == 3
+
+
+def test_caches_only_reachable_addresses(listener, resolver, monkeypatch):
+    """A reachable address is cached, and an unreachable one is probed again next time."""
+    prober = create_prober(listener)
+    probed: list[set[str]] = []
+    reachable = {"phone.local"}
+
+    def probe(targets: dict[str, str]) -> set[str]:
+        probed.append(set(targets))
+        return reachable & set(targets)
+
+    monkeypatch.setattr(prober, "_probe", probe)
+    resolver.names["tablet.local"] = "127.0.0.2"
+    assert prober.probe(["phone.local", "tablet.local"]) == {"phone.local"}
+    reachable.add("tablet.local")
+    assert prober.probe(["phone.local", "tablet.local"]) == {"phone.local", "tablet.local"}
+    assert probed == [{"phone.local", "tablet.local"}, {"tablet.local"}]
+
+
+def test_resolves_without_the_lock(listener, resolver):
+    """A slow name lookup does not hold back the probes of the cached addresses."""
+    prober = create_prober(listener)
+    assert prober.probe(["127.0.0.1"]) == {"127.0.0.1"}
+
+    resolver.released.clear()
+    slow_probe = Thread(target=prober.probe, args=(["slow.local"],), daemon=True)
+    slow_probe.start()
+    started_at = monotonic()
+    assert prober.probe(["127.0.0.1"]) == {"127.0.0.1"}
+    assert monotonic() - started_at < 0.5
+    resolver.released.set()
+    slow_probe.join(1.0)
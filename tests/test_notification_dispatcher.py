@@ -0,0 +1,82 @@
+"""
+The tests of the notification dispatcher, with a recording notifier.
+"""
+from threading import Condition
+from time import monotonic
+
+from core.strategies.notifier.base_notifier_strategy import BaseNotifierStrategy
+from core.utils.datatypes import NotifierReciever
+from core.utils.notification_dispatcher import NotificationDispatcher, RateLimiter
+
+RECIEVER = NotifierReciever("owner")
+
+
+class RecordingNotifier(BaseNotifierStrategy):
+    """A notifier which records the messages it sends, and fails the given number of times."""
+    def __init__(self, failures: int = 0) -> None:
+        super().__init__()
+        self.sent: list[tuple[str, float]] = []
+        self.recievers: set[str] = set()
+        self._failures: int = failures
+        self._condition: Condition = Condition()
+
+    def send_message(self, reciever: NotifierReciever, message: str) -> None:
+        """This method records the message, unless it has to fail."""
+        with self._condition:
+            if self._failures > 0:
+                self._failures -= 1
+                raise ConnectionError("The network is down.")
+            self.sent.append((message, monotonic()))
+            self.recievers.add(reciever.name)
+            self._condition.notify_all()
+
+    def wait_for(self, count: int, timeout: float = 2.0) -> list[str]:
+        """This method waits until the number of messages are sent, and returns them."""
+        with self._condition:
+            self._condition.wait_for(lambda: len(self.sent) >= count, timeout)
+            return [message for message, _ in self.sent]
+
+
+def create_dispatcher(notifier: RecordingNotifier, **options) -> NotificationDispatcher:
+    """This function creates a dispatcher for the notifier, with a single reciever."""
+    notifier.add_reciever(RECIEVER)
+    return NotificationDispatcher(notifier, **options)
+
+
+def test_rate_limiter_allows_burst():
+    """The burst is free, then a token is reserved a period later, or refused."""
+    rate_limiter = RateLimiter(burst=2, period=10.0)
+    assert rate_limiter.reserve(0.0) == 0.0
+    assert rate_limiter.reserve(0.0) == 0.0
+    assert rate_limiter.reserve(1.0) is None
+    assert 9.0 < rate_limiter.reserve(10.0) <= 10.0
+
+
+def test_over_rate_notification_is_dropped():
+    """A notification over the rate limit is dropped."""
+    notifier = RecordingNotifier()
+    dispatcher = create_dispatcher(notifier, rate_burst=1, rate_period=60.0, max_rate_wait=0.0)
+    dispatcher.notify("first")
+    dispatcher.notify("second")
+    dispatcher.notify("last")
+    assert notifier.wait_for(2, timeout=0.3) == ["first"]
+
+
+def test_urgent_notification_waits_for_rate_limit():
+    """An urgent notification over the rate limit waits for a token instead of being dropped."""
+    notifier = RecordingNotifier()
+    dispatcher = create_dispatcher(notifier, rate_burst=1, rate_period=0.3, max_rate_wait=0.0)
+    started_at = monotonic()
+    dispatcher.notify("digest")
+    dispatcher.notify("intruder", urgent=True)
+    assert notifier.wait_for(2) == ["digest", "intruder"]
+    assert notifier.sent[1][1] - started_at >= 0.25
+
+
+def test_failed_send_is_retried():
+    """A failed send is retried with a backoff."""
+    notifier = RecordingNotifier(failures=2)
+    dispatcher = create_dispatcher(notifier, backoff=0.01, max_backoff=0.02)
+    dispatcher.notify("intruder", urgent=True)
+    assert notifier.wait_for(1) == ["intruder"]
+    assert notifier.recievers == {RECIEVER.name}
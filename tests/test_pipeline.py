@@ -0,0 +1,97 @@
+"""
+The tests of the pipeline building blocks.
+"""
+from queue import Empty
+from threading import Event
+from time import monotonic, sleep
+
+import pytest
+
+from core.utils.pipeline import DropOldestQueue, PipelineStage
+
+
+def is_droppable(item: str) -> bool:
+    """This function protects the items which start with "!"."""
+    return not item.startswith("!")
+
+
+def drain(queue: DropOldestQueue) -> list:
+    """This function returns every item of the queue."""
+    items = []
+    while queue.qsize():
+        items.append(queue.get())
+    return items
+
+
+def test_drops_oldest_when_full():
+    """The oldest item is dropped to make room for the new one."""
+    queue = DropOldestQueue(2)
+    for item in ("a", "b", "c"):
+        queue.put(item)
+    assert drain(queue) == ["b", "c"]
+    assert queue.dropped == 1
+
+
+def test_get_times_out_when_empty():
+    """Empty is raised if no item arrives in time."""
+    with pytest.raises(Empty):
+        DropOldestQueue(2).get(timeout=0.01)
+
+
+def test_protected_items_are_kept():
+    """The oldest droppable item is dropped, the protected items are kept."""
+    queue = DropOldestQueue(2, is_droppable)
+    for item in ("!a", "b", "!c", "d"):
+        queue.put(item)
+    assert drain(queue) == ["!a", "!c", "d"]
+
+
+def test_protected_items_are_bounded():
+    """The protected items may fill the queue up to the hard size, but not further."""
+    queue = DropOldestQueue(2, is_droppable, hard_maxsize=3)
+    for item in ("!a", "!b", "!c", "!d", "!e"):
+        queue.put(item)
+    assert drain(queue) == ["!c", "!d", "!e"]
+    assert queue.dropped == 2
+
+
+def test_default_hard_size():
+    """Without a hard size, the protected items may fill four times the size."""
+    queue = DropOldestQueue(2, is_droppable)
+    for index in range(20):
+        queue.put(f"!{index}")
+    assert queue.qsize() == 8
+
+
+def test_coalesces_droppable_items():
+    """A droppable item replaces the droppable item at the end, a protected one is kept."""
+    queue = DropOldestQueue(8, is_droppable, coalesce=True)
+    for item in ("a", "b", "!c", "d", "e"):
+        queue.put(item)
+    assert drain(queue) == ["b", "!c", "e"]
+
+
+def test_stage_processes_and_survives_errors():
+    """The stage keeps processing after the handler fails, and counts the failures."""
+    handled = []
+    done = Event()
+
+    def handler(item: int) -> None:
+        if item == 1:
+            raise ValueError("The item cannot be handled.")
+        handled.append(item)
+        if item == 2:
+            done.set()
+
+    stage = PipelineStage("test", handler, maxsize=4)
+    stage.start()
+    for item in range(3):
+        stage.put(item)
+    assert done.wait(1.0)
+    # The last item is recorded just after its handler returns.
+    deadline = monotonic() + 1.0
+    while (stats := stage.get_stats()).processed < 3 and monotonic() < deadline:
+        sleep(0.01)
+    assert handled == [0, 2]
+    assert stats.processed == 3
+    assert stats.failed == 1
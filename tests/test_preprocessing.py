@@ -0,0 +1,64 @@
+"""
+The tests of the preprocessing path into the input tensor.
+"""
+import cv2
+import numpy
+import pytest
+
+from core.utils.preprocessing import TensorPreprocessor, rotated_shape
+
+ROTATIONS = (None, cv2.ROTATE_90_CLOCKWISE, cv2.ROTATE_90_COUNTERCLOCKWISE, cv2.ROTATE_180)
+COLOUR_CONVERSIONS = {4: cv2.COLOR_BGRA2RGB, 3: cv2.COLOR_BGR2RGB, 1: cv2.COLOR_GRAY2RGB}
+INPUT_WIDTH, INPUT_HEIGHT = 32, 24
+
+
+def create_frame(channels: int) -> numpy.ndarray:
+    """This function returns a random 120x160 frame with the given channels."""
+    shape = (120, 160, channels) if channels > 1 else (120, 160)
+    return numpy.random.default_rng(channels).integers(0, 256, shape, dtype=numpy.uint8)
+
+
+def reference(frame: numpy.ndarray, rotation: int | None) -> numpy.ndarray:
+    """This function preprocesses the frame step by step, rotating the full frame first."""
+    channels = frame.shape[2] if frame.ndim == 3 else 1
+    rotated = frame if rotation is None else cv2.rotate(frame, rotation)
+    resized = cv2.resize(rotated, (INPUT_WIDTH, INPUT_HEIGHT), interpolation=cv2.INTER_AREA)
+    return cv2.cvtColor(resized, COLOUR_CONVERSIONS[channels])
+
+
+@pytest.mark.parametrize("channels", [4, 3, 1])
+@pytest.mark.parametrize("rotation", ROTATIONS)
+def test_matches_reference(channels, rotation):
+    """The frame is resized before the rotation, with the result of resizing after it."""
+    frame = create_frame(channels)
+    out = numpy.empty((INPUT_HEIGHT, INPUT_WIDTH, 3), dtype=numpy.uint8)
+    result = TensorPreprocessor(INPUT_WIDTH, INPUT_HEIGHT).process(frame, out, rotation)
+    assert result is out
+    # The resize rounds the transposed frame a little differently.
+    difference = numpy.abs(out.astype(numpy.int16) - reference(frame, rotation))
+    assert difference.max() <= 1
+
+
+def test_reuses_scratch_buffers():
+    """The scratch buffers are allocated once per frame layout."""
+    preprocessor = TensorPreprocessor(INPUT_WIDTH, INPUT_HEIGHT)
+    out = numpy.empty((INPUT_HEIGHT, INPUT_WIDTH, 3), dtype=numpy.uint8)
+    # pylint: disable=protected-access
+    preprocessor.process(create_frame(3), out, cv2.ROTATE_90_CLOCKWISE)
+    scratch = preprocessor._get_scratch(3, cv2.ROTATE_90_CLOCKWISE)
+    preprocessor.process(create_frame(3), out, cv2.ROTATE_90_CLOCKWISE)
+    assert all(buffer is cached for buffer, cached
+               in zip(scratch, preprocessor._get_scratch(3, cv2.ROTATE_90_CLOCKWISE)))
+    preprocessor.process(create_frame(4), out)
+    assert len(preprocessor._scratch) == 2
+
+
+@pytest.mark.parametrize("rotation, shape", [
+    (None, (120, 160)),
+    (cv2.ROTATE_90_CLOCKWISE, (160, 120)),
+    (cv2.ROTATE_90_COUNTERCLOCKWISE, (160, 120)),
+    (cv2.ROTATE_180, (120, 160)),
+])
+def test_rotated_shape(rotation, shape):
+    """The quarter turns swap the width and the height."""
+    assert rotated_shape((120, 160, 3), rotation) == shape
@@ -0,0 +1,128 @@
+"""
+The tests of the presence tracker.
+"""
+from core.utils.datatypes import Protector
+from core.utils.presence import PresenceTracker
+
+PHONE = Protector("phone", "AA:BB:CC:DD:EE:FF")
+
+
+class FakeClock:
+    """A clock which only moves when it is told to."""
+    def __init__(self) -> None:
+        self.now: float = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float) -> None:
+        """This method moves the clock forward."""
+        self.now += seconds
+
+
+def create_tracker(clock: FakeClock, **kwargs) -> PresenceTracker:
+    """This function creates a tracker with short intervals and the fake clock."""
+    settings = {"departure_grace": 60.0, "min_interval": 5.0, "max_interval": 20.0,
+                "backoff": 2.0, **kwargs}
+    return PresenceTracker(clock=clock, **settings)
+
+
+def test_arrives_at_once_without_grace():
+    """A protector arrives at its first scan without an arrival grace."""
+    tracker = create_tracker(FakeClock())
+    assert tracker.update([PHONE])
+    assert tracker.get_present() == ["phone"]
+
+
+def test_arrives_after_the_arrival_grace():
+    """A protector arrives once it has been seen for the arrival grace."""
+    clock = FakeClock()
+    tracker = create_tracker(clock, arrival_grace=10.0)
+    assert not tracker.update([PHONE])
+    clock.advance(5.0)
+    assert not tracker.update([PHONE])
+    clock.advance(5.0)
+    assert tracker.update([PHONE])
+
+
+def test_arrival_tolerates_a_missed_scan_within_the_grace():
+    """A missed scan within the arrival grace does not restart the arrival."""
+    clock = FakeClock()
+    tracker = create_tracker(clock, arrival_grace=10.0)
+    tracker.update([PHONE])
+    clock.advance(5.0)
+    assert not tracker.update([])
+    clock.advance(5.0)
+    # The arrival is not restarted by the missed scan.
+    assert tracker.update([PHONE])
+
+
+def test_arrival_is_forgotten_after_the_grace():
+    """An arrival is forgotten if it is not seen again within the grace."""
+    clock = FakeClock()
+    tracker = create_tracker(clock, arrival_grace=10.0)
+    tracker.update([PHONE])
+    clock.advance(15.0)
+    assert not tracker.update([])
+    clock.advance(5.0)
+    assert not tracker.update([PHONE])
+
+
+def test_stays_present_within_the_departure_grace():
+    """A protector which misses scans is present within the departure grace."""
+    clock = FakeClock()
+    tracker = create_tracker(clock)
+    tracker.update([PHONE])
+    clock.advance(59.0)
+    assert tracker.update([])
+    assert tracker.is_present()
+
+
+def test_departs_after_the_departure_grace():
+    """A protector leaves once it has not been seen for the departure grace."""
+    clock = FakeClock()
+    tracker = create_tracker(clock)
+    tracker.update([PHONE])
+    clock.advance(30.0)
+    assert tracker.update([])
+    clock.advance(30.0)
+    assert not tracker.update([])
+    assert tracker.get_present() == []
+
+
+def test_failed_scans_age_the_protectors_out():
+    """A protector leaves after the departure grace, even if the scans fail."""
+    clock = FakeClock()
+    tracker = create_tracker(clock)
+    tracker.update([PHONE])
+    clock.advance(30.0)
+    assert tracker.expire()
+    clock.advance(30.0)
+    assert not tracker.expire()
+
+
+def test_backs_off_while_nothing_changes():
+    """The interval grows up to the maximum while nothing changes."""
+    clock = FakeClock()
+    tracker = create_tracker(clock)
+    tracker.update([PHONE])
+    assert tracker.get_interval() == 5.0
+    intervals = []
+    for _ in range(4):
+        clock.advance(tracker.get_interval())
+        tracker.update([PHONE])
+        intervals.append(tracker.get_interval())
+    assert intervals == [10.0, 20.0, 20.0, 20.0]
+
+
+def test_scans_closely_after_a_missed_scan():
+    """The shortest interval is used after a protector misses a scan."""
+    clock = FakeClock()
+    tracker = create_tracker(clock)
+    tracker.update([PHONE])
+    clock.advance(5.0)
+    tracker.update([PHONE])
+    assert tracker.get_interval() == 10.0
+    clock.advance(10.0)
+    tracker.update([])
+    assert tracker.get_interval() == 5.0
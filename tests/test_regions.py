@@ -0,0 +1,64 @@
+"""
+The tests of the region helpers, and of the rotation of the regions.
+"""
+import cv2
+import numpy
+import pytest
+
+from core.utils.preprocessing import rotated_region, rotated_shape, unrotated_region
+from core.utils.regions import map_regions, scale_regions
+
+ROTATIONS = (None, cv2.ROTATE_90_CLOCKWISE, cv2.ROTATE_90_COUNTERCLOCKWISE, cv2.ROTATE_180)
+
+# A 4:3 sensor, the stills show all of it and the 16:9 stream shows a band of it.
+SENSOR_CROP = (0, 0, 4000, 3000)
+STREAM_CROP = (0, 375, 4000, 2250)
+STILL_SHAPE = (3000, 4000, 3)
+STREAM_SHAPE = (360, 640, 3)
+
+
+@pytest.mark.parametrize("rotation", ROTATIONS)
+def test_rotated_region_reverses_unrotated_region(rotation):
+    """A region rotated back onto the rotated frame is the region itself."""
+    shape = (480, 640)
+    region = numpy.array([10, 50, 20, 90])
+    raw_region = unrotated_region(region, shape, rotation)
+    assert rotated_region(raw_region, shape, rotation) == tuple(region)
+
+
+@pytest.mark.parametrize("rotation", ROTATIONS)
+def test_rotated_region_matches_rotated_frame(rotation):
+    """The rotated region covers the same pixels of the rotated frame."""
+    frame = numpy.zeros((48, 64), dtype=numpy.uint8)
+    frame[20:30, 10:15] = 255
+    rotated = frame if rotation is None else cv2.rotate(frame, rotation)
+    min_x, max_x, min_y, max_y = rotated_region((10, 15, 20, 30), frame.shape, rotation)
+    assert rotated[min_y:max_y, min_x:max_x].all()
+    assert rotated.sum() == 255 * 50
+
+
+def test_same_view_is_scaled():
+    """Frames scaled from the same area of the sensor map like a plain scale."""
+    regions = numpy.array([[64, 128, 36, 72]])
+    mapped = map_regions(regions, STREAM_SHAPE, SENSOR_CROP, STILL_SHAPE, SENSOR_CROP)
+    assert numpy.array_equal(mapped, scale_regions(regions, STREAM_SHAPE, STILL_SHAPE))
+
+
+def test_cropped_stream_is_offset():
+    """A region of a cropped stream is moved into the band of the still it shows."""
+    regions = numpy.array([[0, 640, 0, 360], [320, 640, 180, 360]])
+    mapped = map_regions(regions, STREAM_SHAPE, STREAM_CROP, STILL_SHAPE, SENSOR_CROP)
+    assert mapped.tolist() == [[0, 4000, 375, 2625], [2000, 4000, 1500, 2625]]
+
+
+@pytest.mark.parametrize("rotation", ROTATIONS)
+def test_rotated_frames_are_mapped(rotation):
+    """The regions of rotated frames are mapped like the regions before the rotation."""
+    raw_region = (320, 640, 180, 360)
+    stream_shape = rotated_shape(STREAM_SHAPE, rotation)
+    still_shape = rotated_shape(STILL_SHAPE, rotation)
+    region = rotated_region(raw_region, STREAM_SHAPE, rotation)
+    mapped = map_regions(numpy.array([region]), stream_shape, STREAM_CROP,
+                         still_shape, SENSOR_CROP, rotation)
+    expected = rotated_region((2000, 4000, 1500, 2625), STILL_SHAPE, rotation)
+    assert tuple(mapped[0]) == expected
@@ -0,0 +1,75 @@
+"""
+The tests of the replay camera strategy, and of the rotation names of its configuration.
+"""
+from time import monotonic
+
+import cv2
+import numpy
+import pytest
+
+from core.strategies.eye.replaycamera_strategy import ReplayCameraStrategy
+from core.utils.preprocessing import get_rotation
+
+
+@pytest.fixture(name="dump")
+def fixture_dump(tmp_path):
+    """This fixture writes a .npy dump of three 4x6 frames, filled with their index."""
+    path = tmp_path / "frames.npy"
+    numpy.save(path, numpy.stack([numpy.full((4, 6, 3), index, dtype=numpy.uint8)
+                                  for index in range(3)]))
+    return str(path)
+
+
+@pytest.mark.parametrize("name, rotation", [
+    (None, None),
+    ("none", None),
+    ("90cw", cv2.ROTATE_90_CLOCKWISE),
+    ("90ccw", cv2.ROTATE_90_COUNTERCLOCKWISE),
+    ("180", cv2.ROTATE_180),
+])
+def test_rotation_names(name, rotation):
+    """The rotation names map to the cv2 rotations, and no name to no rotation."""
+    assert get_rotation(name) == rotation
+
+
+@pytest.mark.parametrize("name", [0, 1, "90", "cw"])
+def test_unknown_rotations_are_rejected(name):
+    """The raw cv2 values and unknown names are rejected, instead of rotating the wrong way."""
+    with pytest.raises(ValueError):
+        get_rotation(name)
+
+
+def test_dump_is_replayed_in_order(dump):
+    """The frames of a dump are served in order, with their index as the name."""
+    camera = ReplayCameraStrategy(dump, loop=False)
+    values = []
+    with pytest.raises(EOFError):
+        while True:
+            values.append(int(camera.get_raw_frame()[0, 0, 0]))
+    assert values == [0, 1, 2]
+    assert camera.frame_name == "000002"
+
+
+def test_dump_loops(dump):
+    """A looping replay starts again after the last frame."""
+    camera = ReplayCameraStrategy(dump)
+    values = [int(camera.get_raw_frame()[0, 0, 0]) for _ in range(5)]
+    assert values == [0, 1, 2, 0, 1]
+
+
+def test_frames_are_rotated(dump):
+    """The frames are rotated by the given rotation, and the still is the last frame."""
+    camera = ReplayCameraStrategy(dump, rotation=get_rotation("90cw"))
+    assert camera.get_frame().shape == (6, 4, 3)
+    assert camera.get_still_frame().shape == (6, 4, 3)
+    assert int(camera.get_still_frame()[0, 0, 0]) == 0
+
+
+def test_frames_are_paced(dump):
+    """The frames are served at the frame rate."""
+    camera = ReplayCameraStrategy(dump, frame_rate=20.0)
+    started_at = monotonic()
+    for _ in range(3):
+        camera.get_raw_frame()
+    # The first frame is served at once, the others a twentieth of a second apart.
+    assert monotonic() - started_at >= 0.09
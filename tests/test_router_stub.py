@@ -0,0 +1,62 @@
+"""
+The tests of AdminPanelStrategy, against the local stub of the router admin panel.
+"""
+from time import sleep
+
+import pytest
+
+from bench.router_stub import RouterStub, fake_addresses
+from core.strategies.wifi.admin_panel_strategy import AdminPanelStrategy
+from core.utils.datatypes import Protector
+
+SESSION_TTL = 0.3
+
+
+@pytest.fixture(name="stub")
+def fixture_stub():
+    """This fixture serves a stub with a short session lifetime."""
+    stub = RouterStub(fake_addresses(5), session_ttl=SESSION_TTL)
+    stub.start()
+    yield stub
+    stub.stop()
+
+
+def create_strategy(stub: RouterStub) -> AdminPanelStrategy:
+    """This function creates a strategy for the stub, from a configuration like hss does."""
+    return AdminPanelStrategy.from_config(
+        {"Login_Name": "admin", "Login_Pwd": "admin", "base_url": stub.base_url})
+
+
+def test_session_is_reused(stub):
+    """The strategy logs in once, and reuses the session while it is valid."""
+    strategy = create_strategy(stub)
+    for _ in range(3):
+        strategy.get_connected()
+    assert stub.logins == 1
+
+
+def test_logs_in_again_after_expiry(stub):
+    """The strategy logs in again once the router has expired the session."""
+    strategy = create_strategy(stub)
+    strategy.get_connected()
+    sleep(SESSION_TTL * 1.5)
+    devices = strategy.get_connected()
+    assert stub.logins == 2
+    assert len(devices) == len(stub.addresses)
+
+
+def test_extracts_device_table(stub):
+    """The strategy extracts every MAC address of the device table, and only those."""
+    strategy = create_strategy(stub)
+    addresses = [device.address for device in strategy.get_connected()]
+    assert addresses == [address.upper() for address in stub.addresses]
+
+
+def test_matches_protectors_in_any_notation(stub):
+    """A protector is found regardless of the case and the notation of its address."""
+    strategy = create_strategy(stub)
+    home = stub.addresses[-1].lower().replace(":", "-")
+    strategy.add_protector([Protector("home", home), Protector("away", "02:FF:FF:FF:FF:FF")])
+    result = strategy.check_protectors()
+    assert result.result
+    assert [protector.name for protector in result.protectors] == ["home"]
@@ -0,0 +1,84 @@
+"""
+The tests of the tiling strategy, and of the crops of rotated frames.
+"""
+import cv2
+import numpy
+import pytest
+
+from core.strategies.detectors.base_detector_strategy import BaseDetectorStrategy, DetectorResult
+from core.strategies.detectors.tiling_strategy import TilingStrategy
+from core.utils.preprocessing import rotate_frame, rotated_region, unrotated_region
+from core.utils.regions import empty_regions
+
+ROTATIONS = (None, cv2.ROTATE_90_CLOCKWISE, cv2.ROTATE_90_COUNTERCLOCKWISE, cv2.ROTATE_180)
+# The person is a bright block of the raw frame, at (min_x, max_x, min_y, max_y).
+PERSON = (100, 110, 40, 60)
+
+
+class MarkerDetector(BaseDetectorStrategy):
+    """A detector which finds the bright pixels of the rotated frame, and records the sizes."""
+    def __init__(self) -> None:
+        self.shapes: list[tuple[int, ...]] = []
+
+    def detect_humans(self,
+                      frame: numpy.ndarray,
+                      rotation: int | None = None) -> DetectorResult:
+        """This method returns the bounding box of the bright pixels, if any."""
+        rotated = rotate_frame(frame, rotation)
+        self.shapes.append(rotated.shape)
+        rows, columns = numpy.nonzero(rotated)
+        if len(rows) == 0:
+            return DetectorResult(image=frame, human_found=False, regions=empty_regions())
+        regions = numpy.array([[columns.min(), columns.max() + 1, rows.min(), rows.max() + 1]],
+                              dtype=numpy.int32)
+        return DetectorResult(image=frame, human_found=True, regions=regions,
+                              scores=numpy.ones(1, dtype=numpy.float32))
+
+
+def create_frame() -> numpy.ndarray:
+    """This function returns a dark 120x160 frame with the person in it."""
+    frame = numpy.zeros((120, 160), dtype=numpy.uint8)
+    min_x, max_x, min_y, max_y = PERSON
+    frame[min_y:max_y, min_x:max_x] = 255
+    return frame
+
+
+@pytest.mark.parametrize("rotation", ROTATIONS)
+def test_unrotated_region_crops_rotated_frame(rotation):
+    """The crop of the raw frame, rotated, is the crop of the rotated frame."""
+    frame = numpy.random.default_rng(0).integers(0, 256, (48, 64), dtype=numpy.uint8)
+    rotated = rotate_frame(frame, rotation)
+    min_x, max_x, min_y, max_y = 5, 30, 10, 40
+    raw_min_x, raw_max_x, raw_min_y, raw_max_y = unrotated_region(
+        (min_x, max_x, min_y, max_y), frame.shape, rotation)
+    crop = rotate_frame(frame[raw_min_y:raw_max_y, raw_min_x:raw_max_x], rotation)
+    assert numpy.array_equal(crop, rotated[min_y:max_y, min_x:max_x])
+
+
+@pytest.mark.parametrize("rotation", ROTATIONS)
+def test_finds_person_in_rotated_frame(rotation):
+    """The detections are moved back into the coordinates of the rotated frame."""
+    detector = TilingStrategy(MarkerDetector(), [(0.25, 1.0, 0.0, 1.0)], tiling=False)
+    result = detector.detect_humans(create_frame(), rotation)
+    assert result.human_found
+    assert tuple(result.regions[0]) == rotated_region(PERSON, (120, 160), rotation)
+
+
+def test_ignores_outside_regions_of_interest():
+    """A person outside the regions of interest is never looked for."""
+    marker_detector = MarkerDetector()
+    detector = TilingStrategy(marker_detector, [(0.0, 0.5, 0.0, 1.0)], tiling=False)
+    assert not detector.detect_humans(create_frame()).human_found
+    assert marker_detector.shapes == [(120, 80)]
+
+
+@pytest.mark.parametrize("rotation", ROTATIONS)
+def test_tiles_around_regions(rotation):
+    """The detector runs on tiles around the moving region, and finds the person in them."""
+    marker_detector = MarkerDetector()
+    detector = TilingStrategy(marker_detector, tile_scale=0.5)
+    region = numpy.array([rotated_region(PERSON, (120, 160), rotation)])
+    result = detector.detect_humans_in_regions(create_frame(), region, rotation)
+    assert tuple(result.regions[0]) == tuple(region[0])
+    assert len(result.regions) == 1
+    assert all(shape == (60, 60) for shape in marker_detector.shapes)
@@ -0,0 +1,85 @@
+"""
+The tests of the detection tracker.
+"""
+import numpy
+import pytest
+
+from core.utils.regions import empty_regions
+from core.utils.tracker import DetectionTracker
+
+PERSON = numpy.array([[100, 200, 100, 400]])
+OTHER_PERSON = numpy.array([[500, 600, 100, 400]])
+
+
+def moved(regions: numpy.ndarray, offset: int) -> numpy.ndarray:
+    """This function returns the regions moved to the right."""
+    return regions + numpy.array([offset, offset, 0, 0])
+
+
+@pytest.fixture(name="tracker")
+def fixture_tracker():
+    """This fixture creates a tracker which confirms 2 hits of 3 frames, and expires after 2."""
+    return DetectionTracker(confirm_hits=2, confirm_window=3, max_missed=2)
+
+
+def test_confirms_after_hits(tracker):
+    """A track is confirmed on its second hit, and not before."""
+    assert not tracker.update(PERSON)
+    assert not tracker.is_tracking()
+    confirmed = tracker.update(moved(PERSON, 10))
+    assert len(confirmed) == 1
+    assert tracker.is_tracking()
+
+
+def test_confirms_within_window(tracker):
+    """A missed frame between the hits still confirms the track within the window."""
+    tracker.update(PERSON)
+    tracker.update(empty_regions())
+    assert len(tracker.update(PERSON)) == 1
+
+
+def test_single_hit_is_not_confirmed(tracker):
+    """A track seen once is never confirmed, and is not counted as tracked."""
+    tracker.update(PERSON)
+    for _ in range(3):
+        assert not tracker.update(empty_regions())
+        assert not tracker.is_tracking()
+
+
+def test_suppresses_confirmed_track(tracker):
+    """A confirmed track is reported once, however long it is followed."""
+    tracker.update(PERSON)
+    tracker.update(PERSON)
+    for offset in range(10, 100, 10):
+        assert not tracker.update(moved(PERSON, offset))
+        assert tracker.is_tracking()
+
+
+def test_tentative_track_is_not_tracking(tracker):
+    """A new person is not counted as tracked while only the old track is lost."""
+    tracker.update(PERSON)
+    tracker.update(PERSON)
+    tracker.update(OTHER_PERSON)
+    assert not tracker.is_tracking()
+    assert len(tracker.update(OTHER_PERSON)) == 1
+
+
+def test_expires_lost_track(tracker):
+    """A track missed for longer than max_missed is forgotten, and confirmed again."""
+    tracker.update(PERSON)
+    tracker.update(PERSON)
+    for _ in range(3):
+        tracker.update(empty_regions())
+    assert not tracker.is_tracking()
+    tracker.update(PERSON)
+    assert len(tracker.update(PERSON)) == 1
+
+
+def test_reset_forgets_tracks(tracker):
+    """A reset forgets the confirmed tracks, so the person is reported again."""
+    tracker.update(PERSON)
+    tracker.update(PERSON)
+    tracker.reset()
+    assert not tracker.is_tracking()
+    tracker.update(PERSON)
+    assert len(tracker.update(PERSON)) == 1
@@ -0,0 +1,113 @@
+"""
+The tests of the USB camera strategy, with a fake capture.
+"""
+from time import monotonic, sleep
+
+import numpy
+import pytest
+
+from core.strategies.eye.usbcamera_strategy import UsbCameraStrategy
+
+
+class FakeCapture:
+    """A capture which returns the given frames, and fails after them."""
+    def __init__(self, frames: list[numpy.ndarray], opened: bool = True, fps: float = 0.0):
+        self._frames: list[numpy.ndarray] = list(frames)
+        self._opened: bool = opened
+        self._fps: float = fps
+
+    def isOpened(self) -> bool:  # pylint: disable=invalid-name
+        """This method returns if the capture could be opened."""
+        return self._opened
+
+    def read(self) -> tuple[bool, numpy.ndarray | None]:
+        """This method returns the next frame, or fails once there is none."""
+        if not self._opened or not self._frames:
+            return False, None
+        return True, self._frames.pop(0)
+
+    def get(self, _: int) -> float:
+        """This method returns the frame rate, the only property asked for."""
+        return self._fps
+
+    def release(self) -> None:
+        """This method closes the capture."""
+        self._opened = False
+
+
+class FakeCaptureFactory:
+    """A factory which returns the given captures, and unopened ones after them."""
+    def __init__(self, captures: list[FakeCapture]) -> None:
+        self._captures: list[FakeCapture] = list(captures)
+        self.calls: int = 0
+
+    def __call__(self) -> FakeCapture:
+        self.calls += 1
+        return self._captures.pop(0) if self._captures else FakeCapture([], opened=False)
+
+
+def create_frames(count: int) -> list[numpy.ndarray]:
+    """This function returns frames filled with their index."""
+    return [numpy.full((4, 4, 3), index, dtype=numpy.uint8) for index in range(count)]
+
+
+@pytest.fixture(name="create_camera")
+def fixture_create_camera():
+    """This fixture creates cameras with short timeouts, and closes them after the test."""
+    cameras: list[UsbCameraStrategy] = []
+
+    def create_camera(factory: FakeCaptureFactory, camera_id: int | str = 0):
+        camera = UsbCameraStrategy(camera_id, capture_factory=factory)
+        camera.FRAME_TIMEOUT = 0.3
+        camera.RECONNECT_INTERVAL = 0.1
+        cameras.append(camera)
+        return camera
+
+    yield create_camera
+    for camera in cameras:
+        camera.close()
+
+
+def test_lost_camera_is_not_stale(create_camera):
+    """Once the camera is lost, reading times out instead of returning the last frame."""
+    camera = create_camera(FakeCaptureFactory([FakeCapture(create_frames(1))]))
+    camera.get_frame()
+    sleep(0.1)
+    with pytest.raises(RuntimeError):
+        camera.get_frame()
+
+
+def test_lost_camera_is_reopened_slowly(create_camera):
+    """A lost camera is re-opened once every reconnect interval, not in a tight loop."""
+    factory = FakeCaptureFactory([FakeCapture([])])
+    camera = create_camera(factory)
+    with pytest.raises(RuntimeError):
+        camera.get_frame()
+    # About 0.3 seconds of retries, every 0.1 seconds.
+    assert 2 <= factory.calls <= 5
+
+
+def test_reconnected_camera_delivers_frames(create_camera):
+    """A camera which comes back is read again."""
+    frames = create_frames(1)
+    factory = FakeCaptureFactory([FakeCapture([]), FakeCapture(frames * 100)])
+    camera = create_camera(factory)
+    assert numpy.array_equal(camera.get_frame(), frames[0])
+
+
+def test_video_file_is_paced_and_ends(create_camera, tmp_path):
+    """A video file is read at its frame rate, and EOFError is raised at its end."""
+    video = tmp_path / "video.mp4"
+    video.write_bytes(b"")
+    factory = FakeCaptureFactory([FakeCapture(create_frames(5), fps=20.0)])
+    camera = create_camera(factory, str(video))
+
+    started_at = monotonic()
+    seen = set()
+    with pytest.raises(EOFError):
+        while True:
+            seen.add(int(camera.get_frame()[0, 0, 0]))
+    # Five frames at 20 frames per second take a quarter of a second.
+    assert monotonic() - started_at >= 0.2
+    assert seen <= set(range(5)) and 0 in seen
+    assert factory.calls == 1
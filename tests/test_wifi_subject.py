@@ -0,0 +1,90 @@
+"""
+The tests of the WiFi subject, with a scripted WiFi strategy.
+"""
+from threading import Lock
+
+import pytest
+
+from core.observers.subject.wifi_subject import WiFiSubject
+from core.strategies.wifi.base_wifi_strategy import BaseWiFiStrategy
+from core.utils.datatypes import ConnectedDeviceResult, Protector, WiFiStates
+from core.utils.presence import PresenceTracker
+from tests.test_presence import FakeClock
+
+PHONE = Protector("phone", "AA:BB:CC:DD:EE:FF")
+
+
+class EndOfScript(Exception):
+    """Raised to leave the loop of the subject once the scans are over."""
+
+
+class ScriptedWiFiStrategy(BaseWiFiStrategy):
+    """
+    A strategy which returns the given scans, a None scan fails.
+    Waiting moves the fake clock instead of sleeping.
+    """
+    def __init__(self, clock: FakeClock, scans: list[list[str] | None]) -> None:
+        super().__init__()
+        self._clock: FakeClock = clock
+        self._scans: list[list[str] | None] = list(scans)
+        self.waits: list[float] = []
+
+    def wait_for_change(self, timeout: float) -> bool:
+        """This method records the wait, and ends the loop after the last scan."""
+        self.waits.append(timeout)
+        self._clock.advance(timeout)
+        if not self._scans:
+            raise EndOfScript
+        return False
+
+    def _get_all_connected(self) -> list[ConnectedDeviceResult]:
+        """This method returns the next scan."""
+        if (addresses := self._scans.pop(0)) is None:
+            raise ConnectionError("The router is unreachable.")
+        return [ConnectedDeviceResult(address) for address in addresses]
+
+
+@pytest.fixture(name="protector_lock")
+def fixture_protector_lock():
+    """This fixture gives every test a released protector lock."""
+    WiFiSubject.SINGLETON_LOCK = Lock()
+    yield WiFiSubject.SINGLETON_LOCK
+    WiFiSubject.SINGLETON_LOCK = None
+
+
+def run_script(scans: list[list[str] | None]) -> tuple[WiFiSubject, ScriptedWiFiStrategy]:
+    """This function runs the loop of a subject until the scans are over."""
+    clock = FakeClock()
+    strategy = ScriptedWiFiStrategy(clock, scans)
+    strategy.add_protector(PHONE)
+    subject = WiFiSubject(PresenceTracker(departure_grace=20.0, min_interval=5.0,
+                                          max_interval=20.0, clock=clock))
+    with pytest.raises(EndOfScript):
+        WiFiSubject._run_in_loop(subject, strategy)  # pylint: disable=protected-access
+    return subject, strategy
+
+
+def test_holds_the_lock_while_a_protector_is_around(protector_lock):
+    """The lock is held while the protector is seen."""
+    subject, strategy = run_script([[PHONE.address], [PHONE.address]])
+    assert subject.get_state() == WiFiStates.CONNECTED
+    assert protector_lock.locked()
+    assert strategy.waits == [5.0, 10.0]
+
+
+def test_releases_the_lock_after_the_departure_grace(protector_lock):
+    """The lock is released once the protector has left."""
+    subject, _ = run_script([[PHONE.address], [], [], [], []])
+    assert subject.get_state() == WiFiStates.DISCONNECTED
+    assert not protector_lock.locked()
+
+
+def test_releases_the_lock_when_the_scans_keep_failing(protector_lock):
+    """The failed scans keep the lock until the departure grace is over."""
+    subject, strategy = run_script([[PHONE.address], None, None, None])
+    assert strategy.waits == [5.0, WiFiSubject.CHECK_INTERVAL,
+                              WiFiSubject.CHECK_INTERVAL, WiFiSubject.CHECK_INTERVAL]
+    assert protector_lock.locked()
+    subject, _ = run_script([[PHONE.address], None, None, None, None, None])
+    assert subject.get_state() == WiFiStates.DISCONNECTED
+    assert not protector_lock.locked()